@@ -0,0 +1,241 @@
+"""
+Asynchronous queue for pipeline actions (rerun, rerun failed jobs, cancel)
+Actions run on a bounded worker pool; idempotency keys make client retries safe
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+SUPPORTED_ACTIONS = ['rerun', 'rerun-failed-jobs', 'cancel']
+
+# Older action names used by the frontend and API docs
+ACTION_ALIASES = {
+    'retry': 'rerun-failed-jobs',
+    'rerun_failed_jobs': 'rerun-failed-jobs',
+}
+
+PENDING_STATES = ['queued', 'running']
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SECONDS = 1.0
+MAX_TRACKED_ACTIONS = 2000
+# How long action state stays readable from other worker processes
+SHARED_STATE_TTL = 86400
+
+
+def resolve_action(action):
+    """Canonical action name, or None when the action is not supported"""
+    action = ACTION_ALIASES.get(action, action)
+    return action if action in SUPPORTED_ACTIONS else None
+
+
+class ActionQueue:
+    """Runs pipeline actions in the background with a concurrency limit"""
+
+    def __init__(self, perform, max_workers=4, on_success=None):
+        # perform(owner, repo, run_id, action) -> (ok, retryable, message)
+        self._perform = perform
+        self._on_success = on_success
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='action')
+        self._lock = threading.Lock()
+        self._actions = {}
+        self._by_key = {}
+        self._batches = {}
+        self._batch_keys = {}
+        # Optional SharedCache so any worker process can answer status polls and idempotent retries
+        self.store = None
+
+    def submit(self, owner, repo, run_id, action, idempotency_key=None, reason=None):
+        """Queue one action; repeated keys or an identical pending action return the existing one"""
+        run_id = str(run_id)
+        with self._lock:
+            existing = self._find_existing(owner, repo, run_id, action, idempotency_key)
+            if existing:
+                return dict(existing, deduplicated=True)
+
+            entry = {
+                "action_id": uuid.uuid4().hex[:12],
+                "action": action,
+                "repository": f"{owner}/{repo}",
+                "pipeline_id": run_id,
+                "reason": reason,
+                "status": "queued",
+                "attempts": 0,
+                "message": None,
+                "created_at": datetime.now().isoformat(),
+                "finished_at": None,
+            }
+            # Another worker process may have queued this key already; only one claim wins
+            claimed = self._claim_key(entry, idempotency_key)
+            if claimed is not None:
+                return dict(claimed, deduplicated=True)
+
+            self._actions[entry["action_id"]] = entry
+            if idempotency_key:
+                self._by_key[idempotency_key] = entry["action_id"]
+            self._trim()
+            queued = dict(entry, deduplicated=False)
+
+        self._executor.submit(self._run, entry["action_id"], owner, repo)
+        return queued
+
+    def submit_bulk(self, owner, repo, run_ids, action, idempotency_key=None, reason=None):
+        """Queue the same action for many runs and group them in a batch"""
+        with self._lock:
+            if idempotency_key and idempotency_key in self._batch_keys:
+                return self._batch_status(self._batch_keys[idempotency_key])
+        if idempotency_key and self.store is not None:
+            batch_id = self.store.get(f"batch-key:{idempotency_key}")
+            if batch_id:
+                shared = self.get_batch(batch_id)
+                if shared:
+                    return shared
+
+        action_ids = []
+        for run_id in run_ids:
+            item_key = f"{idempotency_key}:{run_id}" if idempotency_key else None
+            action_ids.append(self.submit(owner, repo, run_id, action, item_key, reason)["action_id"])
+
+        batch_id = uuid.uuid4().hex[:12]
+        batch = {
+            "batch_id": batch_id,
+            "action": action,
+            "repository": f"{owner}/{repo}",
+            "action_ids": action_ids,
+            "created_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            if idempotency_key and idempotency_key in self._batch_keys:
+                return self._batch_status(self._batch_keys[idempotency_key])
+            if idempotency_key:
+                self._batch_keys[idempotency_key] = batch_id
+            self._batches[batch_id] = batch
+            status = self._batch_status(batch_id)
+        if self.store is not None:
+            self.store.set(f"batch:{batch_id}", batch, SHARED_STATE_TTL)
+            if idempotency_key:
+                winner = self.store.claim(f"batch-key:{idempotency_key}", batch_id, SHARED_STATE_TTL)
+                if winner != batch_id:
+                    # Another worker grouped the same (deduplicated) actions first; its batch is the one
+                    with self._lock:
+                        del self._batches[batch_id]
+                        self._batch_keys.pop(idempotency_key, None)
+                    self.store.delete(f"batch:{batch_id}")
+                    return self.get_batch(winner) or status
+        return status
+
+    def get(self, action_id):
+        with self._lock:
+            entry = self._actions.get(action_id)
+            if entry:
+                return dict(entry)
+        # Queued by another worker process
+        return self.store.get(f"action:{action_id}") if self.store is not None else None
+
+    def get_batch(self, batch_id):
+        with self._lock:
+            if batch_id in self._batches:
+                return self._batch_status(batch_id)
+        batch = self.store.get(f"batch:{batch_id}") if self.store is not None else None
+        if not batch:
+            return None
+        actions = [a for a in (self.get(action_id) for action_id in batch["action_ids"]) if a]
+        return self._summarize_batch(batch, actions)
+
+    def close(self):
+        """Stop the worker threads once the actions already submitted have run"""
+        self._executor.shutdown(wait=True)
+
+    def stats(self):
+        """Action counts per status"""
+        with self._lock:
+            counts = {}
+            for entry in self._actions.values():
+                counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+            return {"actions": counts, "batches": len(self._batches)}
+
+    def _find_existing(self, owner, repo, run_id, action, idempotency_key):
+        if idempotency_key and idempotency_key in self._by_key:
+            return self._actions.get(self._by_key[idempotency_key])
+        for entry in self._actions.values():
+            if (entry["pipeline_id"] == run_id and entry["action"] == action
+                    and entry["repository"] == f"{owner}/{repo}" and entry["status"] in PENDING_STATES):
+                return entry
+        return None
+
+    def _batch_status(self, batch_id):
+        batch = self._batches[batch_id]
+        actions = [dict(self._actions[a]) for a in batch["action_ids"] if a in self._actions]
+        return self._summarize_batch(batch, actions)
+
+    @staticmethod
+    def _summarize_batch(batch, actions):
+        counts = {}
+        for entry in actions:
+            counts[entry["status"]] = counts.get(entry["status"], 0) + 1
+        done = not any(entry["status"] in PENDING_STATES for entry in actions)
+        return dict(batch, counts=counts, done=done, actions=actions)
+
+    def _trim(self):
+        # Forget the oldest finished actions once the table grows too large
+        if len(self._actions) <= MAX_TRACKED_ACTIONS:
+            return
+        finished = [a for a in self._actions.values() if a["status"] not in PENDING_STATES]
+        for entry in finished[:len(self._actions) - MAX_TRACKED_ACTIONS]:
+            del self._actions[entry["action_id"]]
+        live = set(self._actions)
+        self._by_key = {k: v for k, v in self._by_key.items() if v in live}
+
+    def _claim_key(self, entry, idempotency_key):
+        """Share a new action and claim its key cluster-wide; the winning action if another one has it"""
+        self._share(entry)
+        if not idempotency_key or self.store is None:
+            return None
+        try:
+            winner = self.store.claim(f"action-key:{idempotency_key}", entry["action_id"], SHARED_STATE_TTL)
+        except Exception as e:
+            print(f"Error claiming idempotency key {idempotency_key}: {e}")
+            return None
+        if winner == entry["action_id"]:
+            return None
+        # The winner shared its action before claiming the key, so it is readable here
+        self.store.delete(f"action:{entry['action_id']}")
+        return self.store.get(f"action:{winner}")
+
+    def _share(self, entry):
+        if self.store is None:
+            return
+        try:
+            self.store.set(f"action:{entry['action_id']}", entry, SHARED_STATE_TTL)
+        except Exception as e:
+            print(f"Error sharing action {entry['action_id']}: {e}")
+
+    def _update(self, action_id, **fields):
+        with self._lock:
+            self._actions[action_id].update(fields)
+            entry = dict(self._actions[action_id])
+        self._share(entry)
+        return entry
+
+    def _run(self, action_id, owner, repo):
+        entry = self._update(action_id, status="running")
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                ok, retryable, message = self._perform(owner, repo, entry["pipeline_id"], entry["action"])
+            except Exception as e:
+                ok, retryable, message = False, True, f"Error: {e}"
+
+            self._update(action_id, attempts=attempt, message=message)
+            if ok or not retryable or attempt == MAX_ATTEMPTS:
+                break
+            time.sleep(RETRY_DELAY_SECONDS * attempt)
+
+        self._update(action_id, status="succeeded" if ok else "failed",
+                     finished_at=datetime.now().isoformat())
+        if ok and self._on_success:
+            try:
+                self._on_success(owner, repo, entry["pipeline_id"], entry["action"])
+            except Exception as e:
+                print(f"Error in action callback for {action_id}: {e}")
@@ -0,0 +1,131 @@
+"""
+Pipeline analytics over stored run history
+Success rate, MTTR and duration percentiles per workflow and branch, computed with pandas
+"""
+
+import threading
+
+import pandas as pd
+
+GROUP_KEYS = ['workflow', 'branch']
+CONCLUSIVE = ['success', 'failure', 'timed_out', 'startup_failure']
+FAILED = ['failure', 'timed_out', 'startup_failure']
+
+
+def runs_frame(records):
+    """Build a typed DataFrame of completed runs from history records"""
+    columns = ['id', 'workflow', 'branch', 'conclusion', 'created_at', 'started_at', 'updated_at']
+    if not records:
+        return pd.DataFrame(columns=columns + ['duration_seconds', 'date'])
+
+    df = pd.DataFrame.from_records(records)
+    df = df[df['status'] == 'completed']
+    df = pd.DataFrame({
+        'id': df['id'],
+        'workflow': df['name'].fillna('Workflow'),
+        'branch': df['head_branch'].fillna('main'),
+        'conclusion': df['conclusion'],
+        'created_at': pd.to_datetime(df['created_at'], utc=True),
+        'started_at': pd.to_datetime(df['run_started_at'].fillna(df['created_at']), utc=True),
+        'updated_at': pd.to_datetime(df['updated_at'], utc=True),
+    })
+    df['duration_seconds'] = (df['updated_at'] - df['started_at']).dt.total_seconds()
+    df['date'] = df['created_at'].dt.strftime('%Y-%m-%d')
+    return df
+
+
+def workflow_stats(df):
+    """Success rate, MTTR and p50/p95 duration per (workflow, branch)"""
+    if df.empty:
+        return pd.DataFrame(columns=GROUP_KEYS + [
+            'runs', 'failures', 'success_rate', 'p50_duration_seconds',
+            'p95_duration_seconds', 'mttr_seconds', 'last_run'])
+
+    df = df[df['conclusion'].isin(CONCLUSIVE)].sort_values('created_at')
+    failed = df['conclusion'].isin(FAILED)
+    prev_failed = failed.groupby([df[k] for k in GROUP_KEYS]).shift(fill_value=False).astype(bool)
+
+    # A failure streak starts at a failure after a non-failure; it is recovered by the next success
+    streak_start = df['created_at'].where(failed & ~prev_failed)
+    streak_start = streak_start.groupby([df[k] for k in GROUP_KEYS]).ffill()
+    recovered = (df['conclusion'] == 'success') & prev_failed
+    recovery_seconds = (df['updated_at'] - streak_start).dt.total_seconds().where(recovered)
+
+    work = df.assign(failed=failed, success=df['conclusion'] == 'success',
+                     recovery_seconds=recovery_seconds)
+    grouped = work.groupby(GROUP_KEYS)
+    stats = grouped.agg(
+        runs=('id', 'size'),
+        failures=('failed', 'sum'),
+        success_rate=('success', 'mean'),
+        p50_duration_seconds=('duration_seconds', 'median'),
+        p95_duration_seconds=('duration_seconds', lambda s: s.quantile(0.95)),
+        mttr_seconds=('recovery_seconds', 'mean'),
+        last_run=('created_at', 'max'),
+    ).reset_index()
+    stats['last_run'] = stats['last_run'].dt.strftime('%Y-%m-%dT%H:%M:%SZ')
+    return stats
+
+
+def daily_trend(df):
+    """Runs, success rate and median duration per workflow and day"""
+    if df.empty:
+        return pd.DataFrame(columns=['workflow', 'date', 'runs', 'success_rate', 'p50_duration_seconds'])
+
+    df = df[df['conclusion'].isin(CONCLUSIVE)]
+    return (df.assign(success=df['conclusion'] == 'success')
+              .groupby(['workflow', 'date'])
+              .agg(runs=('id', 'size'),
+                   success_rate=('success', 'mean'),
+                   p50_duration_seconds=('duration_seconds', 'median'))
+              .reset_index())
+
+
+def to_records(df):
+    """DataFrame rows as JSON-safe dicts (NaN becomes None)"""
+    df = df.astype(object).where(df.notna(), None)
+    return df.to_dict('records')
+
+
+class AnalyticsCache:
+    """Analytics per repository, recomputed only for workflows that received new runs"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._trend = {}
+        self._dirty = {}
+
+    def invalidate(self, repo_key, changed_records):
+        """Mark the workflows of new or changed runs for recomputation"""
+        with self._lock:
+            dirty = self._dirty.setdefault(repo_key, set())
+            for record in changed_records:
+                dirty.add(record.get('name') or 'Workflow')
+
+    def get(self, repo_key, records):
+        """Analytics for a repository, refreshing only the dirty workflows"""
+        with self._lock:
+            dirty = self._dirty.pop(repo_key, set())
+            cached = repo_key in self._stats
+
+        if cached and not dirty:
+            return {'workflows': self._stats[repo_key], 'trend': self._trend[repo_key]}
+
+        df = runs_frame(records)
+        if cached:
+            df = df[df['workflow'].isin(dirty)]
+
+        stats = to_records(workflow_stats(df))
+        trend = to_records(daily_trend(df))
+
+        with self._lock:
+            if cached:
+                stats = [s for s in self._stats[repo_key] if s['workflow'] not in dirty] + stats
+                trend = [t for t in self._trend[repo_key] if t['workflow'] not in dirty] + trend
+            stats.sort(key=lambda s: (s['workflow'], s['branch']))
+            trend.sort(key=lambda t: (t['date'], t['workflow']))
+            self._stats[repo_key] = stats
+            self._trend[repo_key] = trend
+
+        return {'workflows': stats, 'trend': trend}
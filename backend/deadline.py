@@ -0,0 +1,75 @@
+"""
+Per-request deadlines for upstream calls
+The client sends its remaining time budget; every GitHub call gets a timeout that fits inside it,
+and work that had to be cut short marks the response as partial
+"""
+
+import threading
+import time
+
+DEADLINE_HEADER = 'X-Request-Deadline-Ms'
+
+# Upper bound for any single upstream call, with or without a client deadline
+DEFAULT_UPSTREAM_TIMEOUT = 10.0
+# Below this much time left, an upstream call is not worth starting
+MIN_UPSTREAM_TIMEOUT = 0.2
+# Kept back from the client's budget to write the response
+RESPONSE_MARGIN_SECONDS = 0.1
+
+_local = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    """The request's time budget ran out before any result was available"""
+
+
+def parse_budget_ms(value):
+    """Budget in seconds from a header value in milliseconds, or None"""
+    try:
+        budget = float(value) / 1000
+    except (TypeError, ValueError):
+        return None
+    return budget if budget > 0 else None
+
+
+def start(budget_seconds=None):
+    """Begin a request on this thread with an optional time budget"""
+    _local.deadline = time.monotonic() + budget_seconds - RESPONSE_MARGIN_SECONDS if budget_seconds else None
+    _local.partial = False
+
+
+def finish():
+    _local.deadline = None
+    _local.partial = False
+
+
+def remaining():
+    """Seconds left for this thread's request, or None without a deadline"""
+    deadline = getattr(_local, 'deadline', None)
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def expired():
+    left = remaining()
+    return left is not None and left < MIN_UPSTREAM_TIMEOUT
+
+
+def upstream_timeout():
+    """Timeout for the next upstream call, or None when the budget is spent"""
+    left = remaining()
+    if left is None:
+        return DEFAULT_UPSTREAM_TIMEOUT
+    if left < MIN_UPSTREAM_TIMEOUT:
+        return None
+    return min(left, DEFAULT_UPSTREAM_TIMEOUT)
+
+
+def mark_partial():
+    """Record that this request's response is missing data because time ran out"""
+    _local.partial = True
+
+
+def is_partial():
+    return getattr(_local, 'partial', False)
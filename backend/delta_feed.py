@@ -0,0 +1,172 @@
+"""
+Delta sync for pipeline listings
+Every pipeline version the backend serves gets a sequence number, so a client holding a cursor
+only downloads the pipelines that were added or changed since, plus the ids that dropped out
+"""
+
+import json
+import os
+import threading
+
+# Removed ids remembered per repository; older cursors get a full resync instead
+MAX_REMOVED = 200
+
+
+def fingerprint(pipeline):
+    return json.dumps(pipeline, sort_keys=True, default=str)
+
+
+def parse_cursor(cursor, epoch, current):
+    """Sequence number of a cursor issued under epoch, or None when it is foreign or in the future"""
+    cursor_epoch, _, seq = (cursor or '').partition('.')
+    if cursor_epoch != epoch or not seq.isdigit():
+        return None
+    seq = int(seq)
+    return seq if seq <= current else None
+
+
+class PipelineFeed:
+    """Versions of each repository's current pipelines, for /pipelines?since=<cursor>"""
+
+    def __init__(self, max_removed=MAX_REMOVED):
+        self.max_removed = max_removed
+        # Cursors from before a restart never match and get a full resync
+        self.epoch = os.urandom(4).hex()
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._repos = {}
+
+    def update(self, repo_key, pipelines):
+        """Record the current pipelines, bumping the version of new, changed and removed ones"""
+        with self._lock:
+            feed = self._repos.setdefault(repo_key, {"items": {}, "order": [], "removed": {}, "floor": 0})
+            items, removed = feed["items"], feed["removed"]
+            current = set()
+            for pipeline in pipelines:
+                pipeline_id = pipeline['id']
+                current.add(pipeline_id)
+                fp = fingerprint(pipeline)
+                if pipeline_id not in items or items[pipeline_id][1] != fp:
+                    self._seq += 1
+                    items[pipeline_id] = (self._seq, fp, pipeline)
+                    removed.pop(pipeline_id, None)
+            for pipeline_id in [i for i in items if i not in current]:
+                self._seq += 1
+                del items[pipeline_id]
+                removed[pipeline_id] = self._seq
+            feed["order"] = [p['id'] for p in pipelines]
+
+            if len(removed) > self.max_removed:
+                oldest = sorted(removed, key=removed.get)[:len(removed) - self.max_removed]
+                feed["floor"] = max(removed[i] for i in oldest)
+                for pipeline_id in oldest:
+                    del removed[pipeline_id]
+
+    def _since(self, cursor):
+        """Sequence number of a cursor from this process, or None"""
+        return parse_cursor(cursor, self.epoch, self._seq)
+
+    def changes(self, repo_key, cursor):
+        """Pipelines added or changed and ids removed after cursor, or everything ("full") when
+        the cursor is unknown or too old"""
+        with self._lock:
+            feed = self._repos.get(repo_key, {"items": {}, "order": [], "removed": {}, "floor": 0})
+            since = self._since(cursor)
+            full = since is None or since < feed["floor"]
+            items = [feed["items"][i] for i in feed["order"]]
+            return {
+                "cursor": f"{self.epoch}.{self._seq}",
+                "full": full,
+                "changed": [pipeline for version, _, pipeline in items if full or version > since],
+                "removed": [] if full else [i for i, version in feed["removed"].items() if version > since],
+            }
+
+
+class SharedPipelineFeed:
+    """PipelineFeed kept in the workers' shared SQLite file, so any worker can answer any cursor
+
+    Versions come from one cluster-wide sequence and the epoch is stored with them; it only
+    changes when the shared file is recreated.
+    """
+
+    def __init__(self, store, max_removed=MAX_REMOVED):
+        self.store = store
+        self.max_removed = max_removed
+        with store.transaction() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS feed_items (
+                repo_key TEXT NOT NULL, pipeline_id TEXT NOT NULL, seq INTEGER NOT NULL,
+                fingerprint TEXT NOT NULL, position INTEGER, removed INTEGER NOT NULL,
+                PRIMARY KEY (repo_key, pipeline_id))""")
+            conn.execute("CREATE TABLE IF NOT EXISTS feed_repos (repo_key TEXT PRIMARY KEY, floor INTEGER NOT NULL)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS feed_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 0), epoch TEXT NOT NULL, seq INTEGER NOT NULL)""")
+            conn.execute("INSERT OR IGNORE INTO feed_meta (id, epoch, seq) VALUES (0, ?, 0)", (os.urandom(4).hex(),))
+            self.epoch = conn.execute("SELECT epoch FROM feed_meta WHERE id = 0").fetchone()[0]
+
+    def _pending(self, conn, repo_key, pipelines):
+        """(new or changed pipelines with position, moved ids with position, removed ids) against the stored feed"""
+        stored = {pipeline_id: (fp, position, removed) for pipeline_id, fp, position, removed in conn.execute(
+            "SELECT pipeline_id, fingerprint, position, removed FROM feed_items WHERE repo_key = ?", (repo_key,))}
+        changed, moved = [], []
+        current = set()
+        for position, pipeline in enumerate(pipelines):
+            pipeline_id = pipeline['id']
+            current.add(pipeline_id)
+            fp = fingerprint(pipeline)
+            old = stored.get(pipeline_id)
+            if old is None or old[2] or old[0] != fp:
+                changed.append((position, pipeline_id, fp))
+            elif old[1] != position:
+                moved.append((position, pipeline_id))
+        removed = [i for i, (_, _, gone) in stored.items() if not gone and i not in current]
+        return changed, moved, removed
+
+    def update(self, repo_key, pipelines):
+        """Record the current pipelines, bumping the version of new, changed and removed ones"""
+        # Most refreshes change nothing; check without taking the write lock first
+        with self.store.transaction(write=False) as conn:
+            if not any(self._pending(conn, repo_key, pipelines)):
+                return
+
+        with self.store.transaction() as conn:
+            changed, moved, removed = self._pending(conn, repo_key, pipelines)
+            seq = conn.execute("SELECT seq FROM feed_meta WHERE id = 0").fetchone()[0]
+            for position, pipeline_id, fp in changed:
+                seq += 1
+                conn.execute("""INSERT OR REPLACE INTO feed_items
+                    (repo_key, pipeline_id, seq, fingerprint, position, removed) VALUES (?, ?, ?, ?, ?, 0)""",
+                    (repo_key, pipeline_id, seq, fp, position))
+            for position, pipeline_id in moved:
+                conn.execute("UPDATE feed_items SET position = ? WHERE repo_key = ? AND pipeline_id = ?",
+                             (position, repo_key, pipeline_id))
+            for pipeline_id in removed:
+                seq += 1
+                conn.execute("""UPDATE feed_items SET seq = ?, fingerprint = '', position = NULL, removed = 1
+                    WHERE repo_key = ? AND pipeline_id = ?""", (seq, repo_key, pipeline_id))
+            conn.execute("UPDATE feed_meta SET seq = ? WHERE id = 0", (seq,))
+
+            overflow = conn.execute("""SELECT pipeline_id, seq FROM feed_items WHERE repo_key = ? AND removed = 1
+                ORDER BY seq DESC LIMIT -1 OFFSET ?""", (repo_key, self.max_removed)).fetchall()
+            if overflow:
+                conn.execute("""INSERT INTO feed_repos (repo_key, floor) VALUES (?, ?)
+                    ON CONFLICT (repo_key) DO UPDATE SET floor = MAX(floor, excluded.floor)""",
+                    (repo_key, max(version for _, version in overflow)))
+                conn.executemany("DELETE FROM feed_items WHERE repo_key = ? AND pipeline_id = ?",
+                                 [(repo_key, pipeline_id) for pipeline_id, _ in overflow])
+
+    def changes(self, repo_key, cursor):
+        """Same answer as PipelineFeed.changes, from whichever worker issued the cursor"""
+        with self.store.transaction(write=False) as conn:
+            current = conn.execute("SELECT seq FROM feed_meta WHERE id = 0").fetchone()[0]
+            row = conn.execute("SELECT floor FROM feed_repos WHERE repo_key = ?", (repo_key,)).fetchone()
+            since = parse_cursor(cursor, self.epoch, current)
+            full = since is None or since < (row[0] if row else 0)
+            items = conn.execute("""SELECT pipeline_id, seq, fingerprint, removed FROM feed_items
+                WHERE repo_key = ? ORDER BY position""", (repo_key,)).fetchall()
+        return {
+            "cursor": f"{self.epoch}.{current}",
+            "full": full,
+            # The fingerprint is the pipeline's own JSON
+            "changed": [json.loads(fp) for _, version, fp, gone in items if not gone and (full or version > since)],
+            "removed": [] if full else [i for i, version, _, gone in items if gone and version > since],
+        }
@@ -0,0 +1,127 @@
+"""
+Flaky workflow and job detection from run history
+A commit is flaky for a workflow when the same SHA both failed and passed, or passed only after a retry
+"""
+
+import threading
+
+PASSED = 'success'
+FAILED = ['failure', 'timed_out']
+
+# Minimum evidence before a workflow is reported as known-flaky
+FLAKY_THRESHOLD = 0.1
+MIN_FLAKY_COMMITS = 2
+
+
+class FlakyDetector:
+    """Incremental flakiness scores per workflow and per job"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # repo -> workflow -> sha -> {run_id: (conclusion, run_attempt)}
+        self._outcomes = {}
+        # repo -> (workflow, job) -> set of run ids where the job failed and then passed
+        self._flaky_jobs = {}
+        # repo -> set of run ids whose jobs were already observed
+        self._jobs_seen = {}
+
+    def observe_runs(self, repo_key, records):
+        """Record the latest outcome of new or changed runs"""
+        with self._lock:
+            workflows = self._outcomes.setdefault(repo_key, {})
+            for record in records:
+                if record.get('status') != 'completed' or not record.get('head_sha'):
+                    continue
+                commits = workflows.setdefault(record.get('name') or 'Workflow', {})
+                outcomes = commits.setdefault(record['head_sha'], {})
+                outcomes[record['id']] = (record.get('conclusion'), record.get('run_attempt') or 1)
+
+    def observe_jobs(self, repo_key, workflow, run_id, jobs):
+        """Record jobs that failed and later passed, within one run or on a flaky commit"""
+        by_name = {}
+        for job in jobs:
+            by_name.setdefault(job.get('name'), []).append(job)
+
+        with self._lock:
+            self._jobs_seen.setdefault(repo_key, set()).add(run_id)
+            flaky_jobs = self._flaky_jobs.setdefault(repo_key, {})
+            for name, attempts in by_name.items():
+                attempts.sort(key=lambda j: j.get('run_attempt') or 1)
+                conclusions = [j.get('conclusion') for j in attempts]
+                failed_then_passed = any(c in FAILED for c in conclusions[:-1]) and conclusions[-1] == PASSED
+                if failed_then_passed:
+                    flaky_jobs.setdefault((workflow, name), set()).add(run_id)
+
+    def mark_failed_jobs(self, repo_key, workflow, run_id, jobs):
+        """Attribute the failed jobs of a run on a flaky commit as flaky"""
+        with self._lock:
+            self._jobs_seen.setdefault(repo_key, set()).add(run_id)
+            flaky_jobs = self._flaky_jobs.setdefault(repo_key, {})
+            for job in jobs:
+                if job.get('conclusion') in FAILED:
+                    flaky_jobs.setdefault((workflow, job.get('name')), set()).add(run_id)
+
+    def jobs_seen(self, repo_key, run_id):
+        with self._lock:
+            return run_id in self._jobs_seen.get(repo_key, set())
+
+    def flaky_commits(self, repo_key):
+        """(workflow, sha, outcomes) for every commit with flaky outcomes"""
+        with self._lock:
+            workflows = {w: dict(c) for w, c in self._outcomes.get(repo_key, {}).items()}
+
+        found = []
+        for workflow, commits in workflows.items():
+            for sha, outcomes in commits.items():
+                if is_flaky(outcomes.values()):
+                    found.append((workflow, sha, dict(outcomes)))
+        return found
+
+    def report(self, repo_key):
+        """Flakiness per workflow and per job, most flaky first"""
+        with self._lock:
+            workflows = {w: {sha: dict(o) for sha, o in c.items()}
+                         for w, c in self._outcomes.get(repo_key, {}).items()}
+            flaky_jobs = {k: set(v) for k, v in self._flaky_jobs.get(repo_key, {}).items()}
+
+        workflow_rows = []
+        runs_per_workflow = {}
+        for workflow, commits in workflows.items():
+            flaky_shas = [sha for sha, outcomes in commits.items() if is_flaky(outcomes.values())]
+            attempts = [attempt for outcomes in commits.values() for _, attempt in outcomes.values()]
+            runs_per_workflow[workflow] = len(attempts)
+            flakiness = len(flaky_shas) / len(commits) if commits else 0.0
+            workflow_rows.append({
+                "workflow": workflow,
+                "commits": len(commits),
+                "flaky_commits": len(flaky_shas),
+                "flakiness": round(flakiness, 3),
+                "retried_runs": len([a for a in attempts if a > 1]),
+                "extra_attempts": sum(a - 1 for a in attempts),
+                "known_flaky": flakiness >= FLAKY_THRESHOLD and len(flaky_shas) >= MIN_FLAKY_COMMITS,
+                "flaky_shas": [sha[:7] for sha in flaky_shas[:5]],
+            })
+
+        job_rows = []
+        for (workflow, job), run_ids in flaky_jobs.items():
+            total = max(runs_per_workflow.get(workflow, 0), len(run_ids))
+            job_rows.append({
+                "workflow": workflow,
+                "job": job,
+                "flaky_runs": len(run_ids),
+                "runs": total,
+                "flakiness": round(len(run_ids) / total, 3) if total else 0.0,
+            })
+
+        workflow_rows.sort(key=lambda r: (-r['flakiness'], r['workflow']))
+        job_rows.sort(key=lambda r: (-r['flakiness'], r['workflow'], r['job'] or ''))
+        return {"workflows": workflow_rows, "jobs": job_rows}
+
+
+def is_flaky(outcomes):
+    """True when a commit both failed and passed, or passed only after a retry"""
+    outcomes = list(outcomes)
+    conclusions = {conclusion for conclusion, _ in outcomes}
+    if PASSED in conclusions and conclusions.intersection(FAILED):
+        return True
+    return any(conclusion == PASSED and attempt > 1 for conclusion, attempt in outcomes)
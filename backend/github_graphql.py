@@ -0,0 +1,130 @@
+"""
+Bulk repository fetch through GitHub's GraphQL API
+One query returns a page of repositories with their metadata and latest Actions run status,
+so the repository overview needs a handful of calls instead of one REST call per repository
+"""
+
+# GitHub Actions' app id, so other CI integrations' check suites are ignored
+GITHUB_ACTIONS_APP_ID = 15368
+
+PAGE_SIZE = 50
+# Stop paginating when the token's GraphQL budget drops this low, leaving room for other queries
+MIN_POINTS_REMAINING = 100
+
+REPOSITORIES_QUERY = """
+query($first: Int!, $after: String, $appId: Int!) {
+  rateLimit { cost remaining limit resetAt }
+  viewer {
+    repositories(first: $first, after: $after, orderBy: {field: UPDATED_AT, direction: DESC},
+                 affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER]) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        databaseId
+        name
+        nameWithOwner
+        description
+        updatedAt
+        owner { login }
+        primaryLanguage { name }
+        defaultBranchRef {
+          name
+          target {
+            ... on Commit {
+              oid
+              checkSuites(last: 1, filterBy: {appId: $appId}) {
+                nodes {
+                  status
+                  conclusion
+                  updatedAt
+                  workflowRun { databaseId url workflow { name } }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+def latest_run(node):
+    """Latest Actions run on the default branch head, in REST-style lowercase, or None"""
+    branch = node.get('defaultBranchRef') or {}
+    commit = branch.get('target') or {}
+    suites = (commit.get('checkSuites') or {}).get('nodes') or []
+    if not suites:
+        return None
+
+    suite = suites[-1]
+    run = suite.get('workflowRun') or {}
+    return {
+        "pipeline_id": str(run['databaseId']) if run.get('databaseId') else None,
+        "workflow": (run.get('workflow') or {}).get('name'),
+        "status": (suite.get('status') or '').lower() or None,
+        "conclusion": (suite.get('conclusion') or '').lower() or None,
+        "branch": branch.get('name'),
+        "head_sha": commit.get('oid'),
+        "updated_at": suite.get('updatedAt'),
+        "url": run.get('url'),
+    }
+
+
+def to_repository(node):
+    """Repository in the same shape as the REST listing, plus its latest run"""
+    return {
+        "id": node['databaseId'],
+        "name": node['name'],
+        "full_name": node['nameWithOwner'],
+        "description": node.get('description'),
+        "language": (node.get('primaryLanguage') or {}).get('name'),
+        "updated_at": node.get('updatedAt'),
+        "owner": node['owner']['login'],
+        "latest_run": latest_run(node),
+    }
+
+
+def fetch_repositories(post, max_repos=1000, page_size=PAGE_SIZE, min_remaining=MIN_POINTS_REMAINING):
+    """Page through the viewer's repositories with cursor pagination
+
+    post(query, variables) returns the decoded GraphQL response, or None on error.
+    Returns (repositories, stats); stats["complete"] is False when paging stopped early
+    because of an error or the point budget.
+    """
+    repos = []
+    stats = {"calls": 0, "cost": 0, "remaining": None, "complete": False}
+    cursor = None
+
+    while len(repos) < max_repos:
+        result = post(REPOSITORIES_QUERY, {
+            "first": min(page_size, max_repos - len(repos)),
+            "after": cursor,
+            "appId": GITHUB_ACTIONS_APP_ID,
+        })
+        stats["calls"] += 1
+        if not result or result.get('errors') or not result.get('data'):
+            errors = (result or {}).get('errors')
+            print(f"GitHub GraphQL error: {errors[0].get('message') if errors else 'no data'}")
+            break
+
+        data = result['data']
+        rate = data.get('rateLimit') or {}
+        stats["cost"] += rate.get('cost') or 0
+        stats["remaining"] = rate.get('remaining')
+
+        connection = data['viewer']['repositories']
+        repos.extend(to_repository(node) for node in connection['nodes'] if node)
+
+        page = connection['pageInfo']
+        if not page['hasNextPage']:
+            stats["complete"] = True
+            break
+        if stats["remaining"] is not None and stats["remaining"] < min_remaining:
+            print(f"Stopping GraphQL pagination: {stats['remaining']} points left")
+            break
+        cursor = page['endCursor']
+
+    if len(repos) >= max_repos:
+        stats["complete"] = True
+    return repos[:max_repos], stats
@@ -0,0 +1,118 @@
+"""
+Failure-signature classifier for GitHub Actions job logs
+All signatures are compiled into one regex so each log line is scanned once
+"""
+
+import re
+
+# (category, label, pattern) - earlier entries win when a run matches several
+SIGNATURES = [
+    ("out_of_memory", "Out of memory",
+     r"JavaScript heap out of memory|MemoryError|Cannot allocate memory|OOMKilled|exit code 137\b"),
+    ("timeout", "Timeout",
+     r"timed out|exceeded the maximum execution time|The operation was canceled|ETIMEDOUT"),
+    ("auth_error", "Authentication / permission error",
+     r"Bad credentials|401 Unauthorized|403 Forbidden|Permission denied|authentication (?:failed|required)|Resource not accessible by integration"),
+    ("disk_space", "Out of disk space",
+     r"No space left on device|ENOSPC"),
+    ("npm_install", "npm dependency install failed",
+     r"npm ERR! (?:code (?:ERESOLVE|E404|ETARGET|ENOENT)|ERESOLVE|404)|Could not resolve dependency|yarn install.*failed|pnpm.*ERR_PNPM"),
+    ("pip_install", "pip dependency install failed",
+     r"No matching distribution found|Could not find a version that satisfies|ResolutionImpossible|pip subprocess to install|error: subprocess-exited-with-error"),
+    ("network_error", "Network error",
+     r"ECONNRESET|ECONNREFUSED|Could not resolve host|Connection refused|Temporary failure in name resolution|TLS handshake timeout"),
+    ("docker_build", "Docker build failed",
+     r"failed to solve|manifest unknown|pull access denied|Cannot connect to the Docker daemon"),
+    ("test_failure", "Test failures",
+     r"\b\d+ (?:failed|failing)\b|Tests?:\s+\d+ failed|FAILED [\w/.\-]+::|AssertionError|npm ERR! Test failed|Test Suites?: \d+ failed"),
+    ("compile_error", "Build / compile error",
+     r"error TS\d+|SyntaxError|ModuleNotFoundError|ImportError|Cannot find module|compilation failed|BUILD FAILED|error\[E\d+\]"),
+    ("lint_error", "Lint errors",
+     r"\d+ problems? \(\d+ errors?|flake8|eslint.*error|would reformat"),
+    # The kernel or shell reporting a SIGKILL, usually the OOM killer; last, as it says the least.
+    # Only the bare message counts, not "killed" anywhere in a line
+    ("killed", "Process killed (likely out of memory)",
+     r"^Killed$|line \d+:\s+\d+ Killed\b|killed by signal 9\b|\bSIGKILL\b"),
+]
+
+GENERIC_ERROR = re.compile(r"##\[error\]|\berror\b|\bfailed\b", re.IGNORECASE)
+
+CATEGORY_LABELS = {category: label for category, label, _ in SIGNATURES}
+CATEGORY_LABELS["unknown"] = "Unclassified failure"
+
+_PRIORITY = {category: index for index, (category, _, _) in enumerate(SIGNATURES)}
+
+# One alternation with a named group per category; a match reports its category via lastgroup
+_COMBINED = re.compile(
+    "|".join(f"(?P<{category}>{pattern})" for category, _, pattern in SIGNATURES),
+    re.IGNORECASE,
+)
+
+# GitHub prefixes every log line with an ISO timestamp
+_TIMESTAMP = re.compile(r"^\ufeff?\d{4}-\d{2}-\d{2}T[\d:.]+Z\s?")
+
+MAX_EVIDENCE_LINES = 5
+MAX_LINE_LENGTH = 300
+
+
+def clean_log_line(line):
+    """Strip the timestamp prefix and trailing whitespace from a log line"""
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    return _TIMESTAMP.sub("", line).rstrip()[:MAX_LINE_LENGTH]
+
+
+def classify_log(lines, max_evidence=MAX_EVIDENCE_LINES):
+    """Classify a log in a single streaming pass over its lines"""
+    counts = {}
+    evidence = {}
+    generic = []
+
+    for raw in lines:
+        line = clean_log_line(raw)
+        if not line:
+            continue
+
+        match = _COMBINED.search(line)
+        if match:
+            category = match.lastgroup
+            counts[category] = counts.get(category, 0) + 1
+            found = evidence.setdefault(category, [])
+            if len(found) < max_evidence:
+                found.append(line.replace("##[error]", "").strip())
+        elif len(generic) < max_evidence and GENERIC_ERROR.search(line):
+            generic.append(line.replace("##[error]", "").strip())
+
+    if counts:
+        category = min(counts, key=lambda c: _PRIORITY[c])
+        lines_found = evidence[category]
+    else:
+        category = "unknown"
+        lines_found = generic
+
+    return {
+        "category": category,
+        "label": CATEGORY_LABELS[category],
+        "evidence": lines_found,
+        "matches": counts,
+    }
+
+
+def merge_classifications(results):
+    """Combine per-job classifications into one verdict for the run"""
+    results = [r for r in results if r]
+    if not results:
+        return None
+
+    known = [r for r in results if r["category"] != "unknown"]
+    best = min(known, key=lambda r: _PRIORITY[r["category"]]) if known else results[0]
+
+    evidence = []
+    for result in [best] + [r for r in results if r is not best]:
+        for line in result["evidence"]:
+            if len(evidence) >= MAX_EVIDENCE_LINES:
+                break
+            if line not in evidence:
+                evidence.append(line)
+
+    return {"category": best["category"], "label": best["label"], "evidence": evidence}
@@ -0,0 +1,47 @@
+"""
+Bounded in-process cache with least-recently-used eviction
+For per-run results that never change (job listings, failure verdicts) but must not grow forever
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe mapping that keeps at most max_entries, dropping the least recently used"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def update(self, entries):
+        for key, value in entries.items():
+            self.set(key, value)
+
+    def items(self):
+        """Snapshot of the entries, least recently used first"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
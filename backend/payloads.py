@@ -0,0 +1,66 @@
+"""
+Compact encodings for the large list endpoints
+fields= keeps only the requested keys; format=columnar sends one array per column,
+dictionary-encoding string columns whose values repeat (owner, language, status, ...)
+"""
+
+# Dictionary-encode a string column when it has at most this share of distinct values
+DICTIONARY_MAX_DISTINCT_RATIO = 0.5
+
+
+def parse_fields(value):
+    """'name,owner' -> ['name', 'owner'], or None when no projection was asked for"""
+    if not value:
+        return None
+    fields = [f.strip() for f in value.split(',') if f.strip()]
+    return fields or None
+
+
+def project(records, fields):
+    """Records with only the requested fields (missing fields become None)"""
+    if not fields:
+        return records
+    return [{field: record.get(field) for field in fields} for record in records]
+
+
+def column_names(records):
+    """Keys of all records, in first-seen order"""
+    names = {}
+    for record in records:
+        for key in record:
+            names.setdefault(key, None)
+    return list(names)
+
+
+def encode_column(values):
+    """Plain list, or {"dictionary": [...], "codes": [...]} for repetitive strings"""
+    if not values or not all(v is None or isinstance(v, str) for v in values):
+        return values
+
+    dictionary = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(-1)
+        else:
+            codes.append(dictionary.setdefault(value, len(dictionary)))
+    if len(dictionary) > len(values) * DICTIONARY_MAX_DISTINCT_RATIO:
+        return values
+    return {"dictionary": list(dictionary), "codes": codes}
+
+
+def to_columnar(records, fields=None):
+    """Column-oriented payload of a list of records"""
+    names = fields or column_names(records)
+    return {
+        "format": "columnar",
+        "count": len(records),
+        "columns": {name: encode_column([record.get(name) for record in records]) for name in names},
+    }
+
+
+def shape_list(records, fields=None, fmt=None):
+    """Apply the fields= projection and format= encoding requested for a list endpoint"""
+    if fmt == 'columnar':
+        return to_columnar(records, fields)
+    return project(records, fields)
@@ -0,0 +1,106 @@
+"""
+Opt-in per-request profiling for the backend
+Every request's duration is kept in a short history; sampled or explicitly requested
+requests also run under cProfile, with the profile saved to a rotating directory
+"""
+
+import cProfile
+import os
+import pstats
+import re
+import threading
+import time
+from collections import deque
+
+TOP_FUNCTIONS = 15
+MAX_HISTORY = 500
+
+
+def top_functions(profile, limit=TOP_FUNCTIONS):
+    """Functions with the most cumulative time in a profile"""
+    stats = pstats.Stats(profile).stats
+    rows = sorted(stats.items(), key=lambda item: -item[1][3])[:limit]
+    return [{
+        "function": f"{os.path.basename(filename)}:{line}({name})",
+        "calls": calls,
+        "own_seconds": round(own, 4),
+        "cumulative_seconds": round(cumulative, 4),
+    } for (filename, line, name), (_, calls, own, cumulative, _) in rows]
+
+
+class RequestProfiler:
+    """Times every request and profiles 1 in sample_every of them (or those that ask for it)"""
+
+    def __init__(self, directory, enabled=False, sample_every=1, keep=100, history=MAX_HISTORY):
+        self.directory = directory
+        self.enabled = enabled
+        self.sample_every = max(sample_every, 1)
+        self.keep = keep
+        self._lock = threading.Lock()
+        self._requests = deque(maxlen=history)
+        self._seen = 0
+        # cProfile can only run in one thread at a time, so concurrent requests skip profiling
+        self._profiling = threading.Lock()
+
+    def _sampled(self):
+        if not self.enabled:
+            return False
+        with self._lock:
+            self._seen += 1
+            return self._seen % self.sample_every == 0
+
+    def call(self, label, fn, forced=False):
+        """Run fn() for a request, timing it and profiling it when sampled or forced"""
+        profile = None
+        if (forced or self._sampled()) and self._profiling.acquire(blocking=False):
+            profile = cProfile.Profile()
+
+        started = time.perf_counter()
+        try:
+            if profile:
+                return profile.runcall(fn)
+            return fn()
+        finally:
+            elapsed = time.perf_counter() - started
+            entry = {"request": label, "duration_ms": round(elapsed * 1000, 1), "at": time.time(),
+                     "profile": None, "top_functions": None}
+            if profile:
+                self._profiling.release()
+                try:
+                    entry["profile"] = self._save(label, elapsed, profile)
+                    entry["top_functions"] = top_functions(profile)
+                except Exception as e:
+                    print(f"Error saving profile for {label}: {e}")
+            with self._lock:
+                self._requests.append(entry)
+
+    def _save(self, label, elapsed, profile):
+        """Dump a profile as <epoch ms>-<request>-<duration>ms.prof and drop the oldest files"""
+        os.makedirs(self.directory, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', label).strip('_')[:60]
+        name = f"{int(time.time() * 1000)}-{slug}-{elapsed * 1000:.0f}ms.prof"
+        profile.dump_stats(os.path.join(self.directory, name))
+
+        files = sorted(f for f in os.listdir(self.directory) if f.endswith('.prof'))
+        for old in files[:max(len(files) - self.keep, 0)]:
+            try:
+                os.remove(os.path.join(self.directory, old))
+            except OSError:
+                pass
+        return name
+
+    def slowest(self, limit=20, profiled_only=False):
+        """Slowest requests in the recent history, slowest first"""
+        with self._lock:
+            entries = [dict(e) for e in self._requests if e["profile"] or not profiled_only]
+        return sorted(entries, key=lambda e: -e["duration_ms"])[:limit]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_every": self.sample_every,
+                "requests_timed": len(self._requests),
+                "requests_profiled": sum(1 for e in self._requests if e["profile"]),
+                "directory": self.directory,
+            }
@@ -0,0 +1,133 @@
+"""
+In-memory history of GitHub Actions workflow runs, per repository
+Runs are stored in a compact normalized form so every listing adds to the history
+"""
+
+import threading
+import time
+
+MAX_RUNS_PER_REPO = 1000
+
+RUN_FIELDS = [
+    'name', 'workflow_id', 'head_branch', 'head_sha', 'status', 'conclusion',
+    'created_at', 'updated_at', 'run_started_at', 'run_attempt', 'display_title',
+    'event', 'html_url',
+]
+
+
+def normalize_run(run):
+    """Keep only the run fields the backend needs"""
+    record = {'id': str(run['id'])}
+    for field in RUN_FIELDS:
+        record[field] = run.get(field)
+    actor = run.get('actor')
+    record['actor'] = actor.get('login') if isinstance(actor, dict) else actor
+    return record
+
+
+class RunHistory:
+    """Thread-safe store of normalized workflow runs keyed by repository"""
+
+    def __init__(self, max_runs_per_repo=MAX_RUNS_PER_REPO):
+        self.max_runs_per_repo = max_runs_per_repo
+        self._lock = threading.Lock()
+        self._runs = {}
+        self._synced_at = {}
+        # run id -> repository key, for O(1) single-run lookups
+        self._index = {}
+
+    def ingest(self, repo_key, runs, synced=True):
+        """Add or update runs, returning the records that are new or changed
+
+        synced=False adds runs without marking the repository as freshly fetched.
+        """
+        changed = []
+        with self._lock:
+            if synced:
+                self._synced_at[repo_key] = time.time()
+            stored = self._runs.setdefault(repo_key, {})
+            for run in runs:
+                record = normalize_run(run)
+                if stored.get(record['id']) != record:
+                    stored[record['id']] = record
+                    self._index[record['id']] = repo_key
+                    changed.append(record)
+
+            if len(stored) > self.max_runs_per_repo:
+                newest = sorted(stored.values(), key=lambda r: r['created_at'] or '', reverse=True)
+                self._runs[repo_key] = {r['id']: r for r in newest[:self.max_runs_per_repo]}
+                for record in newest[self.max_runs_per_repo:]:
+                    self._index.pop(record['id'], None)
+        return changed
+
+    def ingest_run(self, repo_key, run):
+        """Add a single run fetched on its own, without marking the repository as synced"""
+        record = normalize_run(run)
+        with self._lock:
+            self._runs.setdefault(repo_key, {})[record['id']] = record
+            self._index[record['id']] = repo_key
+        return record
+
+    def get_run(self, run_id):
+        """(repository key, record) of a stored run, or (None, None)"""
+        run_id = str(run_id)
+        with self._lock:
+            repo_key = self._index.get(run_id)
+            if repo_key is None:
+                return None, None
+            return repo_key, self._runs[repo_key].get(run_id)
+
+    def get_runs(self, repo_key):
+        """All stored runs of a repository, newest first"""
+        with self._lock:
+            runs = list(self._runs.get(repo_key, {}).values())
+        return sorted(runs, key=lambda r: r['created_at'] or '', reverse=True)
+
+    def synced_at(self, repo_key):
+        """When the repository's runs were last fetched from GitHub (epoch seconds), or None"""
+        with self._lock:
+            return self._synced_at.get(repo_key)
+
+    def set_synced_at(self, repo_key, synced_at):
+        """Take over when another worker last fetched the repository's runs"""
+        with self._lock:
+            self._synced_at[repo_key] = synced_at
+
+    def expire(self, repo_key):
+        """Force the next read of a repository to go back to GitHub"""
+        with self._lock:
+            if repo_key in self._synced_at:
+                self._synced_at[repo_key] = 0
+
+    def find_repo(self, run_id):
+        """Repository key of a stored run, or None"""
+        with self._lock:
+            return self._index.get(str(run_id))
+
+    def export(self):
+        """Serializable copy of the history for snapshots"""
+        with self._lock:
+            return {
+                repo_key: {"synced_at": self._synced_at.get(repo_key), "runs": list(runs.values())}
+                for repo_key, runs in self._runs.items()
+            }
+
+    def restore(self, data):
+        """Load history exported by export(), returning the restored records per repository"""
+        restored = {}
+        with self._lock:
+            for repo_key, entry in data.items():
+                runs = {r['id']: r for r in entry.get('runs', [])}
+                self._runs[repo_key] = runs
+                self._index.update({run_id: repo_key for run_id in runs})
+                self._synced_at[repo_key] = entry.get('synced_at') or 0
+                restored[repo_key] = list(runs.values())
+        return restored
+
+    def has_repo(self, repo_key):
+        with self._lock:
+            return bool(self._runs.get(repo_key))
+
+    def repos(self):
+        with self._lock:
+            return list(self._runs)
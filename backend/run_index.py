@@ -0,0 +1,167 @@
+"""
+Cross-repository inverted index over synced workflow runs
+Runs are found by commit SHA prefix, branch, workflow, actor, conclusion or repository
+without scanning every repository's history
+"""
+
+import bisect
+import heapq
+import re
+import threading
+
+from run_history import MAX_RUNS_PER_REPO
+
+# Exact-match fields: (filter name, record field)
+INDEXED_FIELDS = [
+    ('branch', 'head_branch'),
+    ('workflow', 'name'),
+    ('actor', 'actor'),
+    ('conclusion', 'conclusion'),
+    ('status', 'status'),
+    ('event', 'event'),
+]
+MIN_SHA_PREFIX = 4
+DEFAULT_LIMIT = 50
+
+_WORD = re.compile(r'[a-z0-9]+')
+_HEX = re.compile(r'^[0-9a-f]+$')
+
+
+def run_terms(repo_key, record):
+    """(field, value) postings of one run; 'word' terms back the free-text query"""
+    terms = {('repo', repo_key.lower())}
+    words = set(_WORD.findall(repo_key.lower()))
+    for name, field in INDEXED_FIELDS:
+        value = record.get(field)
+        if value:
+            value = str(value).lower()
+            terms.add((name, value))
+            words.update(_WORD.findall(value))
+    terms.update(('word', word) for word in words)
+    return terms
+
+
+def search_result(repo_key, record):
+    return {
+        "id": record['id'],
+        "repository": repo_key,
+        "workflow": record.get('name'),
+        "branch": record.get('head_branch'),
+        "commit": record.get('head_sha'),
+        "actor": record.get('actor'),
+        "status": record.get('status'),
+        "conclusion": record.get('conclusion'),
+        "event": record.get('event'),
+        "created_at": record.get('created_at'),
+        "url": record.get('html_url'),
+    }
+
+
+class RunIndex:
+    """Thread-safe postings per (field, value) plus a sorted SHA list for prefix lookups"""
+
+    def __init__(self, max_runs_per_repo=MAX_RUNS_PER_REPO):
+        self.max_runs_per_repo = max_runs_per_repo
+        self._lock = threading.Lock()
+        # (field, value) -> set of run ids
+        self._postings = {}
+        # sorted distinct SHAs, and SHA -> set of run ids
+        self._shas = []
+        self._by_sha = {}
+        # run id -> (repo key, record, terms), and run id -> created_at for newest-first results
+        self._docs = {}
+        self._created = {}
+        # repo key -> set of run ids
+        self._repos = {}
+
+    def observe_runs(self, repo_key, records):
+        """Index new or changed runs, replacing the postings of runs seen before"""
+        with self._lock:
+            for record in records:
+                self._remove(record['id'])
+                self._add(repo_key, record)
+
+            run_ids = self._repos.get(repo_key, set())
+            if len(run_ids) > self.max_runs_per_repo:
+                newest = sorted(run_ids, key=self._created.__getitem__, reverse=True)
+                for run_id in newest[self.max_runs_per_repo:]:
+                    self._remove(run_id)
+
+    def _add(self, repo_key, record):
+        run_id = record['id']
+        terms = run_terms(repo_key, record)
+        for term in terms:
+            self._postings.setdefault(term, set()).add(run_id)
+        sha = (record.get('head_sha') or '').lower()
+        if sha:
+            if sha not in self._by_sha:
+                bisect.insort(self._shas, sha)
+            self._by_sha.setdefault(sha, set()).add(run_id)
+        self._docs[run_id] = (repo_key, record, terms)
+        self._created[run_id] = record.get('created_at') or ''
+        self._repos.setdefault(repo_key, set()).add(run_id)
+
+    def _remove(self, run_id):
+        doc = self._docs.pop(run_id, None)
+        if doc is None:
+            return
+        del self._created[run_id]
+        repo_key, record, terms = doc
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.discard(run_id)
+                if not postings:
+                    del self._postings[term]
+        sha = (record.get('head_sha') or '').lower()
+        if sha in self._by_sha:
+            self._by_sha[sha].discard(run_id)
+            if not self._by_sha[sha]:
+                del self._by_sha[sha]
+                self._shas.pop(bisect.bisect_left(self._shas, sha))
+        self._repos.get(repo_key, set()).discard(run_id)
+
+    def _sha_prefix(self, prefix):
+        """Run ids whose commit SHA starts with prefix"""
+        matches = set()
+        i = bisect.bisect_left(self._shas, prefix)
+        while i < len(self._shas) and self._shas[i].startswith(prefix):
+            matches |= self._by_sha[self._shas[i]]
+            i += 1
+        return matches
+
+    def _word(self, token):
+        """Run ids matching a free-text token in any field, or by SHA prefix"""
+        matches = set(self._postings.get(('word', token), ()))
+        if len(token) >= MIN_SHA_PREFIX and _HEX.match(token):
+            matches |= self._sha_prefix(token)
+        return matches
+
+    def search(self, q=None, sha=None, limit=DEFAULT_LIMIT, **filters):
+        """(total matches, newest matching runs) for AND-ed filters and free-text tokens"""
+        with self._lock:
+            candidates = []
+            for name, value in filters.items():
+                if value:
+                    candidates.append(self._postings.get((name, value.lower()), set()))
+            if sha:
+                candidates.append(self._sha_prefix(sha.lower()))
+            for token in _WORD.findall((q or '').lower()):
+                candidates.append(self._word(token))
+
+            if not candidates:
+                return 0, []
+            candidates.sort(key=len)
+            matches = set(candidates[0])
+            for postings in candidates[1:]:
+                matches &= postings
+                if not matches:
+                    break
+
+            newest = [self._docs[run_id] for run_id in heapq.nlargest(limit, matches, key=self._created.__getitem__)]
+        return len(matches), [search_result(repo_key, record) for repo_key, record, _ in newest]
+
+    def stats(self):
+        with self._lock:
+            return {"runs": len(self._docs), "repositories": sum(1 for ids in self._repos.values() if ids),
+                    "terms": len(self._postings), "commits": len(self._shas)}
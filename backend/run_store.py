@@ -0,0 +1,95 @@
+"""
+Workflow run history shared by all backend worker processes
+Every run change published by a worker gets a cluster-wide sequence number, so each worker pulls
+only what changed since its last pull and keeps its history, analytics, flakiness and search index
+in step with the others
+"""
+
+import json
+
+from run_history import MAX_RUNS_PER_REPO
+
+
+def encode_record(record):
+    # Sorted keys, so an unchanged run always encodes to the same text
+    return json.dumps(record, sort_keys=True, separators=(',', ':'))
+
+
+class SharedRunStore:
+    """Run records and per-repository sync times, stored next to the SharedCache entries"""
+
+    def __init__(self, store, max_runs_per_repo=MAX_RUNS_PER_REPO):
+        self.store = store
+        self.max_runs_per_repo = max_runs_per_repo
+        with store.transaction() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS run_log (
+                run_id TEXT PRIMARY KEY, repo_key TEXT NOT NULL, created_at TEXT NOT NULL,
+                seq INTEGER NOT NULL, record TEXT NOT NULL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS run_log_seq ON run_log (seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS run_log_repo ON run_log (repo_key, created_at)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS run_repos (
+                repo_key TEXT PRIMARY KEY, synced_at REAL NOT NULL, seq INTEGER NOT NULL)""")
+            conn.execute("CREATE TABLE IF NOT EXISTS run_seq (id INTEGER PRIMARY KEY CHECK (id = 0), seq INTEGER NOT NULL)")
+            conn.execute("INSERT OR IGNORE INTO run_seq (id, seq) VALUES (0, 0)")
+
+    @staticmethod
+    def _read_seq(conn):
+        return conn.execute("SELECT seq FROM run_seq WHERE id = 0").fetchone()[0]
+
+    def publish(self, repo_key, records, synced_at=None):
+        """Store new or changed runs of a repository (and when it was synced); returns the new sequence number"""
+        with self.store.transaction() as conn:
+            seq = self._read_seq(conn)
+            stored, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(created_at) FROM run_log WHERE repo_key = ?", (repo_key,)).fetchone()
+            added = False
+            for record in records:
+                encoded = encode_record(record)
+                row = conn.execute("SELECT record FROM run_log WHERE run_id = ?", (record['id'],)).fetchone()
+                if row and row[0] == encoded:
+                    continue
+                if not row and stored >= self.max_runs_per_repo and (record.get('created_at') or '') < oldest:
+                    # Older than everything kept; it would be trimmed right away
+                    continue
+                seq += 1
+                added = True
+                conn.execute(
+                    "INSERT OR REPLACE INTO run_log (run_id, repo_key, created_at, seq, record) VALUES (?, ?, ?, ?, ?)",
+                    (record['id'], repo_key, record.get('created_at') or '', seq, encoded))
+
+            if added:
+                # Keep the same newest runs per repository as each worker's history
+                conn.execute("""DELETE FROM run_log WHERE repo_key = ? AND run_id NOT IN (
+                    SELECT run_id FROM run_log WHERE repo_key = ? ORDER BY created_at DESC LIMIT ?)""",
+                    (repo_key, repo_key, self.max_runs_per_repo))
+            if synced_at is not None:
+                seq += 1
+                conn.execute("INSERT OR REPLACE INTO run_repos (repo_key, synced_at, seq) VALUES (?, ?, ?)",
+                             (repo_key, synced_at, seq))
+            conn.execute("UPDATE run_seq SET seq = ? WHERE id = 0", (seq,))
+        return seq
+
+    def expire(self, repo_key):
+        """Make every worker's next read of the repository go back to GitHub"""
+        with self.store.transaction() as conn:
+            if conn.execute("SELECT 1 FROM run_repos WHERE repo_key = ?", (repo_key,)).fetchone() is None:
+                return
+            seq = self._read_seq(conn) + 1
+            conn.execute("UPDATE run_repos SET synced_at = 0, seq = ? WHERE repo_key = ?", (seq, repo_key))
+            conn.execute("UPDATE run_seq SET seq = ? WHERE id = 0", (seq,))
+
+    def changes_since(self, since):
+        """(sequence number, {repo: [records]}, {repo: synced_at}) for changes after since"""
+        with self.store.transaction(write=False) as conn:
+            seq = self._read_seq(conn)
+            if seq == since:
+                return seq, {}, {}
+            if seq < since:
+                # The shared file was recreated; start over from its first change
+                since = 0
+            runs = {}
+            for repo_key, record in conn.execute(
+                    "SELECT repo_key, record FROM run_log WHERE seq > ? ORDER BY seq", (since,)):
+                runs.setdefault(repo_key, []).append(json.loads(record))
+            synced = dict(conn.execute("SELECT repo_key, synced_at FROM run_repos WHERE seq > ?", (since,)).fetchall())
+        return seq, runs, synced
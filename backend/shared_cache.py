@@ -0,0 +1,171 @@
+"""
+SQLite cache tier shared by all backend worker processes
+Leases make each upstream result get fetched once per cluster instead of once per worker
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import deadline
+
+LEASE_SECONDS = 30
+POLL_INTERVAL_SECONDS = 0.05
+
+
+class SharedCache:
+    """Key/value cache with expiry and cross-process fetch leases, stored in one SQLite file"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._counters = {"hits": 0, "misses": 0, "fetched": 0, "waited": 0, "timed_out": 0}
+        self._counter_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, expires_at REAL NOT NULL)""")
+            conn.execute("""CREATE TABLE IF NOT EXISTS leases (
+                key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)""")
+
+    def _connect(self):
+        # One connection per thread; sqlite3 connections must not be shared across threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._counter_lock:
+            self._counters[name] += 1
+
+    def get(self, key):
+        """Cached value for a key, or None when missing or expired"""
+        row = self._connect().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        self._connect().execute(
+            "INSERT OR REPLACE INTO entries (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value, separators=(',', ':')), now, now + ttl))
+
+    @contextmanager
+    def transaction(self, write=True):
+        """This thread's connection inside one transaction; writers hold the file lock from the start"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def claim(self, key, value, ttl):
+        """Store value unless a live entry exists, atomically across processes; returns the stored value"""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ? AND expires_at <= ?", (key, now))
+            conn.execute(
+                "INSERT OR IGNORE INTO entries (key, value, stored_at, expires_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, separators=(',', ':')), now, now + ttl))
+            row = conn.execute("SELECT value FROM entries WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0])
+
+    def delete(self, key):
+        self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix):
+        """Drop every entry whose key starts with prefix"""
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        self._connect().execute("DELETE FROM entries WHERE key LIKE ? ESCAPE '\\'", (escaped + '%',))
+
+    def acquire_lease(self, key, seconds=LEASE_SECONDS):
+        """Try to become the one process fetching a key"""
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM leases WHERE key = ? AND expires_at <= ?", (key, now))
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO leases (key, owner, expires_at) VALUES (?, ?, ?)",
+            (key, self._owner, now + seconds))
+        return cursor.rowcount == 1
+
+    def release_lease(self, key):
+        self._connect().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def _lease_held(self, key):
+        row = self._connect().execute(
+            "SELECT 1 FROM leases WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return row is not None
+
+    def fetch(self, key, ttl, loader, cache_if=lambda value: value is not None):
+        """Cached value, or load it once per cluster while other processes wait for the result
+
+        A waiter gives up when its request deadline passes first; it then returns None and the
+        response is marked partial.
+        """
+        value = self.get(key)
+        if value is not None:
+            self._count("hits")
+            return value
+        self._count("misses")
+
+        budget = deadline.remaining()
+        capped = budget is not None and budget < LEASE_SECONDS
+        give_up = time.time() + (budget if capped else LEASE_SECONDS)
+        while time.time() < give_up:
+            if self.acquire_lease(key):
+                try:
+                    value = loader()
+                    if cache_if(value):
+                        self.set(key, value, ttl)
+                    self._count("fetched")
+                    return value
+                finally:
+                    self.release_lease(key)
+
+            # Another worker is fetching: wait for its result instead of calling GitHub too
+            while self._lease_held(key) and time.time() < give_up:
+                time.sleep(POLL_INTERVAL_SECONDS)
+            value = self.get(key)
+            if value is not None:
+                self._count("waited")
+                return value
+
+        if capped:
+            # The request ran out of time before the other worker finished
+            self._count("timed_out")
+            deadline.mark_partial()
+            return None
+        # The other worker took too long; fetch ourselves rather than fail
+        return loader()
+
+    def purge_expired(self):
+        now = time.time()
+        conn = self._connect()
+        conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        conn.execute("DELETE FROM leases WHERE expires_at <= ?", (now,))
+
+    def close(self):
+        """Close this thread's connection (the parent does this before forking workers)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def stats(self):
+        with self._counter_lock:
+            counters = dict(self._counters)
+        row = self._connect().execute("SELECT COUNT(*) FROM entries WHERE expires_at > ?", (time.time(),)).fetchone()
+        return dict(counters, path=self.path, entries=row[0])
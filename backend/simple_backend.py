@@ -4,29 +4,136 @@ Simple HTTP server for DevOps AI Assistant
 Works with Python 3.13 without FastAPI compatibility issues
 """
 
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse
 import json
 import urllib.parse
 from datetime import datetime
 import requests
 import os
+import re
+import signal
+import threading
+import time
 from dotenv import load_dotenv
+from log_analysis import classify_log, merge_classifications
+from run_history import RunHistory, normalize_run
+from analytics import AnalyticsCache
+from flaky import FlakyDetector
+from run_index import RunIndex, INDEXED_FIELDS, DEFAULT_LIMIT as SEARCH_DEFAULT_LIMIT
+from single_flight import SingleFlight
+from snapshot import save_snapshot, load_snapshot
+from action_queue import ActionQueue, resolve_action
+from timing import analyze_run_timing, summarize_timings
+from shared_cache import SharedCache
+from run_store import SharedRunStore
+from lru_cache import LRUCache
+from token_pool import TokenPool
+from github_graphql import fetch_repositories
+from payloads import parse_fields, project, shape_list
+from delta_feed import PipelineFeed, SharedPipelineFeed
+from profiling import RequestProfiler
+import deadline
 
 # Load environment variables
 load_dotenv()
 
+# Jobs and failure verdicts of completed runs never change; the most recently used are kept by run id
+MAX_CACHED_JOB_LISTINGS = 2000
+MAX_CACHED_FAILURE_VERDICTS = 5000
+_jobs_cache = LRUCache(MAX_CACHED_JOB_LISTINGS)
+_failure_cache = LRUCache(MAX_CACHED_FAILURE_VERDICTS)
+
+FAILED_CONCLUSIONS = ['failure', 'timed_out']
+
+# Every runs listing feeds the history; analytics are derived from it
+RUN_HISTORY = RunHistory()
+ANALYTICS_CACHE = AnalyticsCache()
+FLAKY_DETECTOR = FlakyDetector()
+RUN_INDEX = RunIndex()
+
+# Upper bound on runs returned by one /search
+SEARCH_MAX_LIMIT = 500
+
+# Versions of the pipelines served per repository, for /pipelines?since=<cursor>
+# Replaced by the shared feed in enable_shared_cache, so every worker answers the same cursors
+PIPELINE_FEED = PipelineFeed()
+
+# Concurrent identical upstream requests share one GitHub call
+UPSTREAM_CALLS = SingleFlight()
+
+# Upper bound on job listings fetched per flakiness report
+MAX_FLAKY_JOB_FETCHES = 20
+
+# Repository list cache; a stale list is served while a background refresh runs
+REPOSITORIES_TTL = 300
+_repository_cache = {"data": None, "fetched_at": 0}
+
+# Runs fetched within this window are served from the run history
+PIPELINES_TTL = 15
+
+# Warm-start snapshot of the caches, written periodically and on shutdown
+SNAPSHOT_PATH = os.getenv('BACKEND_SNAPSHOT_PATH',
+                          os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'snapshot.json.gz'))
+SNAPSHOT_INTERVAL = int(os.getenv('BACKEND_SNAPSHOT_INTERVAL', '300'))
+WARM_START_REVALIDATE_REPOS = 10
+
+# Repositories whose runs came from the snapshot and have not been revalidated yet
+_restored_repos = set()
+
+# Recent runs analyzed by the repository timing report (each needs its jobs)
+TIMING_DEFAULT_RUNS = 10
+TIMING_MAX_RUNS = 30
+
+# Concurrent GitHub calls made by the pipeline action queue
+ACTION_WORKERS = int(os.getenv('ACTION_WORKERS', '4'))
+
+# GitHub tokens; each request uses the allowed token with the most rate limit left
+TOKEN_POOL = TokenPool.from_env(os.getenv('GITHUB_TOKENS'), os.getenv('GITHUB_TOKEN'))
+
+# Repository list upstream: 'rest' (one call per 100 repos) or 'graphql' (bulk, with latest run status)
+GITHUB_REPOSITORIES_SOURCE = os.getenv('GITHUB_REPOSITORIES_SOURCE', 'rest').lower()
+GITHUB_GRAPHQL_URL = os.getenv('GITHUB_GRAPHQL_URL', 'https://api.github.com/graphql')
+
+# Multi-process mode: worker processes share one listening socket and this SQLite cache tier
+BACKEND_WORKERS = int(os.getenv('BACKEND_WORKERS', '1'))
+BACKEND_PORT = int(os.getenv('BACKEND_PORT', '8000'))
+SHARED_CACHE_PATH = os.getenv('BACKEND_SHARED_CACHE_PATH',
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'shared_cache.sqlite3'))
+SHARED_CACHE = None
+# Run history shared by the workers, and how far this worker has pulled it
+SHARED_RUNS = None
+_shared_runs_seq = 0
+_shared_runs_lock = threading.Lock()
+
+# Jobs and failure verdicts of completed runs are kept in the shared tier for a day
+COMPLETED_RUN_TTL = 86400
+
+# Request profiling: BACKEND_PROFILE=1 profiles 1 in BACKEND_PROFILE_EVERY requests; an
+# authorized request can also ask for its own profile with the X-Profile header
+PROFILE_HEADER = 'X-Profile'
+PROFILER = RequestProfiler(
+    os.getenv('BACKEND_PROFILE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'profiles')),
+    enabled=os.getenv('BACKEND_PROFILE', '').lower() in ('1', 'true', 'yes'),
+    sample_every=int(os.getenv('BACKEND_PROFILE_EVERY', '1')),
+    keep=int(os.getenv('BACKEND_PROFILE_KEEP', '100')),
+)
+
+# Owner and repository names as GitHub allows them; anything else never reaches an API URL
+GITHUB_NAME = re.compile(r'[A-Za-z0-9_.-]+')
+
+def is_github_name(value):
+    return isinstance(value, str) and bool(GITHUB_NAME.fullmatch(value)) and value not in ('.', '..')
+
+def is_run_id(value):
+    return isinstance(value, (str, int)) and not isinstance(value, bool) and str(value).isdigit()
+
 def get_github_repositories():
     """Fetch real repositories from GitHub API"""
-    github_token = os.getenv('GITHUB_TOKEN')
-    if not github_token:
+    if not TOKEN_POOL:
         print("Warning: GITHUB_TOKEN not found in .env file")
         return []
     
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
     try:
         all_repos = []
         page = 1
@@ -34,9 +141,10 @@ def get_github_repositories():
         
         while True:
             url = f'https://api.github.com/user/repos?page={page}&per_page={per_page}&sort=updated'
-            response = requests.get(url, headers=headers)
+            # /user/repos lists the account of the first token, so the others can't stand in for it
+            response = github_request('GET', url, primary=True)
             
-            if response.status_code == 200:
+            if response is not None and response.status_code == 200:
                 repos = response.json()
                 if not repos:
                     break
@@ -56,7 +164,7 @@ def get_github_repositories():
                 if len(all_repos) >= 1000:
                     break
             else:
-                print(f"GitHub API error: {response.status_code}")
+                print(f"GitHub API error: {response.status_code if response is not None else 'no token available'}")
                 break
         
         print(f"Fetched {len(all_repos)} repositories")
@@ -66,35 +174,55 @@ def get_github_repositories():
         print(f"Error fetching GitHub repos: {e}")
         return []
 
-def get_github_workflow_logs(run_id):
-    """Fetch real GitHub Actions workflow logs"""
-    github_token = os.getenv('GITHUB_TOKEN')
-    if not github_token:
-        return ["No GitHub token configured"]
+def graphql_post(query, variables):
+    """Run one GraphQL query with the first pooled token, or None on error"""
+    response = github_request('POST', GITHUB_GRAPHQL_URL, primary=True,
+                              json={"query": query, "variables": variables})
+    if response is None or response.status_code != 200:
+        print(f"GitHub GraphQL API error: {response.status_code if response is not None else 'no token available'}")
+        return None
+    return response.json()
+
+def get_github_repositories_graphql():
+    """Fetch repositories and their latest run status in bulk GraphQL queries"""
+    if not TOKEN_POOL:
+        print("Warning: GITHUB_TOKEN not found in .env file")
+        return []
     
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
+    try:
+        repos, stats = fetch_repositories(graphql_post)
+    except Exception as e:
+        print(f"Error fetching GitHub repos over GraphQL: {e}")
+        return []
+    print(f"Fetched {len(repos)} repositories in {stats['calls']} GraphQL calls "
+          f"({stats['cost']} points, {stats['remaining']} left)")
+    return repos
+
+class LogFetchError(Exception):
+    """Logs of a run could not be fetched; status is the HTTP status to answer with"""
+    
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def get_github_workflow_logs(run_id, owner=None, repo=None):
+    """Fetch real GitHub Actions workflow logs, raising LogFetchError when they can't be fetched"""
+    if not TOKEN_POOL:
+        raise LogFetchError(503, "No GitHub token configured")
     
     try:
-        # Get workflow run details first to get the repository info
-        run_url = f'https://api.github.com/repos/Hritikraj8804/my-node-devops-app/actions/runs/{run_id}'
-        run_response = requests.get(run_url, headers=headers)
-        
-        if run_response.status_code != 200:
-            return [f"Failed to fetch run details: {run_response.status_code}"]
-        
-        run_data = run_response.json()
+        # Resolve the run (and its repository) from the run-id index
+        repo_key, run_data = get_workflow_run(run_id, owner, repo)
+        if not run_data:
+            raise LogFetchError(404, f"Run {run_id} not found")
+        owner, repo = repo_key.split('/', 1)
         
         # Get jobs for this workflow run
-        jobs_url = f'https://api.github.com/repos/Hritikraj8804/my-node-devops-app/actions/runs/{run_id}/jobs'
-        jobs_response = requests.get(jobs_url, headers=headers)
+        jobs = get_run_jobs(owner, repo, str(run_id), completed=run_data.get('status') == 'completed')
+        if jobs is None and not deadline.is_partial():
+            raise LogFetchError(502, f"Failed to fetch jobs of run {run_id}")
         
-        if jobs_response.status_code != 200:
-            return [f"Failed to fetch jobs: {jobs_response.status_code}"]
-        
-        jobs_data = jobs_response.json()
+        jobs_data = {'jobs': jobs or []}
         logs = []
         
         # Add run summary
@@ -103,6 +231,9 @@ def get_github_workflow_logs(run_id):
         logs.append(f"[INFO] Started: {run_data.get('created_at', 'unknown')}")
         logs.append(f"[INFO] Branch: {run_data.get('head_branch', 'unknown')}")
         logs.append("")
+        if jobs is None:
+            # Out of time: the run summary is still worth returning
+            logs.append("[WARN] Job details omitted: the request deadline was reached")
         
         # Add job details
         for job in jobs_data.get('jobs', []):
@@ -127,112 +258,772 @@ def get_github_workflow_logs(run_id):
             
             logs.append("")
         
-        return logs if logs else ["No logs available for this workflow run"]
+        return logs
         
+    except LogFetchError:
+        raise
     except Exception as e:
         print(f"Error fetching workflow logs: {e}")
-        return [f"Error fetching logs: {str(e)}"]
+        raise LogFetchError(502, f"Error fetching logs: {e}")
 
-def get_github_workflows(owner, repo):
-    """Fetch real GitHub Actions workflows"""
-    print(f"DEBUG: get_github_workflows called with owner={owner}, repo={repo}")
+def shared_fetch(key, ttl, loader, *args, cache_if=lambda value: value is not None):
+    """Call loader through the cluster-wide cache in multi-process mode, directly otherwise"""
+    if SHARED_CACHE is None:
+        return loader(*args)
+    # Results cut short by a request deadline are never shared
+    return SHARED_CACHE.fetch(key, ttl, lambda: loader(*args),
+                              cache_if=lambda value: cache_if(value) and not deadline.is_partial())
+
+def github_request(method, url, owner=None, primary=False, **kwargs):
+    """Call the GitHub API with a pooled token, failing over when a token is exhausted or revoked
     
-    github_token = os.getenv('GITHUB_TOKEN')
-    if not github_token:
+    Returns the response, or None when no token is configured or available for the owner, or
+    when the request's deadline leaves no time for the call (the response is then partial).
+    """
+    tried = set()
+    response = None
+    while True:
+        token = TOKEN_POOL.acquire(owner, exclude=tried, primary=primary)
+        if token is None:
+            return response
+        timeout = deadline.upstream_timeout()
+        if timeout is None:
+            deadline.mark_partial()
+            return None
+        headers = {
+            'Authorization': f'token {token.value}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
+        try:
+            response = requests.request(method, url, headers=headers, timeout=timeout, **kwargs)
+        except requests.Timeout:
+            print(f"GitHub request timed out after {timeout:.1f}s: {method} {url}")
+            deadline.mark_partial()
+            return None
+        if not TOKEN_POOL.record(token, response):
+            return response
+        print(f"GitHub token {token.name} is exhausted or revoked ({response.status_code}), failing over")
+        response.close()
+        tried.add(token.name)
+
+def get_run_jobs(owner, repo, run_id, completed=True, all_attempts=False):
+    """Fetch the jobs of a workflow run (cached once the run has completed), None on error"""
+    cache_key = f"{run_id}:all" if all_attempts else run_id
+    jobs = _jobs_cache.get(cache_key)
+    if jobs is not None:
+        return jobs
+    
+    if completed:
+        jobs = shared_fetch(f"jobs:{owner}/{repo}:{cache_key}", COMPLETED_RUN_TTL,
+                            request_run_jobs, owner, repo, run_id, all_attempts)
+        if jobs is not None:
+            _jobs_cache.set(cache_key, jobs)
+        return jobs
+    return request_run_jobs(owner, repo, run_id, all_attempts)
+
+def run_jobs_cached(owner, repo, run_id, all_attempts=False):
+    """True when a completed run's jobs can be read without calling GitHub"""
+    cache_key = f"{run_id}:all" if all_attempts else run_id
+    if cache_key in _jobs_cache:
+        return True
+    return SHARED_CACHE is not None and SHARED_CACHE.get(f"jobs:{owner}/{repo}:{cache_key}") is not None
+
+def request_run_jobs(owner, repo, run_id, all_attempts=False):
+    """Jobs of a workflow run straight from GitHub, None on error"""
+    url = f'https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}/jobs?per_page=100'
+    if all_attempts:
+        url += '&filter=all'
+    response = github_request('GET', url, owner)
+    if response is None or response.status_code != 200:
+        print(f"GitHub jobs API error for run {run_id}: {response.status_code if response is not None else 'no response'}")
+        return None
+    return response.json().get('jobs', [])
+
+def stream_job_log(owner, repo, job_id):
+    """Yield the lines of a job log without loading the whole file"""
+    url = f'https://api.github.com/repos/{owner}/{repo}/actions/jobs/{job_id}/logs'
+    response = github_request('GET', url, owner, stream=True)
+    if response is None:
+        return
+    with response:
+        if response.status_code != 200:
+            print(f"GitHub job log API error for job {job_id}: {response.status_code}")
+            return
+        for number, line in enumerate(response.iter_lines(decode_unicode=True)):
+            if number % 1000 == 0 and deadline.expired():
+                deadline.mark_partial()
+                return
+            yield line
+
+def analyze_run_failure(owner, repo, run):
+    """Classify why a failed run failed, using the logs of its failed jobs"""
+    run_id = str(run['id'])
+    known, verdict = cached_failure_verdict(owner, repo, run_id)
+    if known:
+        return verdict
+    
+    # Log downloads are the most expensive upstream call; classify each run once per cluster
+    result = shared_fetch(f"failure:{owner}/{repo}:{run_id}", COMPLETED_RUN_TTL,
+                          classify_run_failure, owner, repo, run)
+    if result is None:
+        return None
+    _failure_cache.set(run_id, result['verdict'])
+    return result['verdict']
+
+def cached_failure_verdict(owner, repo, run_id):
+    """(known, verdict) of a run classified before, by this process or another worker"""
+    if run_id in _failure_cache:
+        return True, _failure_cache.get(run_id)
+    if SHARED_CACHE is not None:
+        result = SHARED_CACHE.get(f"failure:{owner}/{repo}:{run_id}")
+        if result is not None:
+            _failure_cache.set(run_id, result['verdict'])
+            return True, result['verdict']
+    return False, None
+
+def classify_failures_in_background(owner, repo, runs):
+    """Classify failed runs that have no verdict yet, off the request path"""
+    pending = [run for run in runs if run['conclusion'] in FAILED_CONCLUSIONS
+               and not cached_failure_verdict(owner, repo, str(run['id']))[0]]
+    if pending:
+        revalidate_in_background(('failures', owner, repo), classify_failures, owner, repo, pending)
+
+def classify_failures(owner, repo, runs):
+    for run in runs:
+        # Each run starts with a clean partial flag; a timeout on one must not void the rest
+        deadline.start()
+        try:
+            analyze_run_failure(owner, repo, run)
+        except Exception as e:
+            print(f"Error analyzing failure of run {run['id']}: {e}")
+        finally:
+            deadline.finish()
+
+def classify_run_failure(owner, repo, run):
+    """{'verdict': classification} for a failed run, or None when its jobs can't be fetched"""
+    jobs = get_run_jobs(owner, repo, str(run['id']))
+    if jobs is None:
+        return None
+    
+    results = []
+    for job in jobs:
+        if job.get('conclusion') not in FAILED_CONCLUSIONS:
+            continue
+        
+        result = classify_log(stream_job_log(owner, repo, job['id']))
+        failed_steps = [s.get('name') for s in job.get('steps', []) if s.get('conclusion') in FAILED_CONCLUSIONS]
+        if failed_steps:
+            result['evidence'].insert(0, f"Job '{job.get('name')}' failed at step '{failed_steps[0]}'")
+        if job.get('conclusion') == 'timed_out':
+            result.update({'category': 'timeout', 'label': 'Timeout'})
+        results.append(result)
+    
+    if deadline.is_partial():
+        # Logs were cut short; a verdict from them must not be cached
+        return None
+    
+    verdict = merge_classifications(results)
+    if not verdict and run.get('conclusion') == 'timed_out':
+        verdict = {'category': 'timeout', 'label': 'Timeout', 'evidence': []}
+    return {'verdict': verdict}
+
+def fetch_workflow_runs(owner, repo, per_page=50):
+    """Fetch workflow runs (once per cluster) and record them, or None when the API call fails"""
+    runs = shared_fetch(f"runs:{owner}/{repo}:{per_page}", PIPELINES_TTL,
+                        request_workflow_runs, owner, repo, per_page)
+    if runs is not None:
+        record_workflow_runs(owner, repo, runs)
+    return runs
+
+def request_workflow_runs(owner, repo, per_page=50):
+    """Normalized workflow runs straight from GitHub, or None when the API call fails"""
+    if not TOKEN_POOL:
         print("No GitHub token found")
-        return []
+        return None
     
-    headers = {
-        'Authorization': f'token {github_token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
+    url = f'https://api.github.com/repos/{owner}/{repo}/actions/runs?per_page={per_page}'
+    print(f"Fetching workflows from: {url}")
+    response = github_request('GET', url, owner)
+    if response is None:
+        print(f"No GitHub token available for {owner}")
+        return None
+    print(f"GitHub API response: {response.status_code}")
     
+    if response.status_code != 200:
+        print(f"GitHub Actions API error: {response.status_code} - {response.text[:200]}")
+        return None
+    
+    runs = response.json().get('workflow_runs', [])
+    print(f"Found {len(runs)} workflow runs")
+    return [normalize_run(run) for run in runs]
+
+def record_workflow_runs(owner, repo, runs):
+    """Add fetched runs to the run history and refresh everything derived from it"""
+    repo_key = f"{owner}/{repo}"
+    changed = RUN_HISTORY.ingest(repo_key, runs)
+    _restored_repos.discard(repo_key)
+    apply_run_changes(repo_key, changed)
+    publish_runs(repo_key, changed, RUN_HISTORY.synced_at(repo_key))
+    return changed
+
+def apply_run_changes(repo_key, changed):
+    """Bring the analytics, flakiness and search index up to date with new or changed runs"""
+    if changed:
+        ANALYTICS_CACHE.invalidate(repo_key, changed)
+        FLAKY_DETECTOR.observe_runs(repo_key, changed)
+        RUN_INDEX.observe_runs(repo_key, changed)
+
+def publish_runs(repo_key, records, synced_at=None):
+    """Share run changes with the other workers in multi-process mode"""
+    if SHARED_RUNS is None:
+        return
     try:
-        # Get workflow runs with pagination
-        url = f'https://api.github.com/repos/{owner}/{repo}/actions/runs?per_page=50'
-        print(f"Fetching workflows from: {url}")
-        response = requests.get(url, headers=headers)
-        
-        print(f"GitHub API response: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            runs = data.get('workflow_runs', [])
-            print(f"Found {len(runs)} workflow runs")
-            print(f"API response data keys: {list(data.keys())}")
-            if runs:
-                print(f"First run sample: {runs[0].get('name', 'No name')} - {runs[0].get('status', 'No status')}")
-            
-            pipelines = []
-            
-            for run in runs[:10]:  # Limit to 10 recent runs
-                # Map GitHub status to our status
-                if run['status'] == 'completed':
-                    if run['conclusion'] == 'success':
-                        status = 'success'
-                    else:
-                        status = 'failed'
-                elif run['status'] in ['in_progress', 'queued']:
-                    status = 'running'
-                else:
-                    status = 'unknown'
-                
-                pipeline = {
-                    "id": str(run['id']),
-                    "name": run['name'] or 'Workflow',
-                    "status": status,
-                    "stage": run['status'],
-                    "last_run": run['created_at'],
-                    "commit": run['head_sha'][:7] if run['head_sha'] else 'unknown',
-                    "branch": run['head_branch'] or 'main'
-                }
-                
-                # Add duration if completed
-                if run['status'] == 'completed' and run['created_at'] and run['updated_at']:
-                    try:
-                        from datetime import datetime
-                        start = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
-                        end = datetime.fromisoformat(run['updated_at'].replace('Z', '+00:00'))
-                        duration = end - start
-                        minutes = int(duration.total_seconds() / 60)
-                        seconds = int(duration.total_seconds() % 60)
-                        pipeline['duration'] = f"{minutes}m {seconds}s"
-                    except:
-                        pipeline['duration'] = 'Unknown'
-                
-                # Add error for failed runs
-                if run['conclusion'] in ['failure', 'cancelled', 'timed_out']:
-                    pipeline['error'] = f"Workflow {run['conclusion']}: {run.get('display_title', 'Unknown error')}"
-                
-                pipelines.append(pipeline)
-                print(f"Added pipeline: {pipeline['name']} - {pipeline['status']}")
-            
-            print(f"Returning {len(pipelines)} pipelines to frontend")
-            return pipelines
+        SHARED_RUNS.publish(repo_key, records, synced_at)
+    except Exception as e:
+        print(f"Error sharing runs of {repo_key}: {e}")
+
+def sync_shared_runs():
+    """Pull the run changes other workers published since the last pull into this worker's history"""
+    global _shared_runs_seq
+    if SHARED_RUNS is None:
+        return
+    with _shared_runs_lock:
+        try:
+            seq, runs, synced = SHARED_RUNS.changes_since(_shared_runs_seq)
+        except Exception as e:
+            print(f"Error reading shared runs: {e}")
+            return
+        for repo_key, records in runs.items():
+            apply_run_changes(repo_key, RUN_HISTORY.ingest(repo_key, records, synced=False))
+        for repo_key, synced_at in synced.items():
+            RUN_HISTORY.set_synced_at(repo_key, synced_at)
+            if synced_at:
+                _restored_repos.discard(repo_key)
+        _shared_runs_seq = seq
+
+def fetch_workflow_run(owner, repo, run_id):
+    """Fetch one workflow run from GitHub and add it to the run-id index, or None"""
+    run = shared_fetch(f"run:{owner}/{repo}:{run_id}", PIPELINES_TTL, request_workflow_run, owner, repo, run_id)
+    if run is None:
+        return None
+    
+    repo_key = f"{owner}/{repo}"
+    record = RUN_HISTORY.ingest_run(repo_key, run)
+    apply_run_changes(repo_key, [record])
+    publish_runs(repo_key, [record])
+    return record
+
+def request_workflow_run(owner, repo, run_id):
+    """One normalized workflow run straight from GitHub, or None"""
+    url = f'https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}'
+    response = github_request('GET', url, owner)
+    if response is None or response.status_code != 200:
+        print(f"GitHub run API error for {owner}/{repo} run {run_id}: "
+              f"{response.status_code if response is not None else 'no response'}")
+        return None
+    return normalize_run(response.json())
+
+def get_workflow_run(run_id, owner=None, repo=None):
+    """(repository key, run record) from the run-id index, with one targeted fetch on a miss"""
+    repo_key, record = RUN_HISTORY.get_run(run_id)
+    if record:
+        # Runs still in progress go stale quickly; refresh them like a listing would
+        synced_at = RUN_HISTORY.synced_at(repo_key) or 0
+        if record['status'] == 'completed' or time.time() - synced_at <= PIPELINES_TTL:
+            return repo_key, record
+        owner, repo = repo_key.split('/', 1)
+    
+    if not (owner and repo):
+        return None, None
+    
+    fetched = UPSTREAM_CALLS.do(('run', owner, repo, str(run_id)), fetch_workflow_run, owner, repo, run_id)
+    if fetched:
+        return f"{owner}/{repo}", fetched
+    return (repo_key, record) if record else (None, None)
+
+def get_pipeline_detail(run_id, owner=None, repo=None):
+    """Single pipeline with repository and run metadata, or None when unknown"""
+    repo_key, record = get_workflow_run(run_id, owner, repo)
+    if not record:
+        return None
+    
+    owner, repo = repo_key.split('/', 1)
+    pipeline = run_to_pipeline(owner, repo, record)
+    mark_known_flaky(repo_key, [pipeline])
+    classify_failures_in_background(owner, repo, [record])
+    pipeline.update({
+        "repository": {"name": repo, "owner": owner},
+        "title": record.get('display_title'),
+        "event": record.get('event'),
+        "actor": record.get('actor'),
+        "run_attempt": record.get('run_attempt'),
+        "full_commit": record.get('head_sha'),
+        "url": record.get('html_url')
+    })
+    return pipeline
+
+def get_run_timing(run_id, owner=None, repo=None):
+    """Job/step durations, queue vs execution and critical path of one run, or None"""
+    repo_key, record = get_workflow_run(run_id, owner, repo)
+    if not record:
+        return None
+    
+    owner, repo = repo_key.split('/', 1)
+    jobs = get_run_jobs(owner, repo, record['id'], completed=record['status'] == 'completed')
+    if jobs is None:
+        return None
+    return dict(analyze_run_timing(record, jobs), repository=repo_key)
+
+def get_timing_report(owner, repo, limit=TIMING_DEFAULT_RUNS, workflow=None):
+    """Slowest steps and per-job queue/execution medians across recent completed runs"""
+    repo_key = f"{owner}/{repo}"
+    if RUN_HISTORY.synced_at(repo_key) is None:
+        try:
+            fetch_workflow_runs(owner, repo)
+        except Exception as e:
+            print(f"Error fetching runs for timing report: {e}")
+    
+    records = [r for r in RUN_HISTORY.get_runs(repo_key)
+               if r['status'] == 'completed' and (not workflow or r['name'] == workflow)]
+    timings = []
+    for record in records[:min(limit, TIMING_MAX_RUNS)]:
+        if deadline.expired():
+            deadline.mark_partial()
+            break
+        jobs = get_run_jobs(owner, repo, record['id'])
+        if jobs:
+            timings.append(analyze_run_timing(record, jobs))
+    
+    return {
+        "repository": repo_key,
+        "workflow": workflow,
+        "generated_at": datetime.now().isoformat(),
+        **summarize_timings(timings),
+        "runs": [{k: t[k] for k in ('pipeline_id', 'name', 'conclusion', 'wall_seconds',
+                                    'queue_seconds_total', 'critical_path', 'critical_path_seconds')}
+                 for t in timings]
+    }
+
+def get_run_duration_seconds(run):
+    """Wall-clock duration of a completed run in seconds, or None"""
+    if run['status'] != 'completed' or not run['created_at'] or not run['updated_at']:
+        return None
+    try:
+        start = datetime.fromisoformat(run['created_at'].replace('Z', '+00:00'))
+        end = datetime.fromisoformat(run['updated_at'].replace('Z', '+00:00'))
+        return (end - start).total_seconds()
+    except ValueError:
+        return None
+
+def run_to_pipeline(owner, repo, run):
+    """Map a GitHub workflow run to the pipeline format used by the frontend"""
+    # Map GitHub status to our status
+    if run['status'] == 'completed':
+        if run['conclusion'] == 'success':
+            status = 'success'
+        else:
+            status = 'failed'
+    elif run['status'] in ['in_progress', 'queued']:
+        status = 'running'
+    else:
+        status = 'unknown'
+    
+    pipeline = {
+        "id": str(run['id']),
+        "name": run['name'] or 'Workflow',
+        "status": status,
+        "stage": run['status'],
+        "last_run": run['created_at'],
+        "commit": run['head_sha'][:7] if run['head_sha'] else 'unknown',
+        "branch": run['head_branch'] or 'main'
+    }
+    
+    # Add duration if completed
+    if run['status'] == 'completed':
+        duration_seconds = get_run_duration_seconds(run)
+        if duration_seconds is None:
+            pipeline['duration'] = 'Unknown'
         else:
-            print(f"GitHub Actions API error: {response.status_code} - {response.text[:200]}")
+            minutes = int(duration_seconds / 60)
+            seconds = int(duration_seconds % 60)
+            pipeline['duration'] = f"{minutes}m {seconds}s"
+            pipeline['duration_seconds'] = duration_seconds
+    
+    # Add error for failed runs
+    if run['conclusion'] in ['failure', 'cancelled', 'timed_out']:
+        pipeline['error'] = f"Workflow {run['conclusion']}: {run.get('display_title', 'Unknown error')}"
+    
+    # Failure cause classified from the failed jobs' logs; only verdicts already known are
+    # served here, classify_failures_in_background fetches the logs for the rest
+    if run['conclusion'] in FAILED_CONCLUSIONS:
+        _, verdict = cached_failure_verdict(owner, repo, str(run['id']))
+        if verdict:
+            pipeline['failure_category'] = verdict['category']
+            pipeline['failure_label'] = verdict['label']
+            pipeline['evidence'] = verdict['evidence']
+    
+    return pipeline
+
+def get_github_workflows(owner, repo):
+    """Fetch real GitHub Actions workflows"""
+    print(f"DEBUG: get_github_workflows called with owner={owner}, repo={repo}")
+    
+    try:
+        runs = fetch_workflow_runs(owner, repo)
+        if runs is None:
             return []
+        
+        pipelines = build_pipelines(owner, repo, runs)
+        print(f"Returning {len(pipelines)} pipelines to frontend")
+        return pipelines
     except Exception as e:
         print(f"Error fetching workflows: {e}")
         import traceback
         traceback.print_exc()
         return []
 
+def build_pipelines(owner, repo, runs):
+    """Pipelines for the 10 most recent runs; failure causes not known yet appear on a later refresh"""
+    pipelines = [run_to_pipeline(owner, repo, run) for run in runs[:10]]
+    mark_known_flaky(f"{owner}/{repo}", pipelines)
+    classify_failures_in_background(owner, repo, runs[:10])
+    return pipelines
+
+def revalidate_in_background(key, fn, *args):
+    """Refresh a cache entry in a daemon thread, coalesced with identical refreshes"""
+    def revalidate():
+        try:
+            UPSTREAM_CALLS.do(key, fn, *args)
+        except Exception as e:
+            print(f"Background refresh of {key} failed: {e}")
+    
+    threading.Thread(target=revalidate, daemon=True).start()
+
+def refresh_repositories():
+    """Fetch the repository list and keep it in the cache (errors keep the old list)"""
+    fetch = get_github_repositories_graphql if GITHUB_REPOSITORIES_SOURCE == 'graphql' else get_github_repositories
+    # An empty list usually means an API error, so it is not shared with the other workers
+    repos = shared_fetch('repositories', REPOSITORIES_TTL, fetch, cache_if=bool)
+    if repos and deadline.is_partial():
+        # Serve the pages we got, but keep a complete cached list and refetch soon otherwise
+        if _repository_cache["data"] is None:
+            _repository_cache.update(data=repos, fetched_at=0)
+        return repos
+    if repos:
+        _repository_cache.update(data=repos, fetched_at=time.time())
+    return repos
+
+def get_repositories_cached():
+    """Repository list from the cache, fetched on a miss and revalidated when stale"""
+    cached = _repository_cache["data"]
+    if cached is None:
+        return UPSTREAM_CALLS.do(('repositories',), refresh_repositories)
+    
+    if time.time() - _repository_cache["fetched_at"] > REPOSITORIES_TTL:
+        revalidate_in_background(('repositories',), refresh_repositories)
+    return cached
+
+def get_pipelines_cached(owner, repo):
+    """Pipelines from the run history when fresh, otherwise from GitHub"""
+    repo_key = f"{owner}/{repo}"
+    synced_at = RUN_HISTORY.synced_at(repo_key)
+    
+    if synced_at is not None and RUN_HISTORY.has_repo(repo_key):
+        runs = RUN_HISTORY.get_runs(repo_key)
+        if time.time() - synced_at <= PIPELINES_TTL:
+            return build_pipelines(owner, repo, runs)
+        if repo_key in _restored_repos:
+            # Warm start: answer from the snapshot now, refresh from GitHub in the background
+            revalidate_in_background(('pipelines', owner, repo), get_github_workflows, owner, repo)
+            return build_pipelines(owner, repo, runs)
+    
+    return UPSTREAM_CALLS.do(('pipelines', owner, repo), get_github_workflows, owner, repo)
+
+def get_pipeline_changes(owner, repo, pipelines, query_params):
+    """Delta of a repository's pipelines since the client's cursor"""
+    repo_key = f"{owner}/{repo}"
+    # An empty list means the GitHub call failed, not that every run disappeared
+    if pipelines:
+        PIPELINE_FEED.update(repo_key, pipelines)
+    delta = PIPELINE_FEED.changes(repo_key, query_params['since'][0])
+    delta['changed'] = project(delta['changed'], parse_fields(query_params.get('fields', [None])[0]))
+    return delta
+
+def mark_known_flaky(repo_key, pipelines):
+    """Flag failed pipelines whose workflow is known to be flaky"""
+    flaky = {w['workflow']: w for w in FLAKY_DETECTOR.report(repo_key)['workflows'] if w['known_flaky']}
+    for pipeline in pipelines:
+        workflow = flaky.get(pipeline['name'])
+        if workflow and pipeline['status'] == 'failed':
+            pipeline['known_flaky'] = True
+            pipeline['flakiness'] = workflow['flakiness']
+
+def collect_flaky_job_evidence(owner, repo):
+    """Fetch job attempts of retried runs and failed runs on flaky commits"""
+    repo_key = f"{owner}/{repo}"
+    fetches = 0
+    
+    # Retried runs: the job listing across attempts shows which job failed then passed
+    for record in RUN_HISTORY.get_runs(repo_key):
+        if fetches >= MAX_FLAKY_JOB_FETCHES:
+            return
+        if deadline.expired():
+            deadline.mark_partial()
+            return
+        if record['status'] != 'completed' or (record.get('run_attempt') or 1) <= 1:
+            continue
+        if FLAKY_DETECTOR.jobs_seen(repo_key, record['id']):
+            continue
+        # Jobs another worker already fetched are free, so every worker collects the same evidence
+        if not run_jobs_cached(owner, repo, record['id'], all_attempts=True):
+            fetches += 1
+        jobs = get_run_jobs(owner, repo, record['id'], all_attempts=True)
+        if jobs is not None:
+            FLAKY_DETECTOR.observe_jobs(repo_key, record['name'] or 'Workflow', record['id'], jobs)
+    
+    # Failed runs of commits that later passed: their failed jobs are the flaky ones
+    for workflow, sha, outcomes in FLAKY_DETECTOR.flaky_commits(repo_key):
+        for run_id, (conclusion, _) in outcomes.items():
+            if fetches >= MAX_FLAKY_JOB_FETCHES:
+                return
+            if deadline.expired():
+                deadline.mark_partial()
+                return
+            if conclusion not in FAILED_CONCLUSIONS or FLAKY_DETECTOR.jobs_seen(repo_key, run_id):
+                continue
+            if not run_jobs_cached(owner, repo, run_id):
+                fetches += 1
+            jobs = get_run_jobs(owner, repo, run_id)
+            if jobs is not None:
+                FLAKY_DETECTOR.mark_failed_jobs(repo_key, workflow, run_id, jobs)
+
+def get_flaky_report(owner, repo):
+    """Flakiness scores per workflow and per job for a repository"""
+    repo_key = f"{owner}/{repo}"
+    if RUN_HISTORY.synced_at(repo_key) is None:
+        try:
+            fetch_workflow_runs(owner, repo, per_page=100)
+        except Exception as e:
+            print(f"Error fetching runs for flakiness report: {e}")
+    
+    try:
+        collect_flaky_job_evidence(owner, repo)
+    except Exception as e:
+        print(f"Error collecting job evidence for flakiness report: {e}")
+    
+    return {
+        "repository": repo_key,
+        "generated_at": datetime.now().isoformat(),
+        **FLAKY_DETECTOR.report(repo_key)
+    }
+
+def get_pipeline_analytics(owner, repo):
+    """Success rate, MTTR and duration percentiles per workflow and branch"""
+    repo_key = f"{owner}/{repo}"
+    if RUN_HISTORY.synced_at(repo_key) is None:
+        # Seed the history with a larger window the first time a repo is analyzed
+        try:
+            fetch_workflow_runs(owner, repo, per_page=100)
+        except Exception as e:
+            print(f"Error fetching runs for analytics: {e}")
+    
+    records = RUN_HISTORY.get_runs(repo_key)
+    analytics = ANALYTICS_CACHE.get(repo_key, records)
+    return {
+        "repository": repo_key,
+        "total_runs": len(records),
+        "generated_at": datetime.now().isoformat(),
+        **analytics
+    }
+
+def perform_run_action(owner, repo, run_id, action):
+    """Call the GitHub Actions API for a rerun/cancel; returns (ok, retryable, message)"""
+    if not TOKEN_POOL:
+        return False, False, "No GitHub token configured"
+    
+    url = f'https://api.github.com/repos/{owner}/{repo}/actions/runs/{run_id}/{action}'
+    response = github_request('POST', url, owner)
+    if response is None:
+        # Every token allowed for this owner is rate limited, or GitHub timed out; the queue retries later
+        return False, True, f"GitHub unavailable for {owner}: no token with quota left or request timed out"
+    if response.status_code in (201, 202, 204):
+        return True, False, f"GitHub accepted {action} for run {run_id}"
+    
+    try:
+        detail = response.json().get('message', '')
+    except ValueError:
+        detail = response.text[:200]
+    # 5xx and secondary rate limits are worth retrying; 4xx (e.g. run not rerunnable) are not
+    retryable = response.status_code >= 500 or response.status_code == 429
+    return False, retryable, f"GitHub API error {response.status_code}: {detail}"
+
+def on_action_succeeded(owner, repo, run_id, action):
+    """Make the next pipelines read fetch fresh run state"""
+    RUN_HISTORY.expire(f"{owner}/{repo}")
+    if SHARED_RUNS is not None:
+        SHARED_RUNS.expire(f"{owner}/{repo}")
+    if SHARED_CACHE is not None:
+        SHARED_CACHE.delete_prefix(f"runs:{owner}/{repo}:")
+        SHARED_CACHE.delete(f"run:{owner}/{repo}:{run_id}")
+
+ACTION_QUEUE = ActionQueue(perform_run_action, max_workers=ACTION_WORKERS, on_success=on_action_succeeded)
+
+def select_failed_runs(owner, repo, include_cancelled=False):
+    """Failed runs that are still the latest run of their workflow and branch
+    
+    Cancelled runs were usually stopped on purpose, so they are only selected on request.
+    """
+    repo_key = f"{owner}/{repo}"
+    if RUN_HISTORY.synced_at(repo_key) is None:
+        # This worker never listed the repository; without its runs nothing would be selected
+        try:
+            fetch_workflow_runs(owner, repo, per_page=100)
+        except Exception as e:
+            print(f"Error fetching runs for bulk action: {e}")
+    
+    latest = {}
+    for record in RUN_HISTORY.get_runs(repo_key):
+        latest.setdefault((record['name'], record['head_branch']), record)
+    conclusions = FAILED_CONCLUSIONS + ['cancelled'] if include_cancelled else FAILED_CONCLUSIONS
+    return [r['id'] for r in latest.values()
+            if r['status'] == 'completed' and r['conclusion'] in conclusions]
+
+def search_runs(query_params):
+    """Runs across every synced repository matching the /search query"""
+    started = time.perf_counter()
+    params = {name: query_params.get(name, [None])[0] for name in ('q', 'sha', 'repo')}
+    params.update({name: query_params.get(name, [None])[0] for name, _ in INDEXED_FIELDS})
+    try:
+        limit = min(int(query_params.get('limit', [SEARCH_DEFAULT_LIMIT])[0]), SEARCH_MAX_LIMIT)
+    except ValueError:
+        limit = SEARCH_DEFAULT_LIMIT
+    
+    total, results = RUN_INDEX.search(limit=limit, **params)
+    return {
+        "query": {name: value for name, value in params.items() if value},
+        "total": total,
+        "results": results,
+        "took_ms": round((time.perf_counter() - started) * 1000, 2),
+        "index": RUN_INDEX.stats(),
+    }
+
+def write_snapshot():
+    """Persist the repository and run caches for the next start"""
+    # Include the runs the other workers fetched
+    sync_shared_runs()
+    state = {
+        "repositories": _repository_cache,
+        "runs": RUN_HISTORY.export(),
+        "failures": dict(_failure_cache.items()),
+    }
+    try:
+        size = save_snapshot(SNAPSHOT_PATH, state)
+        print(f"Saved cache snapshot ({size} bytes) to {SNAPSHOT_PATH}")
+    except Exception as e:
+        print(f"Error saving cache snapshot: {e}")
+
+def restore_snapshot():
+    """Load the last snapshot into the caches; returns the restored repository keys"""
+    payload = load_snapshot(SNAPSHOT_PATH)
+    if not payload:
+        return []
+    
+    state = payload["state"]
+    if state.get("repositories", {}).get("data") is not None:
+        _repository_cache.update(state["repositories"])
+    _failure_cache.update(state.get("failures", {}))
+    
+    restored = RUN_HISTORY.restore(state.get("runs", {}))
+    for repo_key, records in restored.items():
+        apply_run_changes(repo_key, records)
+    _restored_repos.update(restored)
+    
+    age = time.time() - payload["saved_at"]
+    print(f"Restored snapshot from {age:.0f}s ago: "
+          f"{len(_repository_cache['data'] or [])} repositories, {len(restored)} repos with runs")
+    return list(restored)
+
+def revalidate_restored_caches(repo_keys):
+    """Refresh what the snapshot restored, most recently synced repositories first"""
+    if _repository_cache["data"] is not None:
+        UPSTREAM_CALLS.do(('repositories',), refresh_repositories)
+    
+    repo_keys = sorted(repo_keys, key=lambda k: RUN_HISTORY.synced_at(k) or 0, reverse=True)
+    for repo_key in repo_keys[:WARM_START_REVALIDATE_REPOS]:
+        owner, repo = repo_key.split('/', 1)
+        try:
+            UPSTREAM_CALLS.do(('pipelines', owner, repo), get_github_workflows, owner, repo)
+        except Exception as e:
+            print(f"Error revalidating {repo_key}: {e}")
+
+def snapshot_loop():
+    """Write a snapshot every SNAPSHOT_INTERVAL seconds"""
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        write_snapshot()
+
 class APIHandler(BaseHTTPRequestHandler):
     def do_GET(self):
+        # The client's remaining time budget bounds every upstream call made for this request
+        deadline.start(deadline.parse_budget_ms(self.headers.get(deadline.DEADLINE_HEADER)))
+        forced = bool(self.headers.get(PROFILE_HEADER)) and self.is_authorized()
+        try:
+            PROFILER.call(f"GET {self.path.split('?')[0]}", self.route_get, forced=forced)
+        except deadline.DeadlineExceeded as e:
+            self.send_error(504, str(e))
+        finally:
+            deadline.finish()
+    
+    def is_authorized(self):
+        return self.headers.get('Authorization') == 'Bearer demo-secure-token-123'
+    
+    def route_get(self):
         # Parse URL to separate path from query parameters
         from urllib.parse import urlparse, parse_qs
         parsed = urlparse(self.path)
         path = parsed.path
         query_params = parse_qs(parsed.query)
+        # Every worker answers from the runs the whole cluster has fetched
+        sync_shared_runs()
         
         print(f"DEBUG: Request path: {path}, query: {parsed.query}")
         
         if path == '/health':
             self.send_json({"status": "healthy", "timestamp": datetime.now().isoformat()})
+        elif path == '/stats':
+            self.send_json({
+                "single_flight": UPSTREAM_CALLS.stats(),
+                "action_queue": ACTION_QUEUE.stats(),
+                "shared_cache": SHARED_CACHE.stats() if SHARED_CACHE is not None else None,
+                "tokens": TOKEN_POOL.stats(),
+                "search_index": RUN_INDEX.stats(),
+                "profiling": PROFILER.stats(),
+                "pid": os.getpid(),
+                "timestamp": datetime.now().isoformat()
+            })
+        elif path == '/debug/profiles':
+            if not self.is_authorized():
+                self.send_error(401, "Unauthorized")
+                return
+            try:
+                limit = int(query_params.get('limit', ['20'])[0])
+            except ValueError:
+                limit = 20
+            profiled_only = query_params.get('profiled', ['false'])[0].lower() == 'true'
+            self.send_json({
+                "requests": PROFILER.slowest(limit, profiled_only),
+                "profiling": PROFILER.stats(),
+            })
+        elif path == '/search':
+            search = search_runs(query_params)
+            if search["query"]:
+                self.send_json(search)
+            else:
+                self.send_error(400, "Provide q or at least one of sha, repo, " +
+                                ", ".join(name for name, _ in INDEXED_FIELDS))
         elif path == '/repositories':
-            repos = get_github_repositories()
-            self.send_json(repos)
+            repos = get_repositories_cached()
+            self.send_list(repos, query_params)
         elif path == '/pipelines':
             owner = query_params.get('owner', [None])[0]
             name = query_params.get('name', [None])[0]
@@ -241,66 +1032,202 @@ class APIHandler(BaseHTTPRequestHandler):
             print(f"DEBUG: Full query string: {parsed.query}")
             if owner and name:
                 print(f"DEBUG: Calling get_github_workflows({owner}, {name})")
-                pipelines = get_github_workflows(owner, name)
+                pipelines = get_pipelines_cached(owner, name)
                 print(f"DEBUG: Got {len(pipelines)} pipelines from get_github_workflows")
                 print(f"DEBUG: Pipelines data: {pipelines[:2] if pipelines else 'None'}")
-                self.send_json(pipelines)
+                if 'since' in query_params:
+                    self.send_json(get_pipeline_changes(owner, name, pipelines, query_params))
+                else:
+                    self.send_list(pipelines, query_params)
+            elif 'since' in query_params:
+                self.send_error(400, "owner and name are required")
             else:
                 print("DEBUG: No owner/name provided, returning empty list")
-                self.send_json([])
+                self.send_list([], query_params)
+        elif path == '/analytics':
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            if owner and name:
+                self.send_json(get_pipeline_analytics(owner, name))
+            else:
+                self.send_error(400, "owner and name are required")
+        elif path == '/flaky':
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            if owner and name:
+                self.send_json(get_flaky_report(owner, name))
+            else:
+                self.send_error(400, "owner and name are required")
+        elif path.startswith('/actions/batch/'):
+            batch = ACTION_QUEUE.get_batch(path.split('/')[3])
+            if batch:
+                self.send_json(batch)
+            else:
+                self.send_error(404, "Unknown batch")
+        elif path.startswith('/actions/'):
+            entry = ACTION_QUEUE.get(path.split('/')[2])
+            if entry:
+                self.send_json(entry)
+            else:
+                self.send_error(404, "Unknown action")
+        elif path == '/timing':
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            workflow = query_params.get('workflow', [None])[0]
+            try:
+                limit = int(query_params.get('runs', [TIMING_DEFAULT_RUNS])[0])
+            except ValueError:
+                limit = TIMING_DEFAULT_RUNS
+            if owner and name:
+                self.send_json(get_timing_report(owner, name, limit, workflow))
+            else:
+                self.send_error(400, "owner and name are required")
+        elif path.startswith('/pipelines/') and path.endswith('/timing'):
+            pipeline_id = path.split('/')[2]
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            timing = get_run_timing(pipeline_id, owner, name) if pipeline_id.isdigit() else None
+            if timing:
+                self.send_json(timing)
+            else:
+                self.send_error(404, f"Pipeline {pipeline_id} not found")
         elif path.startswith('/pipelines/') and path.endswith('/logs'):
             pipeline_id = path.split('/')[2]
-            logs = get_github_workflow_logs(pipeline_id)
-            self.send_json({"pipeline_id": pipeline_id, "logs": logs})
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            try:
+                logs = UPSTREAM_CALLS.do(('logs', pipeline_id), get_github_workflow_logs, pipeline_id, owner, name)
+            except LogFetchError as e:
+                # Errors are never sent as log lines, so they can't be mistaken for the run's output
+                self.send_error(e.status, str(e))
+            else:
+                self.send_json({"pipeline_id": pipeline_id, "logs": logs})
         elif path.startswith('/pipelines/'):
-            # Handle individual pipeline requests
+            # Handle individual pipeline requests from the run-id index
             pipeline_id = path.split('/')[2]
-            print(f"DEBUG: Individual pipeline requested: {pipeline_id}")
-            # Return mock pipeline data for individual requests
-            mock_pipeline = {
-                "id": pipeline_id,
-                "name": f"Pipeline {pipeline_id}",
-                "status": "success",
-                "stage": "completed",
-                "last_run": datetime.now().isoformat(),
-                "commit": "abc123",
-                "branch": "main"
-            }
-            self.send_json(mock_pipeline)
+            owner = query_params.get('owner', [None])[0]
+            name = query_params.get('name', [None])[0]
+            pipeline = get_pipeline_detail(pipeline_id, owner, name) if pipeline_id.isdigit() else None
+            if pipeline:
+                self.send_json(pipeline)
+            else:
+                self.send_error(404, f"Pipeline {pipeline_id} not found")
         else:
             self.send_json({"message": "DevOps Pipeline API", "version": "1.0.0"})
     
     def do_POST(self):
-        if self.path == '/pipelines/action':
+        from urllib.parse import urlparse
+        path = urlparse(self.path).path
+        
+        if path in ('/pipelines/action', '/pipelines/actions/bulk'):
             # Check authorization header
-            auth_header = self.headers.get('Authorization')
-            if auth_header != 'Bearer demo-secure-token-123':
+            if not self.is_authorized():
                 self.send_error(401, "Unauthorized")
                 return
-                
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            data = json.loads(post_data.decode('utf-8'))
             
-            response = {
-                "success": True,
-                "message": f"Action {data.get('action', 'unknown')} completed",
-                "pipeline_id": data.get('pipeline_id'),
-                "action": data.get('action'),
-                "timestamp": datetime.now().isoformat()
-            }
-            self.send_json(response)
+            try:
+                content_length = int(self.headers.get('Content-Length', 0))
+                data = json.loads(self.rfile.read(content_length).decode('utf-8') or '{}')
+            except ValueError:
+                self.send_error(400, "Invalid JSON body")
+                return
+            if not isinstance(data, dict):
+                self.send_error(400, "JSON body must be an object")
+                return
+            
+            action = resolve_action(data.get('action'))
+            if not action:
+                self.send_error(400, f"Unsupported action: {data.get('action')}")
+                return
+            idempotency_key = self.headers.get('Idempotency-Key') or data.get('idempotency_key')
+            sync_shared_runs()
+            
+            if path == '/pipelines/action':
+                self.queue_pipeline_action(data, action, idempotency_key)
+            else:
+                self.queue_bulk_action(data, action, idempotency_key)
         else:
             self.send_error(404)
     
+    def queue_pipeline_action(self, data, action, idempotency_key):
+        """Queue a rerun/cancel for one run and return immediately"""
+        if not is_run_id(data.get('pipeline_id')):
+            self.send_error(400, "pipeline_id must be a run id")
+            return
+        pipeline_id = str(data['pipeline_id'])
+        owner, name = data.get('owner'), data.get('name')
+        if (owner or name) and not (is_github_name(owner) and is_github_name(name)):
+            self.send_error(400, "owner and name must be GitHub account and repository names")
+            return
+        if not (owner and name):
+            repo_key = RUN_HISTORY.find_repo(pipeline_id)  # O(1) run-id index
+            if not repo_key:
+                self.send_error(404, "Unknown pipeline; pass owner and name")
+                return
+            owner, name = repo_key.split('/', 1)
+        
+        entry = ACTION_QUEUE.submit(owner, name, pipeline_id, action, idempotency_key, data.get('reason'))
+        self.send_json({
+            "success": True,
+            "message": f"Action {data.get('action')} queued",
+            "action_id": entry["action_id"],
+            "status": entry["status"],
+            "deduplicated": entry["deduplicated"],
+            "pipeline_id": pipeline_id,
+            "action": data.get('action'),
+            "resolved_action": action,
+            "timestamp": datetime.now().isoformat()
+        })
+    
+    def queue_bulk_action(self, data, action, idempotency_key):
+        """Queue the same action for many runs of a repository"""
+        owner, name = data.get('owner'), data.get('name')
+        if not (owner and name):
+            self.send_error(400, "owner and name are required")
+            return
+        if not (is_github_name(owner) and is_github_name(name)):
+            self.send_error(400, "owner and name must be GitHub account and repository names")
+            return
+        
+        run_ids = data.get('pipeline_ids')
+        if run_ids is not None:
+            # A string or object would otherwise be queued character by character or key by key
+            if not isinstance(run_ids, list) or not all(is_run_id(i) for i in run_ids):
+                self.send_error(400, "pipeline_ids must be a list of run ids")
+                return
+            run_ids = [str(i) for i in run_ids]
+        else:
+            # Default selection: every failed run that has not been superseded
+            run_ids = select_failed_runs(owner, name, include_cancelled=data.get('include_cancelled') is True)
+        
+        batch = ACTION_QUEUE.submit_bulk(owner, name, run_ids, action, idempotency_key, data.get('reason'))
+        self.send_json(dict(batch, success=True, queued=len(run_ids)))
+    
+    def send_list(self, records, query_params):
+        """Send a list endpoint with its fields= projection and format= encoding applied"""
+        fields = parse_fields(query_params.get('fields', [None])[0])
+        fmt = query_params.get('format', ['records'])[0]
+        if fmt not in ('records', 'columnar'):
+            self.send_error(400, f"Unsupported format: {fmt}")
+            return
+        self.send_json(shape_list(records, fields, fmt))
+    
     def send_json(self, data):
+        partial = deadline.is_partial()
+        if partial and isinstance(data, dict):
+            data = dict(data, partial=True)
+        
         self.send_response(200)
         self.send_header('Content-type', 'application/json')
+        if partial:
+            # Lists can't carry the marker themselves
+            self.send_header('X-Partial', 'true')
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, Idempotency-Key, X-Request-Deadline-Ms, X-Profile')
+        self.send_header('Access-Control-Expose-Headers', 'X-Partial')
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        self.wfile.write(json.dumps(data, separators=(',', ':')).encode())
     
     def send_error(self, code, message=None):
         self.send_response(code)
@@ -314,24 +1241,134 @@ class APIHandler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization, Idempotency-Key, X-Request-Deadline-Ms, X-Profile')
         self.end_headers()
 
-def run_server():
-    server = HTTPServer(('localhost', 8000), APIHandler)
-    print("🚀 Backend server running at http://localhost:8000")
+def enable_shared_cache():
+    """Switch this worker process to the cluster-wide cache tier, run history and pipeline feed"""
+    global SHARED_CACHE, SHARED_RUNS, _shared_runs_seq, PIPELINE_FEED
+    SHARED_CACHE = SharedCache(SHARED_CACHE_PATH)
+    SHARED_RUNS = SharedRunStore(SHARED_CACHE)
+    _shared_runs_seq = 0
+    ACTION_QUEUE.store = SHARED_CACHE
+    PIPELINE_FEED = SharedPipelineFeed(SHARED_CACHE)
+
+def init_worker():
+    """Set up a forked worker: its own connection to the shared cache tier"""
+    enable_shared_cache()
+
+def serve(server, worker_index=0):
+    """Serve requests until interrupted; only the first worker maintains the snapshot"""
+    # Warm start: serve the last snapshot immediately and revalidate it in the background
+    restored = restore_snapshot()
+    # Catch up on the cluster's shared run history before the first request
+    sync_shared_runs()
+    if worker_index == 0:
+        if restored or _repository_cache["data"] is not None:
+            threading.Thread(target=revalidate_restored_caches, args=(restored,), daemon=True).start()
+        threading.Thread(target=snapshot_loop, daemon=True).start()
+    
+    def handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, handle_sigterm)
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+    finally:
+        if worker_index == 0:
+            write_snapshot()
+
+def start_worker(server, worker_index):
+    """Fork a worker process that serves from the shared listening socket"""
+    pid = os.fork()
+    if pid:
+        return pid
+    status = 0
+    # Restarted workers inherit the supervisor's handlers; take back the defaults
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        init_worker()
+        serve(server, worker_index)
+    except Exception as e:
+        print(f"Worker {worker_index} crashed: {e}")
+        status = 1
+    finally:
+        os._exit(status)
+
+def supervise_workers(server, workers):
+    """Pre-fork workers on the bound socket and restart any that die"""
+    # Create the cache schema once, and close it so no SQLite handle crosses the fork
+    SharedCache(SHARED_CACHE_PATH).close()
+    
+    children = {start_worker(server, index): index for index in range(workers)}
+    print(f"👷 Started {workers} worker processes sharing {SHARED_CACHE_PATH}")
+    
+    stopping = False
+    def handle_stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+    
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        index = children.pop(pid, None)
+        if index is not None and not stopping:
+            print(f"Worker {index} (pid {pid}) exited with status {status}, restarting")
+            children[start_worker(server, index)] = index
+    server.server_close()
+
+def run_server(port=BACKEND_PORT, workers=BACKEND_WORKERS):
+    # One thread per request so slow GitHub calls don't block other clients
+    server = ThreadingHTTPServer(('localhost', port), APIHandler)
+    server.daemon_threads = True
+    
+    if workers > 1 and not hasattr(os, 'fork'):
+        print("Multiple workers need os.fork; running a single process")
+        workers = 1
+    
+    print(f"🚀 Backend server running at http://localhost:{port}")
     print("📚 Available endpoints:")
     print("  GET  /health")
     print("  GET  /repositories") 
+    print("  GET  /stats")
     print("  GET  /pipelines")
+    print("  GET  /analytics")
+    print("  GET  /flaky")
+    print("  GET  /search")
+    print("  GET  /timing")
+    print("  GET  /pipelines/{id}")
+    print("  GET  /pipelines/{id}/timing")
+    print("  GET  /pipelines/{id}/logs")
     print("  POST /pipelines/action")
+    print("  POST /pipelines/actions/bulk")
+    print("  GET  /actions/{id}")
+    print("  GET  /actions/batch/{id}")
+    print("  GET  /debug/profiles")
     print("\nPress Ctrl+C to stop")
     
-    try:
-        server.serve_forever()
-    except KeyboardInterrupt:
-        print("\n🛑 Server stopped")
-        server.shutdown()
+    if workers > 1:
+        supervise_workers(server, workers)
+    else:
+        serve(server)
+    print("\n🛑 Server stopped")
 
 if __name__ == "__main__":
-    run_server()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="DevOps AI Assistant backend")
+    parser.add_argument('--port', type=int, default=BACKEND_PORT, help="port to listen on (default 8000)")
+    parser.add_argument('--workers', type=int, default=BACKEND_WORKERS,
+                        help="worker processes sharing the port and one cache tier (default 1)")
+    args = parser.parse_args()
+    run_server(args.port, args.workers)
@@ -0,0 +1,75 @@
+"""
+Single-flight coalescing of identical in-flight calls
+Concurrent callers with the same key share one execution and all receive its result
+"""
+
+import threading
+
+import deadline
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.partial = False
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; duplicates wait for the leader's result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counters = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) unless an identical call is in flight, then share its result"""
+        kind = key[0] if isinstance(key, tuple) else key
+        with self._lock:
+            counters = self._counters.setdefault(kind, {"executed": 0, "coalesced": 0})
+            call = self._calls.get(key)
+            if call:
+                call.waiters += 1
+                counters["coalesced"] += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                counters["executed"] += 1
+                leader = True
+
+        if not leader:
+            # Waiters give up when their own request deadline passes
+            if not call.done.wait(deadline.remaining()):
+                deadline.mark_partial()
+                raise deadline.DeadlineExceeded(f"Timed out waiting for in-flight {kind} call")
+            if call.error:
+                raise call.error
+            if call.partial:
+                deadline.mark_partial()
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            call.partial = deadline.is_partial()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """Executed and coalesced call counts per key kind, plus calls in flight"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "by_kind": {kind: dict(counters) for kind, counters in self._counters.items()},
+                "coalesced_total": sum(c["coalesced"] for c in self._counters.values()),
+                "executed_total": sum(c["executed"] for c in self._counters.values()),
+            }
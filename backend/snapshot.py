@@ -0,0 +1,41 @@
+"""
+Warm-start snapshots of the backend caches
+The state is written as gzip-compressed JSON, atomically, so a crash mid-write never corrupts it
+"""
+
+import gzip
+import json
+import os
+import time
+
+SNAPSHOT_VERSION = 1
+
+
+def save_snapshot(path, state):
+    """Write the cache state to disk atomically; returns the snapshot size in bytes"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    payload = {"version": SNAPSHOT_VERSION, "saved_at": time.time(), "state": state}
+    data = gzip.compress(json.dumps(payload, separators=(',', ':')).encode('utf-8'))
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return len(data)
+
+
+def load_snapshot(path):
+    """Read a snapshot written by save_snapshot, or None if missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'rb') as f:
+            payload = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable snapshot {path}: {e}")
+        return None
+
+    if payload.get("version") != SNAPSHOT_VERSION:
+        print(f"Ignoring snapshot {path} with version {payload.get('version')}")
+        return None
+    return payload
@@ -0,0 +1,176 @@
+"""
+Step timing breakdown and critical-path analysis for workflow runs
+Built from the started_at/completed_at timestamps of the jobs API
+"""
+
+from datetime import datetime
+
+# Jobs that start within this many seconds of another job finishing are treated as dependent
+DEPENDENCY_TOLERANCE_SECONDS = 2
+
+
+def parse_time(value):
+    """Parse a GitHub ISO timestamp, or None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+def seconds_between(start, end):
+    if not start or not end:
+        return None
+    return max((end - start).total_seconds(), 0.0)
+
+
+def job_timing(job):
+    """Queue wait, execution time and per-step durations of one job"""
+    created = parse_time(job.get('created_at'))
+    started = parse_time(job.get('started_at'))
+    completed = parse_time(job.get('completed_at'))
+
+    steps = []
+    for step in job.get('steps', []):
+        steps.append({
+            "name": step.get('name', 'Unknown Step'),
+            "number": step.get('number'),
+            "conclusion": step.get('conclusion') or step.get('status'),
+            "duration_seconds": seconds_between(parse_time(step.get('started_at')),
+                                                parse_time(step.get('completed_at'))),
+        })
+
+    return {
+        "name": job.get('name', 'Unknown Job'),
+        "conclusion": job.get('conclusion') or job.get('status'),
+        "runner": job.get('runner_name'),
+        "created_at": job.get('created_at'),
+        "started_at": job.get('started_at'),
+        "completed_at": job.get('completed_at'),
+        "queue_seconds": seconds_between(created, started),
+        "execution_seconds": seconds_between(started, completed),
+        "steps": steps,
+    }
+
+
+def critical_path(jobs):
+    """Chain of jobs that determined the run's end time, inferred from job timestamps"""
+    timed = []
+    for job in jobs:
+        ready = parse_time(job.get('created_at')) or parse_time(job.get('started_at'))
+        completed = parse_time(job.get('completed_at'))
+        if ready and completed:
+            timed.append((ready, completed, job))
+    if not timed:
+        return [], None
+
+    # Walk back from the job that finished last to the latest job that finished before it was ready
+    current = max(timed, key=lambda t: t[1])
+    path = [current]
+    while True:
+        ready = current[0]
+        predecessors = [t for t in timed
+                        if t is not current and t not in path
+                        and (ready - t[1]).total_seconds() >= -DEPENDENCY_TOLERANCE_SECONDS
+                        and t[1] <= current[1]]
+        if not predecessors:
+            break
+        current = max(predecessors, key=lambda t: t[1])
+        path.append(current)
+
+    path.reverse()
+    total = seconds_between(path[0][0], path[-1][1])
+    return [t[2].get('name', 'Unknown Job') for t in path], total
+
+
+def analyze_run_timing(run, jobs):
+    """Per-job and per-step durations, queue vs execution time and the critical path of a run"""
+    job_timings = [job_timing(job) for job in jobs]
+    path, path_seconds = critical_path(jobs)
+
+    run_start = parse_time(run.get('run_started_at')) or parse_time(run.get('created_at'))
+    ends = [parse_time(job.get('completed_at')) for job in jobs if job.get('completed_at')]
+    wall_seconds = seconds_between(run_start, max(ends)) if ends else None
+
+    queue = [j['queue_seconds'] for j in job_timings if j['queue_seconds'] is not None]
+    execution = [j['execution_seconds'] for j in job_timings if j['execution_seconds'] is not None]
+
+    slowest = sorted(
+        ({"job": j['name'], "step": s['name'], "duration_seconds": s['duration_seconds']}
+         for j in job_timings for s in j['steps'] if s['duration_seconds'] is not None),
+        key=lambda s: -s['duration_seconds'],
+    )[:5]
+
+    return {
+        "pipeline_id": str(run.get('id')),
+        "name": run.get('name'),
+        "status": run.get('status'),
+        "conclusion": run.get('conclusion'),
+        "wall_seconds": wall_seconds,
+        "queue_seconds_total": sum(queue),
+        "queue_seconds_max": max(queue) if queue else None,
+        "execution_seconds_total": sum(execution),
+        "critical_path": path,
+        "critical_path_seconds": path_seconds,
+        "slowest_steps": slowest,
+        "jobs": job_timings,
+    }
+
+
+def summarize_timings(timings, limit=10):
+    """Slowest steps and per-job medians across several analyzed runs"""
+    steps = {}
+    jobs = {}
+    critical = {}
+    for timing in timings:
+        for job in timing['jobs']:
+            entry = jobs.setdefault(job['name'], {"queue": [], "execution": []})
+            if job['queue_seconds'] is not None:
+                entry['queue'].append(job['queue_seconds'])
+            if job['execution_seconds'] is not None:
+                entry['execution'].append(job['execution_seconds'])
+            for step in job['steps']:
+                if step['duration_seconds'] is not None:
+                    steps.setdefault((job['name'], step['name']), []).append(step['duration_seconds'])
+        for name in timing['critical_path']:
+            critical[name] = critical.get(name, 0) + 1
+
+    slowest_steps = sorted(
+        ({"job": job, "step": step, "runs": len(values), "median_seconds": median(values),
+          "max_seconds": max(values)}
+         for (job, step), values in steps.items()),
+        key=lambda s: -s['median_seconds'],
+    )[:limit]
+
+    job_rows = sorted(
+        ({"job": name, "runs": max(len(v['queue']), len(v['execution'])),
+          "median_queue_seconds": median(v['queue']),
+          "median_execution_seconds": median(v['execution']),
+          "on_critical_path": critical.get(name, 0)}
+         for name, v in jobs.items()),
+        key=lambda j: -(j['median_execution_seconds'] or 0),
+    )
+
+    walls = [t['wall_seconds'] for t in timings if t['wall_seconds'] is not None]
+    queue_total = sum(t['queue_seconds_total'] for t in timings)
+    execution_total = sum(t['execution_seconds_total'] for t in timings)
+    busy = queue_total + execution_total
+
+    return {
+        "runs_analyzed": len(timings),
+        "median_wall_seconds": median(walls),
+        "queue_share": round(queue_total / busy, 3) if busy else None,
+        "slowest_steps": slowest_steps,
+        "jobs": job_rows,
+    }
+
+
+def median(values):
+    values = sorted(values)
+    if not values:
+        return None
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2
@@ -0,0 +1,133 @@
+"""
+Pool of GitHub tokens with per-token rate-limit accounting
+Requests go to the allowed token with the most quota left; exhausted or revoked tokens are skipped
+"""
+
+import threading
+import time
+
+# GitHub's REST limit for a personal access token, assumed until a response reports the real one
+DEFAULT_RATE_LIMIT = 5000
+# Pause after a secondary rate limit that gives no usable Retry-After (GitHub asks for a minute)
+DEFAULT_RETRY_AFTER = 60
+
+
+def parse_token_spec(spec):
+    """'token' or 'token@owner1|owner2' -> (token, set of owners or None for any owner)"""
+    token, _, scope = spec.strip().partition('@')
+    owners = {o.strip().lower() for o in scope.split('|') if o.strip()} if scope else None
+    return token.strip(), owners or None
+
+
+class PooledToken:
+    """One token and what GitHub last told us about its rate limit"""
+
+    def __init__(self, name, value, owners=None):
+        self.name = name
+        self.value = value
+        self.owners = owners
+        self.limit = DEFAULT_RATE_LIMIT
+        self.remaining = None
+        self.reset_at = 0
+        # Secondary (abuse) rate limits pause a token briefly without touching its quota
+        self.cooldown_until = 0
+        self.revoked = False
+        self.requests = 0
+
+    def allows(self, owner):
+        return self.owners is None or owner is None or owner.lower() in self.owners
+
+    def available(self, now):
+        if self.revoked or now < self.cooldown_until:
+            return False
+        return self.remaining is None or self.remaining > 0 or now >= self.reset_at
+
+    def quota(self, now):
+        # A window that has already reset counts as full again
+        if self.remaining is None or now >= self.reset_at:
+            return self.limit
+        return self.remaining
+
+
+class TokenPool:
+    """Picks a token per request and tracks the REST X-RateLimit-* headers for each one"""
+
+    def __init__(self, specs):
+        self._lock = threading.Lock()
+        self._tokens = []
+        for index, spec in enumerate(specs):
+            value, owners = parse_token_spec(spec)
+            if value:
+                self._tokens.append(PooledToken(f"token-{index + 1}", value, owners))
+
+    @classmethod
+    def from_env(cls, tokens=None, token=None):
+        """Pool from GITHUB_TOKENS (comma-separated), falling back to the single GITHUB_TOKEN"""
+        if tokens:
+            return cls(tokens.split(','))
+        return cls([token] if token else [])
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def acquire(self, owner=None, exclude=(), primary=False):
+        """Token allowed for owner with the most remaining quota, or None"""
+        now = time.time()
+        with self._lock:
+            candidates = self._tokens[:1] if primary else self._tokens
+            candidates = [t for t in candidates
+                          if t.name not in exclude and t.allows(owner) and t.available(now)]
+            if not candidates:
+                return None
+            token = max(candidates, key=lambda t: t.quota(now))
+            token.requests += 1
+            return token
+
+    def record(self, token, response):
+        """Update a token's budget from a response; returns True if the request should fail over"""
+        headers = response.headers
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            # GraphQL and search have separate budgets; only bad credentials matter here
+            if response.status_code == 401:
+                with self._lock:
+                    token.revoked = True
+                return True
+            return False
+
+        with self._lock:
+            if headers.get('X-RateLimit-Limit', '').isdigit():
+                token.limit = int(headers['X-RateLimit-Limit'])
+            if headers.get('X-RateLimit-Remaining', '').isdigit():
+                token.remaining = int(headers['X-RateLimit-Remaining'])
+            if headers.get('X-RateLimit-Reset', '').isdigit():
+                token.reset_at = int(headers['X-RateLimit-Reset'])
+
+            if response.status_code == 401:
+                # Bad credentials: revoked or expired, never use it again
+                token.revoked = True
+                return True
+            if response.status_code in (403, 429) and 'Retry-After' in headers:
+                # Secondary rate limit: wait the requested time, the primary quota is unaffected
+                retry_after = headers['Retry-After']
+                seconds = int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+                token.cooldown_until = max(token.cooldown_until, time.time() + seconds)
+                return True
+            if response.status_code in (403, 429) and token.remaining == 0:
+                return True
+        return False
+
+    def stats(self):
+        """Budget per token, without the secrets"""
+        now = time.time()
+        with self._lock:
+            return [{
+                "name": t.name,
+                "owners": sorted(t.owners) if t.owners else None,
+                "limit": t.limit,
+                "remaining": t.remaining,
+                "resets_in": max(int(t.reset_at - now), 0) if t.reset_at else None,
+                "cooldown_in": max(int(t.cooldown_until - now), 0),
+                "revoked": t.revoked,
+                "available": t.available(now),
+                "requests": t.requests,
+            } for t in self._tokens]
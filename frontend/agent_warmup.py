@@ -0,0 +1,67 @@
+"""
+Background initialization of slow resources (the Portia agent)
+The first page render and early chat questions never wait for heavy imports
+"""
+
+import threading
+import time
+
+
+class BackgroundInit:
+    """Runs a factory once in a daemon thread; callers check readiness without blocking"""
+
+    def __init__(self, factory, name="warmup"):
+        self._factory = factory
+        self._name = name
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = None
+        self._result = None
+        self._error = None
+        self._started_at = None
+        self._finished_at = None
+
+    def start(self):
+        """Start the factory in the background (only the first call does anything)"""
+        with self._lock:
+            if self._thread is None:
+                self._started_at = time.time()
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        try:
+            self._result = self._factory()
+            if self._result is None:
+                self._error = "initialization returned nothing"
+        except Exception as e:
+            self._error = str(e)
+        finally:
+            self._finished_at = time.time()
+            self._done.set()
+
+    @property
+    def state(self):
+        """'not started', 'warming up', 'ready' or 'failed'"""
+        if self._thread is None:
+            return "not started"
+        if not self._done.is_set():
+            return "warming up"
+        return "failed" if self._result is None else "ready"
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def elapsed(self):
+        """Seconds spent initializing so far (or in total, once finished)"""
+        if self._started_at is None:
+            return 0.0
+        return (self._finished_at or time.time()) - self._started_at
+
+    def get(self, timeout=0):
+        """The initialized resource, or None if it is not ready within timeout seconds"""
+        self._done.wait(timeout)
+        return self._result if self._done.is_set() else None
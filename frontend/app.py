@@ -1,9 +1,15 @@
 import streamlit as st
 import requests
+import pandas as pd
 from datetime import datetime, timedelta
 import time
 import os
 from dotenv import load_dotenv
+from prompt_context import build_prompt_context, runs_needing_logs, is_speed_question, format_timing_summary
+from columnar import REPOSITORY_FIELDS, decode_columnar, frame_records
+from pipeline_table import STATUS_ICONS, pipelines_frame
+from agent_warmup import BackgroundInit
+from pipeline_sync import PipelineSync
 
 load_dotenv()
 
@@ -19,6 +25,19 @@ st.set_page_config(
 API_BASE_URL = "http://localhost:8000"
 API_TOKEN = "Bearer demo-secure-token-123"
 
+# The backend bounds its GitHub calls by this budget; the margin covers the transfer back
+DEADLINE_HEADER = "X-Request-Deadline-Ms"
+DEADLINE_MARGIN_SECONDS = 0.5
+
+# (helper, owner, name) of cached results that came back partial; they are shown once, then refetched
+PARTIAL_RESPONSES = set()
+
+# Badge for a repository's latest run (GitHub status/conclusion values)
+RUN_STATE_ICONS = {
+    "success": "✅", "failure": "❌", "timed_out": "❌", "cancelled": "⏹️",
+    "in_progress": "🔄", "queued": "⏳", "pending": "⏳", "waiting": "⏳",
+}
+
 # Simplified CSS
 st.markdown("""
 <style>
@@ -76,37 +95,65 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+def deadline_headers(timeout):
+    """Headers telling the backend how long this request will wait for an answer"""
+    return {DEADLINE_HEADER: str(int((timeout - DEADLINE_MARGIN_SECONDS) * 1000))}
+
+def note_partial(response, *key):
+    """Remember a response the backend cut short because the deadline ran out"""
+    if response.headers.get('X-Partial') == 'true':
+        PARTIAL_RESPONSES.add(key)
+
+def drop_if_partial(cached_fn, *key):
+    """Evict a partial result from the cache so the next run fetches it again"""
+    if key not in PARTIAL_RESPONSES:
+        return False
+    PARTIAL_RESPONSES.discard(key)
+    cached_fn.clear(*key[1:])
+    return True
+
 @st.cache_data(ttl=300)
 def get_repositories():
-    """Fetch repositories with caching"""
+    """Fetch repositories with caching, as a DataFrame"""
     try:
-        response = requests.get(f"{API_BASE_URL}/repositories", timeout=10)
+        # Only the fields the cards use, column-encoded so repeated owners/languages are sent once
+        params = {"fields": ",".join(REPOSITORY_FIELDS), "format": "columnar"}
+        response = requests.get(f"{API_BASE_URL}/repositories", params=params,
+                                headers=deadline_headers(10), timeout=10)
         if response.status_code == 200:
-            return response.json()
-        return []
+            note_partial(response, 'repositories')
+            return decode_columnar(response.json())
+        return pd.DataFrame()
     except Exception as e:
         print(f"Error fetching repositories: {e}")
-        return []
+        return pd.DataFrame()
+
+@st.cache_resource
+def get_pipeline_sync():
+    """Pipelines and delta-sync cursor per repository, kept across reruns"""
+    return PipelineSync()
 
 @st.cache_data(ttl=30)
 def get_pipelines(repo_owner=None, repo_name=None):
-    """Fetch pipelines with caching"""
+    """Fetch pipelines with caching; only runs changed since the last fetch are downloaded"""
+    if not (repo_owner and repo_name):
+        return []
     try:
+        repo_key = f"{repo_owner}/{repo_name}"
+        sync = get_pipeline_sync()
         url = f"{API_BASE_URL}/pipelines"
-        if repo_owner and repo_name:
-            url += f"?owner={repo_owner}&name={repo_name}"
+        params = {"owner": repo_owner, "name": repo_name, "since": sync.cursor(repo_key)}
         
-        print(f"FRONTEND DEBUG: Making API call to: {url}")
-        response = requests.get(url, timeout=5)
+        print(f"FRONTEND DEBUG: Making API call to: {url} with {params}")
+        response = requests.get(url, params=params, headers=deadline_headers(5), timeout=5)
         print(f"FRONTEND DEBUG: API response status: {response.status_code}")
         
         if response.status_code == 200:
-            data = response.json()
-            print(f"FRONTEND DEBUG: API response data type: {type(data)}")
-            print(f"FRONTEND DEBUG: API response length: {len(data) if isinstance(data, list) else 'Not a list'}")
-            if isinstance(data, list) and len(data) > 0:
-                print(f"FRONTEND DEBUG: First pipeline sample: {data[0]}")
-            return data
+            note_partial(response, 'pipelines', repo_owner, repo_name)
+            delta = response.json()
+            print(f"FRONTEND DEBUG: {'Full list' if delta.get('full') else 'Delta'} with "
+                  f"{len(delta.get('changed', []))} changed, {len(delta.get('removed', []))} removed")
+            return sync.merge(repo_key, delta)
         else:
             print(f"FRONTEND DEBUG: API error response: {response.text}")
         return []
@@ -116,24 +163,105 @@ def get_pipelines(repo_owner=None, repo_name=None):
         traceback.print_exc()
         return []
 
-def get_pipeline_logs(pipeline_id):
-    """Fetch pipeline logs"""
+@st.cache_data(ttl=60)
+def get_analytics(repo_owner, repo_name):
+    """Fetch per-workflow analytics with caching"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/analytics", params={"owner": repo_owner, "name": repo_name},
+                                headers=deadline_headers(10), timeout=10)
+        if response.status_code == 200:
+            note_partial(response, 'analytics', repo_owner, repo_name)
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error fetching analytics: {e}")
+        return None
+
+@st.cache_data(ttl=120)
+def get_flaky_report(repo_owner, repo_name):
+    """Fetch flakiness scores per workflow and job with caching"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/flaky", params={"owner": repo_owner, "name": repo_name},
+                                headers=deadline_headers(10), timeout=10)
+        if response.status_code == 200:
+            note_partial(response, 'flaky', repo_owner, repo_name)
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error fetching flakiness report: {e}")
+        return None
+
+@st.cache_data(ttl=120)
+def get_timing_report(repo_owner, repo_name):
+    """Fetch slowest steps and queue/execution medians across recent runs"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/timing", params={"owner": repo_owner, "name": repo_name},
+                                headers=deadline_headers(15), timeout=15)
+        if response.status_code == 200:
+            note_partial(response, 'timing', repo_owner, repo_name)
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error fetching timing report: {e}")
+        return None
+
+@st.cache_data(ttl=300)
+def get_run_timing(pipeline_id, repo_owner, repo_name):
+    """Fetch the job/step timing breakdown and critical path of one run"""
+    try:
+        response = requests.get(f"{API_BASE_URL}/pipelines/{pipeline_id}/timing",
+                                params={"owner": repo_owner, "name": repo_name},
+                                headers=deadline_headers(10), timeout=10)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error fetching run timing: {e}")
+        return None
+
+def get_pipeline_logs(pipeline_id, repo_owner=None, repo_name=None):
+    """Fetch pipeline logs, or None when the backend could not fetch them"""
     try:
-        response = requests.get(f"{API_BASE_URL}/pipelines/{pipeline_id}/logs", timeout=5)
+        params = {"owner": repo_owner, "name": repo_name} if repo_owner and repo_name else None
+        response = requests.get(f"{API_BASE_URL}/pipelines/{pipeline_id}/logs", params=params,
+                                headers=deadline_headers(5), timeout=5)
         if response.status_code == 200:
+            note_partial(response, 'logs', pipeline_id, repo_owner, repo_name)
             return response.json()["logs"]
-        return []
+        print(f"Logs of {pipeline_id} unavailable: {response.status_code} {response.text[:200]}")
+        return None
     except Exception as e:
         print(f"Error fetching logs: {e}")
-        return []
+        return None
+
+@st.cache_data(ttl=300)
+def get_cached_pipeline_logs(pipeline_id, repo_owner=None, repo_name=None):
+    """Fetch logs for a finished run with caching (used for AI context)"""
+    return get_pipeline_logs(pipeline_id, repo_owner, repo_name)
+
+def get_logs_for_context(pipelines, repo_owner, repo_name):
+    """Logs of the failed runs worth quoting; runs whose logs could not be fetched are left out"""
+    logs_by_id = {}
+    for pipeline in runs_needing_logs(pipelines):
+        logs = get_cached_pipeline_logs(pipeline['id'], repo_owner, repo_name)
+        if logs is None:
+            # Don't keep the failure cached; the next question tries again
+            get_cached_pipeline_logs.clear(pipeline['id'], repo_owner, repo_name)
+        else:
+            # Logs cut short by the deadline are used once and fetched in full next time
+            drop_if_partial(get_cached_pipeline_logs, 'logs', pipeline['id'], repo_owner, repo_name)
+            logs_by_id[pipeline['id']] = logs
+    return logs_by_id
 
-def execute_action(pipeline_id, action, reason=""):
-    """Execute pipeline action"""
+def execute_action(pipeline_id, action, reason="", repo_owner=None, repo_name=None):
+    """Queue a pipeline action (rerun, rerun-failed-jobs, cancel)"""
     try:
-        headers = {"Authorization": API_TOKEN, "Content-Type": "application/json"}
-        data = {"pipeline_id": pipeline_id, "action": action, "reason": reason}
+        headers = {"Authorization": API_TOKEN, "Content-Type": "application/json",
+                   "Idempotency-Key": f"{pipeline_id}:{action}:{int(time.time() // 60)}"}
+        data = {"pipeline_id": pipeline_id, "action": action, "reason": reason,
+                "owner": repo_owner, "name": repo_name}
         
-        response = requests.post(f"{API_BASE_URL}/pipelines/action", json=data, headers=headers)
+        response = requests.post(f"{API_BASE_URL}/pipelines/action", json=data, headers=headers, timeout=5)
         if response.status_code == 200:
             return response.json()
         return None
@@ -141,7 +269,38 @@ def execute_action(pipeline_id, action, reason=""):
         print(f"Error executing action: {e}")
         return None
 
+def execute_bulk_action(repo_owner, repo_name, action, reason=""):
+    """Queue an action for every failed run of a repository"""
+    try:
+        headers = {"Authorization": API_TOKEN, "Content-Type": "application/json",
+                   "Idempotency-Key": f"bulk:{repo_owner}/{repo_name}:{action}:{int(time.time() // 60)}"}
+        data = {"owner": repo_owner, "name": repo_name, "action": action, "reason": reason}
+        
+        response = requests.post(f"{API_BASE_URL}/pipelines/actions/bulk", json=data, headers=headers, timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error executing bulk action: {e}")
+        return None
+
+def get_action_status(action_id, batch=False):
+    """Poll the status of a queued action or batch"""
+    try:
+        path = f"/actions/batch/{action_id}" if batch else f"/actions/{action_id}"
+        response = requests.get(f"{API_BASE_URL}{path}", timeout=5)
+        if response.status_code == 200:
+            return response.json()
+        return None
+    except Exception as e:
+        print(f"Error fetching action status: {e}")
+        return None
+
 @st.cache_resource
+def get_agent_warmup():
+    """Start building the Portia agent in the background, once per server process"""
+    return BackgroundInit(get_portia_agent, name="portia-warmup").start()
+
 def get_portia_agent():
     """Initialize optimized Portia agent with Google Gemini"""
     try:
@@ -153,7 +312,7 @@ def get_portia_agent():
             enable_tools=True,      # Enable Tavily and other tools
             enable_introspection=False,
             enable_remote_tools=False,  # Disable problematic GitHub MCP tools
-            max_iterations=5,       # Allow complex reasoning
+            max_iterations=3,       # Evidence is in the prompt, fewer tool rounds needed
             timeout=90,             # More time for tool usage
             api_key=os.getenv('PORTIA_API_KEY')
         )
@@ -162,40 +321,83 @@ def get_portia_agent():
         print(f"Failed to initialize Portia: {e}")
         return None
 
+# Next steps for each failure category reported by the backend log classifier
+FAILURE_ADVICE = {
+    "out_of_memory": "Raise the memory limit (e.g. `NODE_OPTIONS=--max-old-space-size`) or split the job",
+    "timeout": "Look for hanging steps, add caching, or raise `timeout-minutes`",
+    "auth_error": "Check that the secrets/token exist and have the required permissions",
+    "disk_space": "Clean up build artifacts or docker images before the failing step",
+    "npm_install": "Fix the dependency conflict (`npm ls`), update the lockfile, or try `--legacy-peer-deps`",
+    "pip_install": "Pin a version that exists for this Python version and refresh the requirements",
+    "network_error": "Usually transient - retry the run, and add retries to download steps",
+    "docker_build": "Check the base image tag, registry login and the Dockerfile step that failed",
+    "test_failure": "Reproduce the failing tests locally; retry only if they are known to be flaky",
+    "compile_error": "Fix the compile/import error shown in the evidence, then push again",
+    "lint_error": "Run the linter/formatter locally and commit the fixes",
+    "killed": "The runner killed the process, usually for memory; raise the limit or split the job",
+    "unknown": "Open the logs of the failed step for details",
+}
+
+def format_failure_details(pipeline):
+    """Markdown lines describing a classified failure"""
+    lines = [f"• **{pipeline.get('name', 'Unknown')}**: {pipeline.get('failure_label') or pipeline.get('error', 'Unknown error')}"]
+    if pipeline.get('known_flaky'):
+        lines[0] += f" ⚠️ known flaky workflow ({pipeline.get('flakiness', 0):.0%} of commits)"
+    for evidence in pipeline.get('evidence', [])[:2]:
+        lines.append(f"  `{evidence}`")
+    return chr(10).join(lines)
+
+def get_local_failure_answer(prompt, selected_repo, pipelines):
+    """Answer failure-cause questions from the classified logs, without an LLM call"""
+    prompt_lower = prompt.lower()
+    if not any(word in prompt_lower for word in ['why', 'cause', 'reason', 'root', 'fail', 'error', 'broke']):
+        return None
+    
+    failed_pipelines = [p for p in pipelines if p.get('status') == 'failed']
+    # Only answer locally when every failure has been classified with evidence
+    if not failed_pipelines or not all(p.get('failure_category', 'unknown') != 'unknown' for p in failed_pipelines):
+        return None
+    
+    by_category = {}
+    for pipeline in failed_pipelines:
+        by_category.setdefault(pipeline['failure_category'], []).append(pipeline)
+    
+    sections = []
+    for category, runs in sorted(by_category.items(), key=lambda item: -len(item[1])):
+        details = chr(10).join(format_failure_details(p) for p in runs[:3])
+        sections.append(f"""**{runs[0].get('failure_label', category)}** ({len(runs)} run(s))
+{details}
+💡 {FAILURE_ADVICE.get(category, FAILURE_ADVICE['unknown'])}""")
+    
+    return f"""🤖 **Portia AI** (Log Analysis)
+
+🔍 **Failure Analysis for {selected_repo.get('name', 'Repository')}**
+
+{(chr(10) + chr(10)).join(sections)}"""
+
 def get_portia_response(prompt, selected_repo, pipelines):
     """Get response using cached Portia agent with retry"""
-    portia = get_portia_agent()
+    # Failure questions the log classifier can already answer skip the agent
+    local_answer = get_local_failure_answer(prompt, selected_repo, pipelines)
+    if local_answer:
+        return local_answer
+    
+    # Until the background warm-up finishes, answer locally instead of waiting for it
+    portia = get_agent_warmup().get()
     if not portia:
         return get_portia_fallback_response(prompt, selected_repo, pipelines)
     
+    # Build the budgeted context once, with log excerpts for the failed runs
+    logs_by_id = get_logs_for_context(pipelines, selected_repo.get('owner'), selected_repo.get('name'))
+    extra_evidence = []
+    if is_speed_question(prompt):
+        extra_evidence.append(format_timing_summary(get_timing_report(selected_repo.get('owner'), selected_repo.get('name'))))
+        drop_if_partial(get_timing_report, 'timing', selected_repo.get('owner'), selected_repo.get('name'))
+    github_context = build_prompt_context(prompt, selected_repo, pipelines, logs_by_id, extra_evidence=extra_evidence)
+    
     # Retry mechanism with more attempts
     for attempt in range(5):  # More retries
         try:
-            # Rich GitHub context for Portia+Tavily
-            failed_pipelines = [p for p in pipelines if p.get('status') == 'failed']
-            success_count = len([p for p in pipelines if p.get('status') == 'success'])
-            running_count = len([p for p in pipelines if p.get('status') == 'running'])
-            
-            # Build detailed GitHub context
-            github_context = f"""
-GitHub Repository Analysis:
-- Repository: {selected_repo.get('full_name', 'Unknown')}
-- Language: {selected_repo.get('language', 'Unknown')}
-- Total Pipelines: {len(pipelines)}
-- ✅ Successful: {success_count}
-- ❌ Failed: {len(failed_pipelines)}
-- 🔄 Running: {running_count}
-
-Failed Pipeline Details:
-{chr(10).join([f"- {p.get('name', 'Unknown')}: {p.get('error', 'No error details')}" for p in failed_pipelines[:3]])}
-
-Recent Pipeline Activity:
-{chr(10).join([f"- {p.get('name', 'Unknown')}: {p.get('status', 'unknown')} ({p.get('last_run', 'unknown time')})" for p in pipelines[:5]])}
-
-User Question: {prompt}
-
-As a DevOps expert, analyze this GitHub repository data and provide helpful advice. Use Tavily search if you need additional context about DevOps best practices or troubleshooting."""
-            
             # Run query with cached agent
             result = portia.run(github_context)
             
@@ -240,6 +442,47 @@ def get_portia_fallback_response(prompt, selected_repo, pipelines):
 
 *Note: Using local Portia intelligence while API reconnects.*"""
     
+    elif any(word in prompt_lower for word in ['flaky', 'flake', 'intermittent', 'retry', 'retries']):
+        report = get_flaky_report(selected_repo.get('owner'), selected_repo.get('name'))
+        drop_if_partial(get_flaky_report, 'flaky', selected_repo.get('owner'), selected_repo.get('name'))
+        flaky_workflows = [w for w in (report or {}).get('workflows', []) if w.get('flaky_commits')]
+        if not flaky_workflows:
+            return f"{portia_prefix}✅ No flaky workflows detected in the stored run history - failures reproduce on the same commit."
+        
+        workflow_lines = [f"• **{w['workflow']}**: {w['flaky_commits']}/{w['commits']} commits flaky ({w['flakiness']:.0%}), {w['extra_attempts']} manual retries" for w in flaky_workflows[:5]]
+        job_lines = [f"• **{j['workflow']} / {j['job']}**: flipped in {j['flaky_runs']} run(s)" for j in report.get('jobs', [])[:5]]
+        return f"""{portia_prefix}🎲 **Flaky Workflow Report**
+
+{chr(10).join(workflow_lines)}
+
+{('**Flaky jobs:**' + chr(10) + chr(10).join(job_lines)) if job_lines else ''}
+
+**💡 Portia Recommendations:**
+• Don't spend time debugging known-flaky failures first - check whether the job flipped on the same commit
+• Quarantine or fix the flaky jobs above to stop wasting CI minutes on retries"""
+    
+    elif is_speed_question(prompt):
+        report = get_timing_report(selected_repo.get('owner'), selected_repo.get('name'))
+        drop_if_partial(get_timing_report, 'timing', selected_repo.get('owner'), selected_repo.get('name'))
+        if not report or not report.get('runs_analyzed'):
+            return f"{portia_prefix}⏱️ No completed runs with job timings yet - check back after the next pipeline run."
+        
+        step_lines = [f"• **{s['job']} / {s['step']}**: median {s['median_seconds']:.0f}s (max {s['max_seconds']:.0f}s)" for s in report.get('slowest_steps', [])[:5]]
+        critical_jobs = [j['job'] for j in report.get('jobs', []) if j.get('on_critical_path')]
+        queue_share = report.get('queue_share') or 0
+        return f"""{portia_prefix}⏱️ **Timing Analysis** (last {report['runs_analyzed']} runs)
+
+• Median wall time: {(report.get('median_wall_seconds') or 0) / 60:.1f} min
+• Waiting for runners: {queue_share:.0%} of job time
+• Critical path jobs: {', '.join(critical_jobs) or 'n/a'}
+
+**Slowest steps:**
+{chr(10).join(step_lines)}
+
+**💡 Portia Recommendations:**
+• Speed up the slowest steps on the critical path first - other jobs run in parallel
+• {'Runners are a bottleneck: add runners or reduce concurrent jobs' if queue_share > 0.2 else 'Cache dependencies and build outputs between runs'}"""
+    
     elif any(word in prompt_lower for word in ['failed', 'error']):
         if failed_count == 0:
             return f"{portia_prefix}🎉 Excellent! No failed pipelines detected. Your DevOps pipeline is running smoothly!"
@@ -249,9 +492,10 @@ def get_portia_fallback_response(prompt, selected_repo, pipelines):
 
 **{failed_count} pipeline(s) need attention:**
 
-{chr(10).join([f"• **{p.get('name', 'Unknown')}**: {p.get('error', 'Unknown error')}" for p in failed_pipelines])}
+{chr(10).join([format_failure_details(p) for p in failed_pipelines])}
 
 **💡 Portia Recommendations:**
+{chr(10).join(sorted({f"• {FAILURE_ADVICE[p['failure_category']]}" for p in failed_pipelines if p.get('failure_category') in FAILURE_ADVICE}))}
 • Check logs for detailed error information
 • Use retry buttons for transient failures
 • Consider rollback if issues persist"""
@@ -263,12 +507,14 @@ def get_portia_fallback_response(prompt, selected_repo, pipelines):
 • {len(pipelines)} total pipelines
 • {success_count} successful, {failed_count} failed
 
-**💬 Try asking:** "What's the status?" or "Show failed pipelines"
+**💬 Try asking:** "What's the status?", "Show failed pipelines" or "Which workflows are flaky?"
 
 *Attempting to reconnect to Portia API...*"""
 
 def main():
     print("Starting DevOps AI Assistant frontend")
+    # Only starts a thread; the heavy portia import happens off the render path
+    warmup = get_agent_warmup()
     
     # Header
     st.markdown("""
@@ -284,13 +530,26 @@ def main():
         show_pipelines()
     else:
         show_repositories()
+    
+    show_agent_status(warmup)
+
+def show_agent_status(warmup):
+    """Portia agent readiness in the sidebar"""
+    st.sidebar.subheader("🤖 AI Agent")
+    if warmup.state == "ready":
+        st.sidebar.success(f"Portia agent ready ({warmup.elapsed:.1f}s to start)")
+    elif warmup.state == "failed":
+        st.sidebar.warning("Portia agent unavailable - answering in local mode")
+    else:
+        st.sidebar.info(f"Portia agent warming up ({warmup.elapsed:.0f}s)... questions are answered locally until it is ready")
 
 def show_repositories():
     
     # Fetch repositories
     repositories = get_repositories()
+    drop_if_partial(get_repositories, 'repositories')
     
-    if repositories:
+    if not repositories.empty:
         st.subheader("📋 Select Repository to Monitor")
         
         # Search bar
@@ -298,7 +557,7 @@ def show_repositories():
         
         # Filter repositories based on search
         if search_term:
-            filtered_repos = [repo for repo in repositories if search_term.lower() in repo['name'].lower()]
+            filtered_repos = repositories[repositories['name'].astype(str).str.contains(search_term, case=False, regex=False)]
         else:
             filtered_repos = repositories
         
@@ -346,7 +605,8 @@ def show_repositories():
         # Calculate start and end indices
         start_idx = (page - 1) * repos_per_page
         end_idx = start_idx + repos_per_page
-        page_repos = filtered_repos[start_idx:end_idx]
+        # Only the cards on this page become dicts
+        page_repos = frame_records(filtered_repos.iloc[start_idx:end_idx])
         
         # Reset to page 1 if search changes the results
         if len(filtered_repos) > 0 and start_idx >= len(filtered_repos):
@@ -374,9 +634,14 @@ def show_repositories():
                         if len(description) > 60:
                             description = description[:60] + '...'
                         
+                        # Latest run status is only present when the backend lists repos over GraphQL
+                        latest_run = repo.get('latest_run') or {}
+                        run_state = latest_run.get('conclusion') or latest_run.get('status')
+                        status_badge = f" {RUN_STATE_ICONS.get(run_state, '⚪')}" if latest_run else ""
+                        
                         card_html = f"""
                         <div class="repo-card">
-                            <h4 style="margin: 0 0 0.5rem 0; color: #333;">📋 {repo['name']}</h4>
+                            <h4 style="margin: 0 0 0.5rem 0; color: #333;">📋 {repo['name']}{status_badge}</h4>
                             <p style="margin: 0 0 0.5rem 0; color: #666; font-size: 0.9rem; min-height: 2.5rem;">{description}</p>
                             <div style="display: flex; justify-content: space-between; align-items: center; margin-top: 1rem;">
                                 <span class="language-tag">{repo.get('language', 'Unknown')}</span>
@@ -421,6 +686,7 @@ def show_pipelines():
     with st.spinner(f'🔄 Loading pipelines for {selected_repo.get("full_name", selected_repo["name"])}...'):
         print(f"FRONTEND DEBUG: Fetching pipelines for owner={selected_repo.get('owner')}, name={selected_repo.get('name')}")
         pipelines = get_pipelines(selected_repo.get('owner'), selected_repo.get('name'))
+        partial = drop_if_partial(get_pipelines, 'pipelines', selected_repo.get('owner'), selected_repo.get('name'))
         print(f"FRONTEND DEBUG: Received {len(pipelines)} pipelines from API")
     
     if not pipelines:
@@ -428,6 +694,9 @@ def show_pipelines():
         st.info(f"Debug: API call was made to /pipelines?owner={selected_repo.get('owner')}&name={selected_repo.get('name')}")
         return
     
+    if partial:
+        st.caption("⏳ The backend ran out of time for some details (such as failure causes); they load on the next refresh")
+    
     # Sidebar controls
     st.sidebar.markdown("""
     <div style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
@@ -439,9 +708,25 @@ def show_pipelines():
     # Auto-refresh
     st.sidebar.subheader("🔄 Refresh")
     if st.sidebar.button("🔄 Refresh Now"):
-        st.cache_data.clear()
+        # Only the selected repository's entries; the repository list stays cached
+        for cached_fn in (get_pipelines, get_analytics, get_flaky_report, get_timing_report):
+            cached_fn.clear(selected_repo.get('owner'), selected_repo.get('name'))
         st.rerun()
     
+    # Bulk actions
+    st.sidebar.subheader("⚡ Actions")
+    if st.sidebar.button("🔁 Retry all failed runs"):
+        batch = execute_bulk_action(selected_repo.get('owner'), selected_repo.get('name'), "rerun-failed-jobs")
+        if batch:
+            st.session_state.last_batch_id = batch['batch_id']
+        else:
+            st.sidebar.error("Could not queue the retries")
+    if st.session_state.get('last_batch_id'):
+        batch = get_action_status(st.session_state.last_batch_id, batch=True)
+        if batch:
+            counts = ", ".join(f"{count} {status}" for status, count in batch.get('counts', {}).items()) or "no failed runs"
+            st.sidebar.caption(f"Last bulk retry: {counts}{'' if batch.get('done') else ' (in progress)'}")
+    
     # Pipeline filters
     st.sidebar.subheader("🔍 Filters")
     status_filter = st.sidebar.multiselect(
@@ -502,46 +787,22 @@ def show_pipelines():
         """, unsafe_allow_html=True)
     
 
+    show_analytics(selected_repo)
+    
     # Pipeline Details
     st.markdown("### 🔍 Pipeline Details")
+    view = st.sidebar.radio("🧾 Pipeline view", ["Table", "Expanders"], horizontal=True,
+                            help="The table stays fast with hundreds of runs; expanders show every run's details")
     
-    for pipeline in pipelines:
-        if not isinstance(pipeline, dict):
-            continue
-        status_emoji = {"success": "✅", "failed": "❌", "running": "🔄"}
-        emoji = status_emoji.get(pipeline.get("status"), "❓")
-        
-        with st.expander(f"{emoji} {pipeline['name']}", expanded=False):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write(f"**ID:** {pipeline['id']}")
-                st.write(f"**Stage:** {pipeline['stage']}")
-                st.write(f"**Branch:** {pipeline['branch']}")
-                st.write(f"**Commit:** {pipeline['commit']}")
-                
-            with col2:
-                st.write(f"**Last Run:** {pipeline['last_run']}")
-                if pipeline.get('duration'):
-                    st.write(f"**Duration:** {pipeline['duration']}")
-                if pipeline.get('progress'):
-                    st.progress(pipeline['progress'] / 100)
-                    st.write(f"**Progress:** {pipeline['progress']}%")
-            
-            # Show error if failed
-            if pipeline["status"] == "failed" and pipeline.get("error"):
-                st.error(f"**Error:** {pipeline['error']}")
-            
-
-            # Logs section
-            if st.button(f"📋 View Logs", key=f"logs_{pipeline['id']}"):
-                with st.spinner('Loading logs...'):
-                    logs = get_pipeline_logs(pipeline['id'])
-                    if logs:
-                        st.markdown("**Pipeline Logs:**")
-                        st.code('\n'.join(logs), language='log')
-                    else:
-                        st.warning("⚠️ No logs available")
+    if view == "Table":
+        show_pipeline_table(pipelines, selected_repo)
+    else:
+        for pipeline in pipelines:
+            if not isinstance(pipeline, dict):
+                continue
+            emoji = STATUS_ICONS.get(pipeline.get("status"), "❓")
+            with st.expander(f"{emoji} {pipeline['name']}", expanded=False):
+                show_pipeline_detail(pipeline, selected_repo)
     
     # Simple AI Assistant
     st.markdown("### 🤖 AI Assistant")
@@ -571,5 +832,134 @@ def show_pipelines():
         # Rerun to display the new messages
         st.rerun()
 
+def show_pipeline_table(pipelines, selected_repo):
+    """All runs in one selectable table, with the selected run's details below it"""
+    pipelines = [p for p in pipelines if isinstance(p, dict)]
+    event = st.dataframe(
+        pipelines_frame(pipelines),
+        on_select="rerun",
+        selection_mode="single-row",
+        hide_index=True,
+        width="stretch",
+        key=f"pipeline_table_{selected_repo.get('full_name')}",
+        column_config={"Last run": st.column_config.DatetimeColumn(format="YYYY-MM-DD HH:mm")},
+    )
+    
+    rows = event.selection.rows
+    if not rows or rows[0] >= len(pipelines):
+        st.caption("👆 Select a run to see its details, logs and actions")
+        return
+    
+    pipeline = pipelines[rows[0]]
+    st.markdown(f"#### {STATUS_ICONS.get(pipeline.get('status'), '❓')} {pipeline['name']}")
+    show_pipeline_detail(pipeline, selected_repo)
+
+def show_pipeline_detail(pipeline, selected_repo):
+    """Details, actions, timing and logs of one run"""
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.write(f"**ID:** {pipeline['id']}")
+        st.write(f"**Stage:** {pipeline['stage']}")
+        st.write(f"**Branch:** {pipeline['branch']}")
+        st.write(f"**Commit:** {pipeline['commit']}")
+        
+    with col2:
+        st.write(f"**Last Run:** {pipeline['last_run']}")
+        if pipeline.get('duration'):
+            st.write(f"**Duration:** {pipeline['duration']}")
+        if pipeline.get('progress'):
+            st.progress(pipeline['progress'] / 100)
+            st.write(f"**Progress:** {pipeline['progress']}%")
+    
+    # Show error if failed
+    if pipeline["status"] == "failed" and pipeline.get("error"):
+        st.error(f"**Error:** {pipeline['error']}")
+    if pipeline.get("known_flaky"):
+        st.info(f"🎲 Known flaky workflow: {pipeline.get('flakiness', 0):.0%} of commits both failed and passed")
+    if pipeline.get("failure_label"):
+        st.warning(f"**Likely cause:** {pipeline['failure_label']}")
+        if pipeline.get("evidence"):
+            st.code('\n'.join(pipeline['evidence']), language='log')
+    
+
+    # Actions
+    if pipeline["status"] in ("failed", "running"):
+        action = "rerun-failed-jobs" if pipeline["status"] == "failed" else "cancel"
+        label = "🔁 Retry Failed Jobs" if pipeline["status"] == "failed" else "⏹️ Cancel Run"
+        if st.button(label, key=f"action_{pipeline['id']}"):
+            result = execute_action(pipeline['id'], action, repo_owner=selected_repo.get('owner'),
+                                    repo_name=selected_repo.get('name'))
+            if result:
+                st.success(f"Queued {action} (action {result['action_id']}, status: {result['status']})")
+            else:
+                st.error("Could not queue the action")
+    
+    # Timing breakdown
+    if pipeline["stage"] == "completed" and st.button("⏱️ Timing", key=f"timing_{pipeline['id']}"):
+        timing = get_run_timing(pipeline['id'], selected_repo.get('owner'), selected_repo.get('name'))
+        if timing and timing.get('jobs'):
+            st.write(f"**Critical path:** {' → '.join(timing['critical_path'])}"
+                     f" ({(timing.get('critical_path_seconds') or 0) / 60:.1f} min)")
+            st.dataframe(
+                pd.DataFrame([{"job": j['name'], "queue_s": j['queue_seconds'], "execution_s": j['execution_seconds'],
+                               "conclusion": j['conclusion']} for j in timing['jobs']]),
+                hide_index=True, width="stretch")
+            if timing.get('slowest_steps'):
+                st.write("**Slowest steps:** " + ", ".join(
+                    f"{s['step']} ({s['duration_seconds']:.0f}s)" for s in timing['slowest_steps'][:3]))
+        else:
+            st.warning("⚠️ No timing data available")
+    
+    # Logs section
+    if st.button(f"📋 View Logs", key=f"logs_{pipeline['id']}"):
+        with st.spinner('Loading logs...'):
+            logs = get_pipeline_logs(pipeline['id'], selected_repo.get('owner'), selected_repo.get('name'))
+            partial = drop_if_partial(get_cached_pipeline_logs, 'logs', pipeline['id'],
+                                      selected_repo.get('owner'), selected_repo.get('name'))
+            if logs is None:
+                st.warning("⚠️ Logs could not be fetched from GitHub; try again in a moment")
+            elif logs:
+                st.markdown("**Pipeline Logs:**")
+                if partial:
+                    st.caption("⏳ The backend ran out of time; these logs are incomplete")
+                st.code('\n'.join(logs), language='log')
+            else:
+                st.warning("⚠️ No logs available")
+
+def show_analytics(selected_repo):
+    """Success rate, MTTR and duration trends per workflow"""
+    with st.expander("📈 Pipeline Analytics", expanded=False):
+        analytics = get_analytics(selected_repo.get('owner'), selected_repo.get('name'))
+        drop_if_partial(get_analytics, 'analytics', selected_repo.get('owner'), selected_repo.get('name'))
+        if not analytics or not analytics.get('workflows'):
+            st.info("Not enough completed runs for analytics yet")
+            return
+        
+        stats = pd.DataFrame(analytics['workflows'])
+        stats['success_rate'] = (stats['success_rate'] * 100).round(1)
+        for column, seconds_column in [('mttr_minutes', 'mttr_seconds'),
+                                       ('p50_minutes', 'p50_duration_seconds'),
+                                       ('p95_minutes', 'p95_duration_seconds')]:
+            stats[column] = (pd.to_numeric(stats[seconds_column], errors='coerce') / 60).round(1)
+        st.caption(f"Based on {analytics.get('total_runs', 0)} stored runs")
+        st.dataframe(
+            stats[['workflow', 'branch', 'runs', 'success_rate', 'mttr_minutes', 'p50_minutes', 'p95_minutes']],
+            hide_index=True,
+            width="stretch",
+            column_config={"success_rate": st.column_config.NumberColumn("success %")},
+        )
+        
+        trend = pd.DataFrame(analytics.get('trend', []))
+        if not trend.empty:
+            trend['date'] = pd.to_datetime(trend['date'])
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**Success rate per day (%)**")
+                st.line_chart(trend.pivot_table(index='date', columns='workflow', values='success_rate') * 100)
+            with col2:
+                st.markdown("**Median duration per day (minutes)**")
+                st.line_chart(trend.pivot_table(index='date', columns='workflow', values='p50_duration_seconds') / 60)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,48 @@
+"""
+Decoders for the backend's format=columnar list payloads
+Columns go straight into a pandas DataFrame without building one dict per row
+"""
+
+import pandas as pd
+
+# Fields the repository cards and the selected repository need
+REPOSITORY_FIELDS = ['id', 'name', 'full_name', 'description', 'language', 'updated_at', 'owner', 'latest_run']
+
+
+def decode_column(column):
+    """Plain list, or the values of a dictionary-encoded column"""
+    if isinstance(column, dict) and 'dictionary' in column:
+        return pd.Categorical.from_codes(column['codes'], categories=column['dictionary'])
+    return column
+
+
+def decode_columnar(payload):
+    """DataFrame from a columnar payload (a plain list of records also works)"""
+    if isinstance(payload, list):
+        return pd.DataFrame(payload)
+    columns = {name: decode_column(column) for name, column in payload.get('columns', {}).items()}
+    return pd.DataFrame(columns, index=pd.RangeIndex(payload.get('count', 0)))
+
+
+def frame_records(frame):
+    """List of dicts for a (small) slice of a decoded frame, with missing values as None"""
+    return [{name: None if pd.api.types.is_scalar(value) and pd.isna(value) else value
+             for name, value in row.items()}
+            for row in frame.to_dict('records')]
+
+
+def column_values(column):
+    """Plain Python list of a column's values"""
+    if isinstance(column, dict) and 'dictionary' in column:
+        dictionary = column['dictionary']
+        return [dictionary[code] if code >= 0 else None for code in column['codes']]
+    return column
+
+
+def decode_records(payload):
+    """List of dicts from a columnar payload, for code that works on records"""
+    if isinstance(payload, list):
+        return payload
+    columns = {name: column_values(column) for name, column in payload.get('columns', {}).items()}
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
@@ -0,0 +1,43 @@
+"""
+Client side of the /pipelines?since=<cursor> delta sync
+Each repository's pipelines are kept locally with the backend's cursor; a refresh only
+downloads what was added, changed or removed since
+"""
+
+import threading
+
+# First request for a repository: the backend answers with the full list
+INITIAL_CURSOR = "0"
+
+
+def apply_delta(pipelines, delta):
+    """Pipelines after merging a delta response into the previous list, newest first"""
+    if delta.get('full'):
+        return list(delta.get('changed', []))
+
+    by_id = {p['id']: p for p in pipelines}
+    for pipeline_id in delta.get('removed', []):
+        by_id.pop(pipeline_id, None)
+    for pipeline in delta.get('changed', []):
+        by_id[pipeline['id']] = pipeline
+    return sorted(by_id.values(), key=lambda p: p.get('last_run') or '', reverse=True)
+
+
+class PipelineSync:
+    """Local pipelines and cursor per repository, shared by the app's sessions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._repos = {}
+
+    def cursor(self, repo_key):
+        with self._lock:
+            return self._repos.get(repo_key, (INITIAL_CURSOR, []))[0]
+
+    def merge(self, repo_key, delta):
+        """Apply a delta response and return the repository's merged pipelines"""
+        with self._lock:
+            _, pipelines = self._repos.get(repo_key, (INITIAL_CURSOR, []))
+            pipelines = apply_delta(pipelines, delta)
+            self._repos[repo_key] = (delta.get('cursor', INITIAL_CURSOR), pipelines)
+        return pipelines
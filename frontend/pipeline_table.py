@@ -0,0 +1,32 @@
+"""
+Table view of a repository's pipelines
+One DataFrame row per run, so long run lists render as a single virtualized st.dataframe
+"""
+
+import pandas as pd
+
+STATUS_ICONS = {"success": "✅", "failed": "❌", "running": "🔄"}
+
+# (column, source field) in display order
+TABLE_COLUMNS = [
+    ("Status", "status"),
+    ("Workflow", "name"),
+    ("Branch", "branch"),
+    ("Commit", "commit"),
+    ("Last run", "last_run"),
+    ("Duration", "duration"),
+    ("Likely cause", "failure_label"),
+    ("ID", "id"),
+]
+
+
+def pipelines_frame(pipelines):
+    """DataFrame with one display row per pipeline, in the order given"""
+    pipelines = [p for p in pipelines if isinstance(p, dict)]
+    frame = pd.DataFrame(pipelines, columns=[field for _, field in TABLE_COLUMNS])
+    frame['status'] = [f"{STATUS_ICONS.get(p.get('status'), '❓')} {p.get('status')}"
+                       f"{' 🎲' if p.get('known_flaky') else ''}" for p in pipelines]
+    frame['commit'] = frame['commit'].fillna('').astype(str).str[:7]
+    frame['last_run'] = pd.to_datetime(frame['last_run'], errors='coerce', utc=True)
+    frame['failure_label'] = frame['failure_label'].fillna('')
+    return frame.rename(columns={field: column for column, field in TABLE_COLUMNS})
@@ -0,0 +1,180 @@
+"""
+Prompt context builder for the Portia agent
+Ranks pipeline evidence and packs it into a fixed token budget
+"""
+
+import re
+
+# Rough size of a token for Gemini-style tokenizers (characters per token)
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 1200
+MAX_LOG_LINES_PER_RUN = 6
+MAX_LOG_RUNS = 3
+
+ERROR_KEYWORDS = {
+    'error': 5, 'failed': 5, 'failure': 5, 'fatal': 5, 'exception': 4,
+    'traceback': 4, 'timed out': 4, 'timeout': 3, 'cancelled': 3,
+    'denied': 3, 'not found': 3, 'exit code': 3, 'warning': 1,
+}
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'is', 'are', 'my', 'why', 'what', 'how', 'did', 'does',
+    'do', 'to', 'of', 'in', 'on', 'for', 'and', 'or', 'it', 'this', 'that',
+    'pipeline', 'pipelines', 'show', 'me', 'can', 'you', 'please',
+}
+
+
+def estimate_tokens(text):
+    """Estimate the token count of a piece of text"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def prompt_terms(prompt):
+    """Extract the meaningful words of a user question"""
+    words = re.findall(r"[a-z0-9_.\-]+", prompt.lower())
+    return {w for w in words if len(w) > 2 and w not in STOP_WORDS}
+
+
+def score_log_line(line, terms=()):
+    """Score how likely a log line explains a failure"""
+    lowered = line.lower()
+    score = sum(weight for keyword, weight in ERROR_KEYWORDS.items() if keyword in lowered)
+    score += sum(2 for term in terms if term in lowered)
+    return score
+
+
+def extract_error_lines(logs, terms=(), limit=MAX_LOG_LINES_PER_RUN):
+    """Pick the most relevant error lines from a run's logs, in log order"""
+    scored = []
+    for index, line in enumerate(logs or []):
+        line = line.strip()
+        if not line:
+            continue
+        score = score_log_line(line, terms)
+        if score > 0:
+            scored.append((score, index, line))
+
+    best = sorted(scored, key=lambda item: (-item[0], item[1]))[:limit]
+    seen = set()
+    lines = []
+    for _, _, line in sorted(best, key=lambda item: item[1]):
+        if line not in seen:
+            seen.add(line)
+            lines.append(line)
+    return lines
+
+
+def rank_pipelines(pipelines, terms=()):
+    """Order pipelines by how useful they are as evidence for the question"""
+    status_weight = {'failed': 3, 'running': 2, 'success': 1}
+
+    def rank(item):
+        position, pipeline = item
+        text = f"{pipeline.get('name', '')} {pipeline.get('branch', '')} {pipeline.get('error', '')}".lower()
+        matches = sum(1 for term in terms if term in text)
+        # Later positions are older runs; keep recency as the tie breaker
+        return (-matches, -status_weight.get(pipeline.get('status'), 0), position)
+
+    return [p for _, p in sorted(enumerate(pipelines), key=rank)]
+
+
+def format_pipeline_line(pipeline):
+    """One-line summary of a pipeline run"""
+    line = f"- {pipeline.get('name', 'Unknown')} [{pipeline.get('status', 'unknown')}]"
+    line += f" branch={pipeline.get('branch', '?')} commit={pipeline.get('commit', '?')}"
+    if pipeline.get('duration'):
+        line += f" duration={pipeline['duration']}"
+    line += f" at {pipeline.get('last_run', 'unknown time')}"
+    if pipeline.get('status') == 'failed' and pipeline.get('error'):
+        line += f"\n  error: {pipeline['error']}"
+    if pipeline.get('failure_label'):
+        line += f"\n  classified cause: {pipeline['failure_label']}"
+    return line
+
+
+SPEED_WORDS = ['slow', 'speed', 'faster', 'duration', 'bottleneck', 'takes long', 'timing', 'critical path', 'queue']
+
+
+def is_speed_question(prompt):
+    """True when the question is about pipeline duration or speed-ups"""
+    prompt_lower = prompt.lower()
+    return any(word in prompt_lower for word in SPEED_WORDS)
+
+
+def format_timing_summary(report, limit=5):
+    """Compact text summary of a timing report from the backend"""
+    if not report or not report.get('runs_analyzed'):
+        return ""
+    lines = [f"Timing over the last {report['runs_analyzed']} completed runs:"]
+    if report.get('median_wall_seconds') is not None:
+        lines.append(f"- median wall time {report['median_wall_seconds'] / 60:.1f} min")
+    if report.get('queue_share') is not None:
+        lines.append(f"- {report['queue_share']:.0%} of job time is spent waiting for a runner")
+    for step in report.get('slowest_steps', [])[:limit]:
+        lines.append(f"- slow step: {step['job']} / {step['step']} median {step['median_seconds']:.0f}s")
+    for job in report.get('jobs', []):
+        if job.get('on_critical_path'):
+            lines.append(f"- critical path job: {job['job']} (on the path in {job['on_critical_path']} runs)")
+    return "\n".join(lines)
+
+
+def build_prompt_context(prompt, selected_repo, pipelines, logs_by_id=None,
+                         token_budget=DEFAULT_TOKEN_BUDGET, extra_evidence=None):
+    """Build the agent prompt, keeping the evidence within a token budget"""
+    logs_by_id = logs_by_id or {}
+    terms = prompt_terms(prompt)
+
+    success_count = len([p for p in pipelines if p.get('status') == 'success'])
+    failed_count = len([p for p in pipelines if p.get('status') == 'failed'])
+    running_count = len([p for p in pipelines if p.get('status') == 'running'])
+
+    header = f"""GitHub Repository Analysis:
+- Repository: {selected_repo.get('full_name', 'Unknown')}
+- Language: {selected_repo.get('language', 'Unknown')}
+- Pipelines: {len(pipelines)} total, {success_count} successful, {failed_count} failed, {running_count} running
+"""
+    footer = f"""
+User Question: {prompt}
+
+As a DevOps expert, answer using the evidence above. Only search the web with Tavily if the evidence is not enough."""
+
+    remaining = token_budget - estimate_tokens(header) - estimate_tokens(footer)
+    sections = []
+
+    # Question-specific evidence (e.g. a timing summary) goes first when it fits
+    for block in extra_evidence or []:
+        cost = estimate_tokens(block) + 1
+        if block and cost <= remaining:
+            sections.append(block)
+            remaining -= cost
+
+    # Failed runs with their log excerpts are the strongest evidence
+    for pipeline in rank_pipelines(pipelines, terms):
+        block = format_pipeline_line(pipeline)
+        # Classifier evidence from the backend comes first, then lines mined from the logs
+        excerpt = list(pipeline.get('evidence', []))[:MAX_LOG_LINES_PER_RUN]
+        for line in extract_error_lines(logs_by_id.get(pipeline.get('id')), terms):
+            if len(excerpt) < MAX_LOG_LINES_PER_RUN and line not in excerpt:
+                excerpt.append(line)
+        if excerpt:
+            block += "\n  log excerpt:\n" + "\n".join(f"    {line}" for line in excerpt)
+
+        cost = estimate_tokens(block) + 1
+        if cost > remaining:
+            if excerpt:
+                # Fall back to the bare summary line when the excerpt does not fit
+                block = format_pipeline_line(pipeline)
+                cost = estimate_tokens(block) + 1
+            if cost > remaining:
+                continue
+        sections.append(block)
+        remaining -= cost
+
+    evidence = "\nEvidence (most relevant first):\n" + "\n".join(sections) if sections else ""
+    return header + evidence + footer
+
+
+def runs_needing_logs(pipelines, limit=MAX_LOG_RUNS):
+    """Failed runs worth fetching logs for, most recent first"""
+    return [p for p in pipelines if p.get('status') == 'failed' and p.get('id')][:limit]
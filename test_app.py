@@ -9,8 +9,14 @@ import json
 import time
 import sys
 import os
+from contextlib import contextmanager
 from datetime import datetime
 
+# Make backend and frontend helper modules importable for unit tests
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT_DIR, "backend"))
+sys.path.insert(0, os.path.join(ROOT_DIR, "frontend"))
+
 # Configuration
 API_BASE_URL = "http://localhost:8000"
 API_TOKEN = "Bearer demo-secure-token-123"
@@ -52,6 +58,169 @@ class TestRunner:
         
         return self.failed == 0
 
+# Fixtures shared by the backend unit tests
+
+class FakeGitHubResponse:
+    """Minimal requests.Response stand-in for backend unit tests"""
+    
+    def __init__(self, data=None, lines=None, status_code=200):
+        self.status_code = status_code
+        self._data = data
+        self._lines = lines or []
+        self.text = json.dumps(data)
+        self.headers = {}
+    
+    def json(self):
+        return self._data
+    
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def fake_workflow_run(run_id, conclusion, repo="acme/api", minute=None, **fields):
+    """GitHub workflow run created at 10:<minute> (run_id % 60 by default) that took 30 seconds"""
+    minute = run_id % 60 if minute is None else minute
+    run = {"id": run_id, "name": "CI", "workflow_id": 1, "head_branch": "main", "head_sha": f"{run_id:040x}",
+           "status": "completed", "conclusion": conclusion, "created_at": f"2024-01-15T10:{minute:02d}:00Z",
+           "run_started_at": f"2024-01-15T10:{minute:02d}:00Z", "updated_at": f"2024-01-15T10:{minute:02d}:30Z",
+           "run_attempt": 1, "display_title": "commit", "event": "push", "actor": {"login": "bob"},
+           "html_url": f"https://github.com/{repo}/actions/runs/{run_id}"}
+    run.update(fields)
+    return run
+
+def fake_run_record(run_id, conclusion, repo="acme/api", **fields):
+    """fake_workflow_run as the backend stores it"""
+    from run_history import normalize_run
+    return normalize_run(fake_workflow_run(run_id, conclusion, repo, **fields))
+
+def fake_job(name, conclusion="success", times=None, **fields):
+    """Workflow job; times is (created, started, completed) as "MM:SS" past 10:00, with one step"""
+    job = {"name": name, "conclusion": conclusion, "steps": []}
+    if times:
+        created, started, completed = (f"2024-01-15T10:{t}Z" for t in times)
+        job.update(created_at=created, started_at=started, completed_at=completed,
+                   steps=[{"name": "run", "started_at": started, "completed_at": completed}])
+    job.update(fields)
+    return job
+
+def fake_pipeline(i, status="success"):
+    """Pipeline as /pipelines lists it"""
+    return {"id": str(i), "name": "CI", "status": status, "last_run": f"2024-01-15T10:{i:02d}:00Z"}
+
+@contextmanager
+def patched(target, **values):
+    """Set attributes of target (a module or object) for the duration of the block"""
+    saved = {name: getattr(target, name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield target
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+@contextmanager
+def isolated_backend(**overrides):
+    """simple_backend with empty run state, caches and action queue and a test token, plus overrides;
+    on exit waits for the background threads the block started so none outlive the test"""
+    import threading
+    import simple_backend
+    from action_queue import ActionQueue
+    from analytics import AnalyticsCache
+    from delta_feed import PipelineFeed
+    from flaky import FlakyDetector
+    from lru_cache import LRUCache
+    from run_history import RunHistory
+    from run_index import RunIndex
+    from single_flight import SingleFlight
+    from token_pool import TokenPool
+    
+    before = set(threading.enumerate())
+    queue = ActionQueue(simple_backend.perform_run_action, max_workers=simple_backend.ACTION_WORKERS,
+                        on_success=simple_backend.on_action_succeeded)
+    state = dict(RUN_HISTORY=RunHistory(), ANALYTICS_CACHE=AnalyticsCache(), FLAKY_DETECTOR=FlakyDetector(),
+                 RUN_INDEX=RunIndex(), PIPELINE_FEED=PipelineFeed(), UPSTREAM_CALLS=SingleFlight(),
+                 ACTION_QUEUE=queue, TOKEN_POOL=TokenPool.from_env(None, "test-token"),
+                 _jobs_cache=LRUCache(simple_backend.MAX_CACHED_JOB_LISTINGS),
+                 _failure_cache=LRUCache(simple_backend.MAX_CACHED_FAILURE_VERDICTS),
+                 _repository_cache={"data": None, "fetched_at": 0}, _restored_repos=set())
+    state.update(overrides)
+    try:
+        with patched(simple_backend, **state):
+            yield simple_backend
+    finally:
+        queue.close()
+        for thread in set(threading.enumerate()) - before:
+            thread.join(5)
+
+@contextmanager
+def backend_server():
+    """simple_backend.APIHandler on a free local port; yields its base URL"""
+    import threading
+    from http.server import ThreadingHTTPServer
+    import simple_backend
+    
+    server = ThreadingHTTPServer(("localhost", 0), simple_backend.APIHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://localhost:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class SimulatedWorkers:
+    """Worker processes of one backend, simulated in this process by swapping simple_backend's
+    per-process state; every worker has its own connection to the same shared SQLite file"""
+    
+    PER_WORKER = ("RUN_HISTORY", "ANALYTICS_CACHE", "FLAKY_DETECTOR", "RUN_INDEX", "SHARED_CACHE",
+                  "SHARED_RUNS", "_shared_runs_seq")
+    
+    def __init__(self, path):
+        import simple_backend
+        self.backend = simple_backend
+        self.path = path
+        self.workers = {}
+        self.active = None
+        self.saved = {name: getattr(simple_backend, name) for name in self.PER_WORKER}
+    
+    def switch_to(self, name):
+        """Make name the worker serving the next calls, as a request landing on it would"""
+        from shared_cache import SharedCache
+        from run_store import SharedRunStore
+        from run_history import RunHistory
+        from analytics import AnalyticsCache
+        from flaky import FlakyDetector
+        from run_index import RunIndex
+        
+        if self.active is not None:
+            self.workers[self.active]["_shared_runs_seq"] = self.backend._shared_runs_seq
+        if name not in self.workers:
+            cache = SharedCache(self.path)
+            self.workers[name] = {"RUN_HISTORY": RunHistory(), "ANALYTICS_CACHE": AnalyticsCache(),
+                                  "FLAKY_DETECTOR": FlakyDetector(), "RUN_INDEX": RunIndex(),
+                                  "SHARED_CACHE": cache, "SHARED_RUNS": SharedRunStore(cache), "_shared_runs_seq": 0}
+        for attr, value in self.workers[name].items():
+            setattr(self.backend, attr, value)
+        self.active = name
+        self.backend.sync_shared_runs()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        for worker in self.workers.values():
+            worker["SHARED_CACHE"].close()
+        for name, value in self.saved.items():
+            setattr(self.backend, name, value)
+
 def test_backend_health():
     """Test backend health endpoint"""
     response = requests.get(f"{API_BASE_URL}/health", timeout=5)
@@ -71,21 +240,31 @@ def test_backend_pipelines():
 def test_pipeline_actions():
     """Test pipeline action endpoint"""
     headers = {"Authorization": API_TOKEN, "Content-Type": "application/json"}
-    data = {"pipeline_id": "backend-api", "action": "retry", "reason": "Test retry"}
+    data = {"pipeline_id": "123456789", "action": "retry", "reason": "Test retry",
+            "owner": "octocat", "name": "hello-world"}
     
     response = requests.post(f"{API_BASE_URL}/pipelines/action", json=data, headers=headers)
     assert response.status_code == 200
     result = response.json()
     assert result["success"] == True
     assert result["action"] == "retry"
+    assert result["resolved_action"] == "rerun-failed-jobs"
+    
+    # The action runs in the background and can be polled
+    status = requests.get(f"{API_BASE_URL}/actions/{result['action_id']}", timeout=5)
+    assert status.status_code == 200
+    assert status.json()["status"] in ["queued", "running", "succeeded", "failed"]
 
 def test_pipeline_logs():
     """Test pipeline logs endpoint"""
     response = requests.get(f"{API_BASE_URL}/pipelines/backend-api/logs", timeout=5)
-    assert response.status_code == 200
     data = response.json()
-    assert "logs" in data
-    assert isinstance(data["logs"], list)
+    if response.status_code == 200:
+        assert isinstance(data["logs"], list)
+    else:
+        # Unknown runs and GitHub failures are errors, never log lines
+        assert response.status_code in (404, 502, 503)
+        assert "error" in data and "logs" not in data
 
 def test_invalid_pipeline():
     """Test invalid pipeline handling"""
@@ -100,6 +279,778 @@ def test_unauthorized_action():
     response = requests.post(f"{API_BASE_URL}/pipelines/action", json=data, headers=headers)
     assert response.status_code == 401
 
+def test_log_classifier():
+    """Test failure signatures are detected in a single pass over a job log"""
+    from log_analysis import classify_log
+    
+    log = [
+        "2024-01-15T10:26:00.0000000Z npm WARN deprecated request@2.88.2",
+        "2024-01-15T10:26:01.0000000Z npm ERR! code ERESOLVE",
+        "2024-01-15T10:26:01.0000000Z npm ERR! Could not resolve dependency:",
+        "2024-01-15T10:26:02.0000000Z ##[error]Process completed with exit code 1.",
+    ]
+    result = classify_log(iter(log))
+    assert result["category"] == "npm_install"
+    assert result["evidence"][0] == "npm ERR! code ERESOLVE"
+    
+    assert classify_log(["FATAL ERROR: Reached heap limit - JavaScript heap out of memory"])["category"] == "out_of_memory"
+    assert classify_log(["all good"])["category"] == "unknown"
+    
+    # "killed" in ordinary output is not a kill signal, and a real one never outranks specific causes
+    assert classify_log(["Killed 3 stale processes", "test_killed_worker PASSED"])["category"] == "unknown"
+    assert classify_log(["/home/runner/work/_temp/a.sh: line 1:  2412 Killed  npm test"])["category"] == "killed"
+    assert classify_log(["Killed", "FAILED tests/test_api.py::test_login"])["category"] == "test_failure"
+
+def test_pipeline_analytics():
+    """Test success rate, MTTR and incremental recomputation of analytics"""
+    from run_history import RunHistory
+    from analytics import AnalyticsCache
+    
+    history = RunHistory()
+    cache = AnalyticsCache()
+    runs = [fake_workflow_run(1, "success", minute=0), fake_workflow_run(2, "failure", minute=10),
+            fake_workflow_run(3, "failure", minute=20), fake_workflow_run(4, "success", minute=30)]
+    cache.invalidate("o/r", history.ingest("o/r", runs))
+    stats = cache.get("o/r", history.get_runs("o/r"))["workflows"]
+    assert stats[0]["success_rate"] == 0.5
+    assert stats[0]["p50_duration_seconds"] == 30
+    # Broken at 10:10 (first failure), fixed at 10:30:30 (next success finished)
+    assert stats[0]["mttr_seconds"] == 20 * 60 + 30
+    
+    # Re-ingesting the same runs changes nothing; a new workflow adds a row
+    assert history.ingest("o/r", runs) == []
+    cache.invalidate("o/r", history.ingest("o/r", [fake_workflow_run(5, "success", minute=40, name="Deploy")]))
+    stats = cache.get("o/r", history.get_runs("o/r"))["workflows"]
+    assert [s["workflow"] for s in stats] == ["CI", "Deploy"]
+
+def test_flaky_detection():
+    """Test flakiness scoring from same-commit outcomes and job attempts"""
+    from flaky import FlakyDetector
+    
+    detector = FlakyDetector()
+    detector.observe_runs("o/r", [
+        # same commit failed and passed
+        fake_run_record(1, "failure", head_sha="aaa"), fake_run_record(2, "success", head_sha="aaa"),
+        # passed only after a retry
+        fake_run_record(3, "success", head_sha="bbb", run_attempt=2),
+        # consistent outcomes
+        fake_run_record(4, "failure", head_sha="ccc"), fake_run_record(5, "success", head_sha="ddd"),
+        fake_run_record(6, "failure", head_sha="eee", name="Lint"),
+    ])
+    detector.observe_jobs("o/r", "CI", "3", [
+        fake_job("test", "failure", run_attempt=1),
+        fake_job("test", "success", run_attempt=2),
+        fake_job("build", "success", run_attempt=1),
+    ])
+    
+    report = detector.report("o/r")
+    ci = report["workflows"][0]
+    assert ci["workflow"] == "CI"
+    assert ci["flaky_commits"] == 2 and ci["commits"] == 4
+    assert ci["known_flaky"] is True
+    assert report["workflows"][1]["flakiness"] == 0
+    assert [(j["workflow"], j["job"]) for j in report["jobs"]] == [("CI", "test")]
+
+def test_single_flight():
+    """Test concurrent identical calls share one execution"""
+    import threading
+    from single_flight import SingleFlight
+    
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+    
+    def slow_fetch():
+        calls.append(1)
+        release.wait(2)
+        return ["repo"]
+    
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do(("repositories",), slow_fetch)))
+               for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.stats()["coalesced_total"] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+    
+    assert len(calls) == 1
+    assert results == [["repo"]] * 5
+    assert flight.stats()["by_kind"]["repositories"] == {"executed": 1, "coalesced": 4}
+
+def test_cache_snapshot():
+    """Test run history survives a snapshot round trip"""
+    import tempfile
+    from run_history import RunHistory
+    from snapshot import save_snapshot, load_snapshot
+    
+    history = RunHistory()
+    history.ingest("o/r", [{"id": 1, "name": "CI", "status": "completed", "conclusion": "success",
+                            "created_at": "2024-01-15T10:00:00Z", "actor": {"login": "octocat"}}])
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache", "snapshot.json.gz")
+        save_snapshot(path, {"runs": history.export()})
+        payload = load_snapshot(path)
+    
+    restored = RunHistory()
+    restored.restore(payload["state"]["runs"])
+    assert restored.get_runs("o/r") == history.get_runs("o/r")
+    assert restored.get_runs("o/r")[0]["actor"] == "octocat"
+    assert restored.synced_at("o/r") == history.synced_at("o/r")
+    assert load_snapshot(os.path.join(ROOT_DIR, "missing-snapshot.json.gz")) is None
+
+def test_action_queue_idempotency():
+    """Test idempotency keys and bulk batches in the action queue"""
+    from action_queue import ActionQueue, resolve_action
+    
+    performed = []
+    
+    def perform(owner, repo, run_id, action):
+        performed.append((run_id, action))
+        return True, False, "ok"
+    
+    queue = ActionQueue(perform, max_workers=2)
+    first = queue.submit("o", "r", 1, "rerun", idempotency_key="key-1")
+    again = queue.submit("o", "r", 1, "rerun", idempotency_key="key-1")
+    assert again["action_id"] == first["action_id"] and again["deduplicated"]
+    
+    batch = queue.submit_bulk("o", "r", [2, 3], "cancel", idempotency_key="bulk-1")
+    assert queue.submit_bulk("o", "r", [2, 3], "cancel", idempotency_key="bulk-1")["batch_id"] == batch["batch_id"]
+    
+    deadline = time.time() + 2
+    while not queue.get_batch(batch["batch_id"])["done"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert queue.get_batch(batch["batch_id"])["counts"] == {"succeeded": 2}
+    assert sorted(performed) == [("1", "rerun"), ("2", "cancel"), ("3", "cancel")]
+    assert resolve_action("retry") == "rerun-failed-jobs"
+    assert resolve_action("rollback") is None
+
+def test_concurrent_idempotent_submits():
+    """Test concurrent submits with one idempotency key queue a single action, within and across workers"""
+    import tempfile
+    import threading
+    from action_queue import ActionQueue
+    from shared_cache import SharedCache
+    
+    performed = []
+    
+    def perform(owner, repo, run_id, action):
+        performed.append(run_id)
+        return True, False, "ok"
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.sqlite3")
+        # Two queues with their own SharedCache stand in for two worker processes
+        queues = [ActionQueue(perform, max_workers=2) for _ in range(2)]
+        for queue in queues:
+            queue.store = SharedCache(path)
+        
+        start = threading.Barrier(16)
+        results = []
+        
+        def submit(queue):
+            start.wait()
+            results.append(queue.submit("o", "r", 42, "rerun", idempotency_key="retry-42"))
+        
+        threads = [threading.Thread(target=submit, args=(queues[i % 2],)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len({r["action_id"] for r in results}) == 1
+        assert sum(1 for r in results if not r["deduplicated"]) == 1
+        deadline = time.time() + 2
+        while not performed and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+        assert performed == ["42"]
+        
+        batches = [queue.submit_bulk("o", "r", [7, 8], "cancel", idempotency_key="bulk-7") for queue in queues]
+        assert batches[0]["batch_id"] == batches[1]["batch_id"]
+        for queue in queues:
+            queue.store.close()
+
+def test_run_id_index():
+    """Test single runs are found by id without scanning repositories"""
+    from run_history import RunHistory
+    
+    history = RunHistory(max_runs_per_repo=2)
+    runs = [{"id": i, "name": "CI", "status": "completed", "conclusion": "success",
+             "created_at": f"2024-01-15T10:0{i}:00Z"} for i in range(3)]
+    history.ingest("o/r", runs)
+    
+    repo_key, record = history.get_run(2)
+    assert repo_key == "o/r" and record["id"] == "2"
+    # Runs trimmed from the history leave the index too
+    assert history.get_run("0") == (None, None)
+    
+    history.ingest_run("o/other", {"id": 99, "name": "Deploy", "status": "queued"})
+    assert history.find_repo("99") == "o/other"
+    assert history.synced_at("o/other") is None
+
+def test_critical_path_timing():
+    """Test queue/execution split and critical path through parallel jobs"""
+    from timing import analyze_run_timing
+    
+    jobs = [
+        fake_job("lint", times=("00:00", "00:10", "01:00")),
+        fake_job("build", times=("00:00", "00:20", "05:00")),
+        fake_job("deploy", times=("05:00", "05:30", "07:00")),  # needs build
+    ]
+    timing = analyze_run_timing({"id": 1, "run_started_at": "2024-01-15T10:00:00Z"}, jobs)
+    
+    assert timing["critical_path"] == ["build", "deploy"]
+    assert timing["critical_path_seconds"] == 420
+    assert timing["queue_seconds_total"] == 10 + 20 + 30
+    assert timing["wall_seconds"] == 420
+    assert timing["slowest_steps"][0]["job"] == "build"
+
+def test_shared_cache_single_fetch():
+    """Test workers sharing one SQLite cache fetch an upstream result once"""
+    import tempfile
+    import threading
+    from shared_cache import SharedCache
+    
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"runs": [1, 2, 3]}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.sqlite3")
+        # Separate instances stand in for separate worker processes
+        workers = [SharedCache(path) for _ in range(3)]
+        results = []
+        threads = [threading.Thread(target=lambda c=c: results.append(c.fetch("runs:o/r", 60, loader)))
+                   for c in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        assert len(calls) == 1
+        assert results == [{"runs": [1, 2, 3]}] * 3
+        assert workers[0].fetch("empty", 60, lambda: [], cache_if=bool) == []
+        assert workers[1].get("empty") is None
+        
+        workers[2].delete_prefix("runs:o/")
+        assert workers[0].get("runs:o/r") is None
+        for cache in workers:
+            cache.close()
+
+def test_shared_cache_wait_deadline():
+    """Test a worker waiting on another's fetch gives up when its request deadline passes"""
+    import tempfile
+    import deadline
+    from shared_cache import SharedCache
+    
+    calls = []
+    
+    def loader():
+        calls.append(1)
+        return {"runs": []}
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.sqlite3")
+        leader, waiter = SharedCache(path), SharedCache(path)
+        # The leader holds the lease as if its GitHub call were still in flight
+        assert leader.acquire_lease("runs:o/r")
+        deadline.start(0.4)
+        try:
+            started = time.time()
+            assert waiter.fetch("runs:o/r", 60, loader) is None
+            assert time.time() - started < 1
+            assert deadline.is_partial() and calls == []
+            assert waiter.stats()["timed_out"] == 1
+        finally:
+            deadline.finish()
+        
+        # Once the lease is released a waiter with time left fetches normally
+        leader.release_lease("runs:o/r")
+        deadline.start(5)
+        try:
+            assert waiter.fetch("runs:o/r", 60, loader) == {"runs": []}
+            assert not deadline.is_partial() and calls == [1]
+        finally:
+            deadline.finish()
+        for cache in (leader, waiter):
+            cache.close()
+
+def test_token_pool_failover():
+    """Test token selection by remaining quota, owner scope and failover"""
+    from token_pool import TokenPool
+    
+    class FakeResponse:
+        def __init__(self, status_code, remaining, reset="9999999999"):
+            self.status_code = status_code
+            self.headers = {"X-RateLimit-Remaining": str(remaining), "X-RateLimit-Reset": reset}
+    
+    pool = TokenPool.from_env("aaa,bbb@my-org|other-org")
+    assert len(pool) == 2
+    assert pool.acquire("someone-else").value == "aaa"
+    
+    first = pool.acquire("my-org")
+    assert not pool.record(first, FakeResponse(200, 100))
+    # The other token has no usage reported yet, so it has more quota left
+    second = pool.acquire("my-org")
+    assert second.name != first.name
+    
+    # Exhausted and revoked tokens fail over and are skipped afterwards
+    assert pool.record(second, FakeResponse(403, 0))
+    assert pool.acquire("my-org").name == first.name
+    assert pool.record(first, FakeResponse(401, 0))
+    assert pool.acquire("my-org") is None
+    assert [t["available"] for t in pool.stats()] == [False, False]
+    
+    assert len(TokenPool.from_env(None, "single")) == 1
+    assert not TokenPool.from_env(None, None)
+    
+    # A secondary rate limit pauses the token for Retry-After, not until the primary reset
+    pool = TokenPool.from_env(None, "single")
+    token = pool.acquire()
+    limited = FakeResponse(403, 4500, str(int(time.time()) + 3000))
+    limited.headers["Retry-After"] = "60"
+    assert pool.record(token, limited)
+    stats = pool.stats()[0]
+    assert stats["remaining"] == 4500 and not stats["available"] and 58 <= stats["cooldown_in"] <= 60
+    assert token.available(time.time() + 61) and pool.acquire() is None
+
+def test_graphql_repositories():
+    """Test bulk repository pagination against a local GraphQL stand-in"""
+    import threading
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from github_graphql import fetch_repositories
+    
+    def node(i, conclusion):
+        return {"databaseId": i, "name": f"repo{i}", "nameWithOwner": f"o/repo{i}", "description": None,
+                "updatedAt": "2024-01-15T10:00:00Z", "owner": {"login": "o"}, "primaryLanguage": {"name": "Python"},
+                "defaultBranchRef": {"name": "main", "target": {"oid": "abc", "checkSuites": {"nodes": [
+                    {"status": "COMPLETED", "conclusion": conclusion, "updatedAt": "2024-01-15T10:05:00Z",
+                     "workflowRun": {"databaseId": 100 + i, "url": "", "workflow": {"name": "CI"}}}]}}}}
+    
+    pages = {None: ([node(1, "SUCCESS"), node(2, "FAILURE")], True, "c1"), "c1": ([node(3, "SUCCESS")], False, None)}
+    
+    class StandIn(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            nodes, has_next, cursor = pages[body["variables"]["after"]]
+            data = {"rateLimit": {"cost": 1, "remaining": 4999}, "viewer": {"repositories": {
+                "pageInfo": {"hasNextPage": has_next, "endCursor": cursor}, "nodes": nodes}}}
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(json.dumps({"data": data}).encode())
+        
+        def log_message(self, *args):
+            pass
+    
+    server = HTTPServer(("localhost", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://localhost:{server.server_port}/graphql"
+    
+    def post(query, variables):
+        return requests.post(url, json={"query": query, "variables": variables}, timeout=5).json()
+    
+    try:
+        repos, stats = fetch_repositories(post, page_size=2)
+        assert [r["full_name"] for r in repos] == ["o/repo1", "o/repo2", "o/repo3"]
+        assert stats["calls"] == 2 and stats["complete"]
+        assert repos[1]["latest_run"]["conclusion"] == "failure"
+        assert repos[1]["latest_run"]["pipeline_id"] == "102"
+        
+        # A nearly spent point budget stops pagination after the first page
+        repos, stats = fetch_repositories(post, page_size=2, min_remaining=5000)
+        assert len(repos) == 2 and not stats["complete"]
+    finally:
+        server.shutdown()
+
+def test_request_deadline():
+    """Test upstream timeouts follow the client's budget and waiters give up in time"""
+    import threading
+    import deadline
+    from single_flight import SingleFlight
+    
+    deadline.start(None)
+    assert deadline.upstream_timeout() == deadline.DEFAULT_UPSTREAM_TIMEOUT
+    
+    deadline.start(deadline.parse_budget_ms("1500"))
+    assert 1.0 < deadline.upstream_timeout() <= 1.5
+    assert not deadline.is_partial()
+    
+    deadline.start(deadline.parse_budget_ms("50"))
+    assert deadline.expired() and deadline.upstream_timeout() is None
+    deadline.finish()
+    assert deadline.parse_budget_ms("soon") is None
+    
+    flight = SingleFlight()
+    release = threading.Event()
+    leader = threading.Thread(target=flight.do, args=("slow", release.wait, 2))
+    leader.start()
+    time.sleep(0.05)
+    
+    deadline.start(0.3)
+    started = time.time()
+    try:
+        flight.do("slow", release.wait, 2)
+        raise AssertionError("waiter should have hit its deadline")
+    except deadline.DeadlineExceeded:
+        assert time.time() - started < 1
+        assert deadline.is_partial()
+    finally:
+        deadline.finish()
+        release.set()
+        leader.join()
+
+def test_request_profiler():
+    """Test 1-in-N sampling, forced profiles and profile directory rotation"""
+    import tempfile
+    from profiling import RequestProfiler
+    
+    with tempfile.TemporaryDirectory() as directory:
+        profiler = RequestProfiler(directory, enabled=True, sample_every=3, keep=2)
+        for i in range(6):
+            assert profiler.call(f"GET /fast/{i}", lambda: "ok") == "ok"
+        profiler.call("GET /slow", lambda: time.sleep(0.05), forced=True)
+        
+        slowest = profiler.slowest(limit=3)
+        assert slowest[0]["request"] == "GET /slow" and slowest[0]["profile"]
+        assert any("sleep" in f["function"] for f in slowest[0]["top_functions"])
+        assert profiler.stats()["requests_timed"] == 7
+        assert profiler.stats()["requests_profiled"] == 3
+        assert len(os.listdir(directory)) == 2
+        
+        quiet = RequestProfiler(directory)
+        quiet.call("GET /health", lambda: None)
+        assert quiet.slowest(profiled_only=True) == []
+
+def test_run_search_index():
+    """Test the cross-repo run index matches SHA prefixes and filters and follows run updates"""
+    from run_index import RunIndex
+    
+    def run(run_id, sha, branch, conclusion, actor="alice", repo="acme/api"):
+        return fake_run_record(run_id, conclusion, repo, head_sha=sha, head_branch=branch, actor=actor)
+    
+    index = RunIndex(max_runs_per_repo=3)
+    index.observe_runs("acme/api", [run(101, "abc123ff", "main", "failure"),
+                                    run(102, "abc999", "feature/login", "success", "bob")])
+    index.observe_runs("acme/web", [run(201, "abc123ff", "main", "success", repo="acme/web")])
+    
+    total, results = index.search(sha="abc123")
+    assert total == 2 and {r["repository"] for r in results} == {"acme/api", "acme/web"}
+    assert index.search(q="ABC1 main failure")[1][0]["id"] == "101"
+    assert index.search(branch="feature/login")[1][0]["actor"] == "bob"
+    assert index.search(q="login bob")[0] == 1
+    assert index.search(repo="acme/web", conclusion="failure")[0] == 0
+    assert index.search() == (0, [])
+    
+    # A run that changes is re-indexed, not duplicated
+    index.observe_runs("acme/api", [run(101, "abc123ff", "main", "success")])
+    assert index.search(conclusion="failure")[0] == 0
+    assert index.search(conclusion="success")[0] == 3
+    
+    # Older runs beyond the per-repo cap drop out, like the run history
+    index.observe_runs("acme/api", [run(103, "def456", "main", "success"),
+                                    run(104, "def789", "main", "success")])
+    assert index.search(repo="acme/api")[0] == 3
+    assert index.search(sha="abc123")[0] == 1
+    assert index.stats()["runs"] == 4
+
+def test_pipeline_delta_sync():
+    """Test /pipelines?since= deltas carry only changes and merge back into the full list"""
+    from delta_feed import PipelineFeed
+    from pipeline_sync import PipelineSync
+    
+    feed = PipelineFeed(max_removed=2)
+    sync = PipelineSync()
+    
+    feed.update("acme/api", [fake_pipeline(i) for i in (3, 2, 1)])
+    delta = feed.changes("acme/api", sync.cursor("acme/api"))
+    assert delta["full"] and len(delta["changed"]) == 3
+    sync.merge("acme/api", delta)
+    
+    # Nothing changed: an empty delta
+    feed.update("acme/api", [fake_pipeline(i) for i in (3, 2, 1)])
+    delta = feed.changes("acme/api", sync.cursor("acme/api"))
+    assert not delta["full"] and delta["changed"] == [] and delta["removed"] == []
+    
+    # A new run pushes the oldest out and a running one finishes
+    feed.update("acme/api", [fake_pipeline(4), fake_pipeline(3, "failed"), fake_pipeline(2)])
+    delta = feed.changes("acme/api", sync.cursor("acme/api"))
+    assert [p["id"] for p in delta["changed"]] == ["4", "3"] and delta["removed"] == ["1"]
+    merged = sync.merge("acme/api", delta)
+    assert [p["id"] for p in merged] == ["4", "3", "2"] and merged[1]["status"] == "failed"
+    
+    # Unknown, foreign and too-old cursors get the full list
+    assert feed.changes("acme/api", "0")["full"]
+    assert feed.changes("acme/api", "other." + delta["cursor"].split(".")[1])["full"]
+    old_cursor = delta["cursor"]
+    for i in range(5, 9):
+        feed.update("acme/api", [fake_pipeline(i)])
+    assert feed.changes("acme/api", old_cursor)["full"]
+
+def test_pipeline_cursor_across_workers():
+    """Test a cursor issued by one worker's feed gets a delta from any other worker"""
+    import tempfile
+    from shared_cache import SharedCache
+    from delta_feed import SharedPipelineFeed
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "shared.sqlite3")
+        store_a, store_b = SharedCache(path), SharedCache(path)
+        try:
+            worker_a, worker_b = SharedPipelineFeed(store_a, max_removed=2), SharedPipelineFeed(store_b, max_removed=2)
+            assert worker_a.epoch == worker_b.epoch
+            worker_a.update("acme/api", [fake_pipeline(1), fake_pipeline(2)])
+            first = worker_b.changes("acme/api", "0")
+            assert first["full"] and [p["id"] for p in first["changed"]] == ["1", "2"]
+            
+            # An unchanged refresh on another worker keeps the cursor current
+            worker_b.update("acme/api", [fake_pipeline(1), fake_pipeline(2)])
+            assert worker_a.changes("acme/api", first["cursor"])["cursor"] == first["cursor"]
+            
+            worker_b.update("acme/api", [fake_pipeline(3), fake_pipeline(1, "failed")])
+            delta = worker_a.changes("acme/api", first["cursor"])
+            assert not delta["full"]
+            assert [p["id"] for p in delta["changed"]] == ["3", "1"] and delta["changed"][1]["status"] == "failed"
+            assert delta["removed"] == ["2"]
+            assert worker_b.changes("acme/api", delta["cursor"]) == {
+                "cursor": delta["cursor"], "full": False, "changed": [], "removed": []}
+            
+            # A removed id that comes back is live again; too many removals force a full resync
+            worker_a.update("acme/api", [fake_pipeline(2)])
+            assert [p["id"] for p in worker_b.changes("acme/api", delta["cursor"])["changed"]] == ["2"]
+            for i in range(4, 8):
+                worker_a.update("acme/api", [fake_pipeline(i)])
+            resync = worker_b.changes("acme/api", delta["cursor"])
+            assert resync["full"] and [p["id"] for p in resync["changed"]] == ["7"]
+            assert worker_a.changes("other/repo", "0") == {"cursor": resync["cursor"], "full": True, "changed": [], "removed": []}
+        finally:
+            store_a.close()
+            store_b.close()
+    
+    # A forked worker switches to the shared feed
+    with tempfile.TemporaryDirectory() as tmp, isolated_backend(
+            SHARED_CACHE_PATH=os.path.join(tmp, "shared.sqlite3"), SHARED_CACHE=None, SHARED_RUNS=None) as backend:
+        backend.init_worker()
+        assert isinstance(backend.PIPELINE_FEED, SharedPipelineFeed)
+        backend.SHARED_CACHE.close()
+
+def test_log_fetch_errors():
+    """Test log fetch failures answer with an error status and never reach the prompt as log lines"""
+    from prompt_context import build_prompt_context
+    
+    def timed_out(method, url, owner=None, primary=False, **kwargs):
+        raise requests.ConnectionError("Read timed out.")
+    
+    with isolated_backend(github_request=timed_out), backend_server() as url:
+        response = requests.get(f"{url}/pipelines/987654/logs", params={"owner": "acme", "name": "api"}, timeout=5)
+        assert response.status_code == 502
+        assert "Read timed out" in response.json()["error"] and "logs" not in response.json()
+    
+    # The frontend leaves runs without logs out of logs_by_id; their evidence is the summary alone
+    pipelines = [{"id": "987654", "name": "CI", "status": "failed", "branch": "main"}]
+    context = build_prompt_context("why did CI fail?", {"full_name": "acme/api"}, pipelines, {})
+    assert "timed out" not in context.lower() and "log excerpt" not in context
+
+def test_run_state_shared_across_workers():
+    """Test every worker answers search, analytics, flakiness and bulk selection from the shared run history"""
+    import tempfile
+    from shared_cache import SharedCache
+    from run_store import SharedRunStore
+    
+    runs = [fake_workflow_run(9201, "failure"), fake_workflow_run(9200, "success")]
+    calls = []
+    
+    def fake_github(method, url, owner=None, primary=False, **kwargs):
+        calls.append(url)
+        return FakeGitHubResponse({"workflow_runs": runs})
+    
+    with tempfile.TemporaryDirectory() as tmp, isolated_backend(github_request=fake_github) as backend, \
+            SimulatedWorkers(os.path.join(tmp, "shared.sqlite3")) as cluster:
+        cluster.switch_to("a")
+        backend.fetch_workflow_runs("acme", "api")
+        analytics = backend.get_pipeline_analytics("acme", "api")
+        
+        # A worker that never listed the repository sees the same runs without calling GitHub
+        cluster.switch_to("b")
+        assert backend.search_runs({"repo": ["acme/api"]})["total"] == 2
+        assert backend.get_pipeline_analytics("acme", "api")["workflows"] == analytics["workflows"]
+        assert backend.select_failed_runs("acme", "api") == ["9201"]
+        assert backend.get_flaky_report("acme", "api")["workflows"][0]["commits"] == 2
+        assert backend.RUN_HISTORY.synced_at("acme/api") > 0
+        assert len(calls) == 1
+        
+        # A run fetched by one worker reaches the other one's history and index
+        runs.insert(0, fake_workflow_run(9202, "success"))
+        backend.SHARED_CACHE.delete_prefix("runs:acme/api:")
+        backend.fetch_workflow_runs("acme", "api")
+        cluster.switch_to("a")
+        assert backend.search_runs({"repo": ["acme/api"]})["total"] == 3
+        # The newer passing run supersedes the failure for bulk retry on this worker too
+        assert backend.select_failed_runs("acme", "api") == []
+        
+        # An action on one worker makes every worker refetch the repository
+        backend.on_action_succeeded("acme", "api", "9201", "rerun")
+        cluster.switch_to("b")
+        assert backend.RUN_HISTORY.synced_at("acme/api") == 0
+    
+    # The shared log keeps the newest runs per repository, like each worker's history
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SharedCache(os.path.join(tmp, "shared.sqlite3"))
+        store = SharedRunStore(cache, max_runs_per_repo=2)
+        records = [{"id": str(i), "created_at": f"2024-01-15T10:0{i}:00Z"} for i in range(4)]
+        seq = store.publish("acme/api", records, synced_at=1.0)
+        assert store.publish("acme/api", records) == seq
+        _, by_repo, synced = store.changes_since(0)
+        assert [r["id"] for r in by_repo["acme/api"]] == ["2", "3"] and synced == {"acme/api": 1.0}
+        assert store.changes_since(seq) == (seq, {}, {})
+        cache.close()
+
+def test_search_same_on_every_worker():
+    """Test a /search query returns the same runs whichever worker answers it"""
+    import tempfile
+    
+    def fake_github(method, url, owner=None, primary=False, **kwargs):
+        if url.endswith("/runs/9310"):
+            return FakeGitHubResponse(fake_workflow_run(9310, "failure", "acme/web", head_sha="feed" + "0" * 36))
+        repo = "acme/web" if "/acme/web/" in url else "acme/api"
+        base = 9300 if repo == "acme/web" else 9320
+        return FakeGitHubResponse({"workflow_runs": [fake_workflow_run(base + i, "failure" if i % 2 else "success", repo)
+                                                     for i in range(4)]})
+    
+    with tempfile.TemporaryDirectory() as tmp, isolated_backend(github_request=fake_github) as backend, \
+            SimulatedWorkers(os.path.join(tmp, "shared.sqlite3")) as cluster:
+        # Each worker lists a different repository; one also fetches a single run by id
+        cluster.switch_to("a")
+        backend.fetch_workflow_runs("acme", "api")
+        cluster.switch_to("b")
+        backend.fetch_workflow_runs("acme", "web")
+        backend.fetch_workflow_run("acme", "web", 9310)
+        
+        queries = [{"conclusion": ["failure"]}, {"q": ["acme"]}, {"sha": ["feed"]}, {"repo": ["acme/web"]}]
+        answers = {}
+        for worker in ("a", "b", "c"):
+            cluster.switch_to(worker)
+            answers[worker] = [backend.search_runs(query)["results"] for query in queries]
+        assert answers["a"] == answers["b"] == answers["c"]
+        assert len(answers["a"][0]) == 5 and [r["id"] for r in answers["a"][2]] == ["9310"]
+
+def test_failure_classification_off_request_path():
+    """Test /pipelines serves known verdicts only and classifies failed runs in the background"""
+    import threading
+    import deadline
+    from lru_cache import LRUCache
+    
+    runs = [fake_workflow_run(9101, "failure"), fake_workflow_run(9100, "success")]
+    logs_requested = threading.Event()
+    release_logs = threading.Event()
+    
+    def fake_github(method, url, owner=None, primary=False, **kwargs):
+        if "/actions/runs?" in url:
+            return FakeGitHubResponse({"workflow_runs": runs})
+        if url.endswith("/jobs?per_page=100"):
+            return FakeGitHubResponse({"jobs": [fake_job("test", "failure", id=1)]})
+        logs_requested.set()
+        release_logs.wait(5)
+        return FakeGitHubResponse(lines=["npm ERR! code ERESOLVE", "npm ERR! ERESOLVE unable to resolve dependency tree"])
+    
+    with isolated_backend(github_request=fake_github) as backend:
+        try:
+            started = time.time()
+            pipelines = backend.get_github_workflows("acme", "classify")
+            assert time.time() - started < 1
+            assert pipelines[0]["status"] == "failed" and "failure_label" not in pipelines[0]
+            
+            assert logs_requested.wait(5)
+            release_logs.set()
+            for _ in range(50):
+                if "9101" in backend._failure_cache:
+                    break
+                time.sleep(0.05)
+            pipelines = backend.build_pipelines("acme", "classify", backend.RUN_HISTORY.get_runs("acme/classify"))
+            assert pipelines[0]["failure_label"]
+        finally:
+            release_logs.set()
+    
+    # A timeout while classifying one run leaves the next runs of the batch classifiable
+    def first_run_times_out(method, url, owner=None, primary=False, **kwargs):
+        if "/runs/9301/" in url:
+            deadline.mark_partial()
+            return None
+        if url.endswith("/jobs?per_page=100"):
+            return FakeGitHubResponse({"jobs": [fake_job("test", "failure", id=2)]})
+        return FakeGitHubResponse(lines=["npm ERR! code ERESOLVE"])
+    
+    with isolated_backend(github_request=first_run_times_out) as backend:
+        backend.classify_failures("acme", "classify", [fake_workflow_run(9301, "failure"),
+                                                       fake_workflow_run(9302, "failure")])
+        assert "9301" not in backend._failure_cache
+        assert backend._failure_cache.get("9302")["category"] == "npm_install"
+        assert not deadline.is_partial()
+    
+    cache = LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "b" not in cache and cache.get("a") == 1 and len(cache) == 2
+
+def test_bulk_retry_unsynced_repo():
+    """Test bulk retry finds failed runs of a repository this worker never listed and rejects bad ids"""
+    runs = [fake_workflow_run(9202, "failure", "acme/unsynced"), fake_workflow_run(9201, "success", "acme/unsynced"),
+            fake_workflow_run(9203, "cancelled", "acme/unsynced", name="Deploy")]
+    reruns = []
+    
+    def fake_github(method, url, owner=None, primary=False, **kwargs):
+        if method == "POST":
+            reruns.append(url)
+            return FakeGitHubResponse(status_code=201)
+        return FakeGitHubResponse({"workflow_runs": runs})
+    
+    with isolated_backend(github_request=fake_github) as backend, backend_server() as url:
+        assert backend.RUN_HISTORY.synced_at("acme/unsynced") is None
+        response = requests.post(f"{url}/pipelines/actions/bulk",
+                                 json={"owner": "acme", "name": "unsynced", "action": "rerun-failed-jobs"},
+                                 headers={"Authorization": API_TOKEN}, timeout=5)
+        assert response.status_code == 200 and response.json()["queued"] == 1
+        for _ in range(50):
+            if reruns:
+                break
+            time.sleep(0.05)
+        assert reruns and reruns[0].endswith("/runs/9202/rerun-failed-jobs")
+        
+        for bad_ids in ("9202", {"9202": True}, ["9202", None], ["../9202"]):
+            response = requests.post(f"{url}/pipelines/actions/bulk",
+                                     json={"owner": "acme", "name": "unsynced", "action": "rerun",
+                                           "pipeline_ids": bad_ids},
+                                     headers={"Authorization": API_TOKEN}, timeout=5)
+            assert response.status_code == 400, bad_ids
+        for body in ("[]", '"rerun"', "3"):
+            response = requests.post(f"{url}/pipelines/action", data=body,
+                                     headers={"Authorization": API_TOKEN}, timeout=5)
+            assert response.status_code == 400 and "object" in response.json()["error"], body
+        for body in ({"action": "rerun"}, {"action": "rerun", "pipeline_id": "../../../user"},
+                     {"action": "rerun", "pipeline_id": True},
+                     {"action": "rerun", "pipeline_id": "9202", "owner": "acme", "name": "../unsynced"},
+                     {"action": "rerun", "pipeline_id": "9202", "owner": "..", "name": "unsynced"}):
+            response = requests.post(f"{url}/pipelines/action", json=body,
+                                     headers={"Authorization": API_TOKEN}, timeout=5)
+            assert response.status_code == 400, body
+        response = requests.post(f"{url}/pipelines/actions/bulk",
+                                 json={"owner": "acme/x", "name": "unsynced", "action": "rerun"},
+                                 headers={"Authorization": API_TOKEN}, timeout=5)
+        assert response.status_code == 400
+        assert len(reruns) == 1
+        
+        # Cancelled runs were stopped on purpose and are only retried on request
+        assert backend.select_failed_runs("acme", "unsynced") == ["9202"]
+        assert sorted(backend.select_failed_runs("acme", "unsynced", include_cancelled=True)) == ["9202", "9203"]
+
 def test_frontend_imports():
     """Test frontend imports work"""
     try:
@@ -111,6 +1062,98 @@ def test_frontend_imports():
     except ImportError as e:
         raise AssertionError(f"Missing required package: {e}")
 
+def test_prompt_context_budget():
+    """Test prompt context stays within budget and keeps failure evidence"""
+    from prompt_context import build_prompt_context, estimate_tokens
+    
+    repo = {"full_name": "octo/app", "language": "Python"}
+    pipelines = [
+        {"id": str(i), "name": f"CI {i}", "status": "success", "branch": "main",
+         "commit": "abc1234", "last_run": "2024-01-15T10:30:00Z"}
+        for i in range(50)
+    ]
+    pipelines.append({"id": "99", "name": "Deploy", "status": "failed", "branch": "main",
+                      "commit": "def5678", "last_run": "2024-01-15T09:00:00Z",
+                      "error": "Workflow failure: Deploy"})
+    logs = {"99": ["[JOB] deploy", "  [STEP] Checkout: success", "  [STEP] Push image: failure"]}
+    
+    context = build_prompt_context("Why did deploy fail?", repo, pipelines, logs, token_budget=300)
+    assert estimate_tokens(context) <= 300
+    assert "Push image: failure" in context
+    assert context.index("Deploy") < context.index("CI 0")
+
+def test_columnar_payload():
+    """Test field projection and the columnar encoding round trip"""
+    from payloads import parse_fields, shape_list
+    from columnar import decode_columnar, decode_records, frame_records
+    
+    repos = [{"id": i, "name": f"repo{i}", "owner": "octocat", "language": "Python" if i % 2 else None,
+              "description": "x" * 100} for i in range(6)]
+    fields = parse_fields("id,name,owner,language")
+    
+    projected = shape_list(repos, fields)
+    assert projected[0] == {"id": 0, "name": "repo0", "owner": "octocat", "language": None}
+    
+    payload = shape_list(repos, fields, "columnar")
+    assert payload["columns"]["owner"] == {"dictionary": ["octocat"], "codes": [0] * 6}
+    assert len(json.dumps(payload)) < len(json.dumps(repos)) / 2
+    
+    assert decode_records(payload) == projected
+    frame = decode_columnar(payload)
+    assert list(frame.columns) == fields and len(frame) == 6
+    assert frame["language"].isna().sum() == 3
+    
+    # The repository cards filter and page the frame, then take dicts for one page only
+    page = frame[frame["name"].str.contains("REPO", case=False)].iloc[2:4]
+    assert frame_records(page) == projected[2:4]
+
+def test_pipeline_table_frame():
+    """Test the compact table view builds one row per pipeline"""
+    from pipeline_table import pipelines_frame
+    
+    pipelines = [
+        {"id": str(i), "name": "CI", "status": "failed" if i % 2 else "success", "branch": "main",
+         "commit": "abcdef1234567", "last_run": "2024-01-15T10:30:00Z", "duration": "1m 5s"}
+        for i in range(300)
+    ]
+    pipelines[1].update(failure_label="Test failure", known_flaky=True)
+    
+    frame = pipelines_frame(pipelines)
+    assert len(frame) == 300
+    assert frame.loc[1, "Status"] == "❌ failed 🎲"
+    assert frame.loc[0, "Commit"] == "abcdef1"
+    assert frame.loc[0, "Likely cause"] == "" and frame.loc[1, "Likely cause"] == "Test failure"
+    assert str(frame["Last run"].dtype).startswith("datetime64")
+    assert len(pipelines_frame([])) == 0
+
+def test_agent_warmup():
+    """Test background initialization never blocks callers"""
+    import threading
+    from agent_warmup import BackgroundInit
+    
+    release = threading.Event()
+    
+    def slow_factory():
+        release.wait(2)
+        return "agent"
+    
+    warmup = BackgroundInit(slow_factory)
+    assert warmup.state == "not started"
+    warmup.start().start()
+    assert warmup.state == "warming up"
+    assert warmup.get() is None  # early questions fall back instead of waiting
+    
+    release.set()
+    assert warmup.get(timeout=2) == "agent"
+    assert warmup.state == "ready"
+    
+    def failing_factory():
+        raise RuntimeError("no api key")
+    
+    failed = BackgroundInit(failing_factory).start()
+    assert failed.get(timeout=2) is None
+    assert failed.state == "failed" and "no api key" in failed.error
+
 def test_env_variables():
     """Test environment variables are set"""
     from dotenv import load_dotenv
@@ -165,9 +1208,39 @@ def main():
         print("⚠️ Backend not running - Skipping API tests")
         print("   Start backend with: python backend/simple_backend.py")
     
+    # Backend unit tests (no running server needed)
+    print("\n🧩 Backend Unit Tests")
+    runner.test("Log Failure Classifier", test_log_classifier)
+    runner.test("Pipeline Analytics", test_pipeline_analytics)
+    runner.test("Flaky Detection", test_flaky_detection)
+    runner.test("Single-Flight Coalescing", test_single_flight)
+    runner.test("Cache Snapshot Round Trip", test_cache_snapshot)
+    runner.test("Action Queue Idempotency", test_action_queue_idempotency)
+    runner.test("Concurrent Idempotent Submits", test_concurrent_idempotent_submits)
+    runner.test("Run-ID Index", test_run_id_index)
+    runner.test("Critical Path Timing", test_critical_path_timing)
+    runner.test("Shared Cache Single Fetch", test_shared_cache_single_fetch)
+    runner.test("Shared Cache Wait Deadline", test_shared_cache_wait_deadline)
+    runner.test("Token Pool Failover", test_token_pool_failover)
+    runner.test("GraphQL Repository Fetch", test_graphql_repositories)
+    runner.test("Request Deadlines", test_request_deadline)
+    runner.test("Request Profiler", test_request_profiler)
+    runner.test("Run Search Index", test_run_search_index)
+    runner.test("Pipeline Delta Sync", test_pipeline_delta_sync)
+    runner.test("Pipeline Cursor Across Workers", test_pipeline_cursor_across_workers)
+    runner.test("Log Fetch Errors", test_log_fetch_errors)
+    runner.test("Background Failure Classification", test_failure_classification_off_request_path)
+    runner.test("Bulk Retry On Unsynced Repo", test_bulk_retry_unsynced_repo)
+    runner.test("Run State Shared Across Workers", test_run_state_shared_across_workers)
+    runner.test("Search Same On Every Worker", test_search_same_on_every_worker)
+    
     # Frontend tests
     print("\n🎨 Frontend Tests")
     runner.test("Frontend Dependencies", test_frontend_imports)
+    runner.test("Prompt Context Budget", test_prompt_context_budget)
+    runner.test("Columnar Payloads", test_columnar_payload)
+    runner.test("Pipeline Table Frame", test_pipeline_table_frame)
+    runner.test("Agent Warm-Up", test_agent_warmup)
     
     # Environment tests
     print("\n🔐 Environment Tests")